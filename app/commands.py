@@ -0,0 +1,276 @@
+"""
+Non-interactive subcommands that query the local database and print machine-readable output.
+"""
+import csv
+import json
+import sys
+from dataclasses import asdict, fields
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from core.database import SNAPSHOT_METRICS, DatabaseManager, date_to_timestamp
+from core.exporter import EXPORT_FORMATS, default_export_path, export_standings
+from core.models import DKPPool, name_key
+from core.read_model import LEADERBOARD_METRICS, CharacterRecord, LeaderboardFilter
+
+OUTPUT_FORMATS = ("json", "csv", "ndjson")
+
+
+def record_to_dict(character) -> Dict[str, Any]:
+    """Plain dictionary of a character row (ORM object or read model record)."""
+    return {f.name: getattr(character, f.name) for f in fields(CharacterRecord)}
+
+
+def write_records(records: List[Dict[str, Any]], output_format: str, out: TextIO = sys.stdout) -> None:
+    """
+    Print records as a JSON array, CSV with a header row, or one JSON object per line.
+
+    List values (e.g. alt groups) stay nested in JSON and are joined with ", " in CSV.
+
+    Args:
+        records: Rows to print; every row has the same keys.
+        output_format: One of ``OUTPUT_FORMATS``.
+        out: Stream to write to.
+    """
+    if output_format == "json":
+        json.dump(records, out, indent=2, default=str)
+        out.write("\n")
+    elif output_format == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, default=str))
+            out.write("\n")
+    elif output_format == "csv":
+        if not records:
+            return
+        writer = csv.DictWriter(out, fieldnames=list(records[0]), lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            writer.writerow({key: ", ".join(map(str, value)) if isinstance(value, list) else value
+                             for key, value in record.items()})
+    else:
+        raise ValueError(f"Unknown output format '{output_format}'; expected one of {', '.join(OUTPUT_FORMATS)}")
+
+
+def _card_to_dict(card) -> Dict[str, Any]:
+    record = asdict(card)
+    record["alts"] = [alt.name for alt in card.alts]
+    del record["members"]
+    return record
+
+
+def query_characters(db_manager: DatabaseManager, names: Iterable[str]) -> List[Dict[str, Any]]:
+    """Character cards for ``names``, in input order; names that do not exist are skipped."""
+    names = list(names)
+    cards = db_manager.get_character_cards(names)
+    found = (cards.get(name_key(name)) for name in names)
+    return [_card_to_dict(card) for card in dict.fromkeys(card for card in found if card is not None)]
+
+
+def top_characters(db_manager: DatabaseManager, count: int, metric: str = "current",
+                   filters: LeaderboardFilter = LeaderboardFilter(), pool: Optional[DKPPool] = None) -> List[Dict[str, Any]]:
+    """The top ``count`` mains by ``metric`` with their position, in one DKP pool if given."""
+    if pool is not None:
+        entries = db_manager.get_pool_standings(pool.id).leaderboard(metric, count, filters)
+        return [{"position": position, "pool": pool.name, **asdict(entry)}
+                for position, entry in enumerate(entries, start=1)]
+    page = db_manager.get_leaderboard(metric, count, filters)
+    return [{"position": position, **record_to_dict(character)}
+            for position, character in enumerate(page.entries, start=1)]
+
+
+def alt_group(db_manager: DatabaseManager, name: str) -> List[Dict[str, Any]]:
+    """Every character in the alt group of ``name``, or an empty list if it does not exist."""
+    card = db_manager.get_character_cards([name]).get(name_key(name))
+    if card is None:
+        return []
+    return [{"main_id": card.main_id, "main_name": card.main_name, **asdict(member)} for member in card.members]
+
+
+def purchases(db_manager: DatabaseManager, name: str, include_alts: bool = True) -> List[Dict[str, Any]]:
+    """Items bought by ``name`` (and its alts), newest first."""
+    return db_manager.get_purchases(name, include_alts)
+
+
+def item_prices(db_manager: DatabaseManager, item_name: str) -> List[Dict[str, Any]]:
+    """Sale statistics of every item whose name starts with ``item_name``."""
+    return db_manager.get_item_prices(item_name)
+
+
+def history(db_manager: DatabaseManager, name: str, include_alts: bool = True) -> List[Dict[str, Any]]:
+    """Points of ``name`` (and its alts) after every snapshot that changed them, oldest first."""
+    return db_manager.get_trajectory(name, include_alts)
+
+
+def movers(db_manager: DatabaseManager, count: int, metric: str = "earned",
+           start: Optional[int] = None, end: Optional[int] = None) -> List[Dict[str, Any]]:
+    """The ``count`` mains whose ``metric`` moved the most between two unix times, with their position."""
+    return [{"position": position, **mover}
+            for position, mover in enumerate(db_manager.get_movers(metric, start, end, count), start=1)]
+
+
+def analyze(db_manager: DatabaseManager, metric: str = "current", visible_only: bool = False) -> List[Dict[str, Any]]:
+    """Distribution of ``metric`` over all mains, per class, per rank and over inactive mains holding points."""
+    from core.analytics import analyze_standings
+
+    with db_manager.get_session() as session:
+        return analyze_standings(session, metric, visible_only).records()
+
+
+def export(args) -> int:
+    """Run the ``export`` subcommand and print the output file and row count."""
+    from app.config import AppConfig
+
+    path = args.out or default_export_path(args.export_format, AppConfig.load(require_api_key=False).csv_output_file)
+    filters = LeaderboardFilter(
+        active=True if args.active else None,
+        hidden=False if args.visible else None,
+        class_name=args.class_name,
+        rank_name=args.rank_name,
+    )
+    columns = [column.strip() for column in args.columns.split(",")] if args.columns else None
+    try:
+        count = export_standings(path, args.export_format, columns, filters, mains_only=not args.all)
+    except (ValueError, ImportError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    write_records([{"path": path, "rows": count}], "json")
+    return 0
+
+
+def run_command(args) -> int:
+    """
+    Execute a parsed ``query``, ``top``, ``alts``, ``items``, ``price``, ``history``, ``movers``,
+    ``analyze``, ``export`` or ``refresh`` subcommand.
+
+    Queries run against the existing database with no fetch and no read model
+    build, so a call costs a single indexed query.
+
+    Args:
+        args: Namespace from ``run.py``'s argument parser.
+
+    Returns:
+        Process exit code: 1 if a requested character or item was not found, the refresh
+        failed or no API key is configured for it, else 0.
+    """
+    if args.command == "export":
+        return export(args)
+    if args.command == "refresh":
+        # Only the refresh needs the fetcher, parser and API configuration
+        from app.config import AppConfig
+        from app.main import EQDKPParserApp
+
+        # Never prompt: a batch refresh runs unattended from cron or scripts
+        config = AppConfig.load(require_api_key=False)
+        if not config.api_key:
+            print("API_KEY is not set; add it to .env or the environment to refresh", file=sys.stderr)
+            return 1
+        result = EQDKPParserApp(config=config).refresh_data()
+        write_records([result.to_dict()], args.format)
+        return 0 if result.points is not None else 1
+
+    db_manager = DatabaseManager(use_read_model=False)
+    if args.command == "query":
+        names = list(args.names)
+        if args.names_file:
+            with open(args.names_file) as f:
+                names.extend(line.strip() for line in f if line.strip())
+        records = query_characters(db_manager, names)
+        missing = len({name_key(name) for name in names}) - len({name_key(record["name"]) for record in records})
+    elif args.command == "top":
+        filters = LeaderboardFilter(
+            active=True if args.active else None,
+            hidden=False if args.visible else None,
+            class_name=args.class_name,
+            rank_name=args.rank_name,
+        )
+        pool = db_manager.find_pool(args.pool) if args.pool else None
+        if args.pool and pool is None:
+            print(f"Unknown pool '{args.pool}'", file=sys.stderr)
+            return 1
+        records = top_characters(db_manager, args.count, args.by, filters, pool)
+        missing = 0
+    elif args.command == "alts":
+        records = alt_group(db_manager, args.name)
+        missing = 0 if records else 1
+    elif args.command == "items":
+        records = purchases(db_manager, args.name, include_alts=not args.own)
+        missing = 0 if records else 1
+    elif args.command == "price":
+        records = item_prices(db_manager, " ".join(args.item))
+        missing = 0 if records else 1
+    elif args.command == "history":
+        records = history(db_manager, args.name, include_alts=not args.own)
+        missing = 0 if records else 1
+    elif args.command == "analyze":
+        records = analyze(db_manager, args.by, args.visible)
+        missing = 0
+    elif args.command == "movers":
+        records = movers(db_manager, args.count, args.by, args.start, args.end)
+        missing = 0
+    else:
+        raise ValueError(f"Unknown command '{args.command}'")
+
+    write_records(records, args.format)
+    if missing:
+        message = {"items": "No items found", "price": "No sales found", "history": "No history found"}.get(
+            args.command, f"{missing} character(s) not found")
+        print(message, file=sys.stderr)
+    return 1 if missing else 0
+
+
+def add_subcommands(parser) -> None:
+    """Register the batch subcommands on an ``argparse.ArgumentParser``."""
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+
+    def add(name: str, help_text: str):
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("--format", choices=OUTPUT_FORMATS, default="json", help="Output format")
+        return subparser
+
+    query = add("query", "Print character cards for one or more names")
+    query.add_argument("names", nargs="*", help="Character names")
+    query.add_argument("--names-file", help="File with one name per line")
+
+    top = add("top", "Print the top N mains")
+    top.add_argument("count", type=int, help="Number of mains")
+    top.add_argument("--by", choices=list(LEADERBOARD_METRICS), default="current", help="Points metric")
+    top.add_argument("--class", dest="class_name", help="Only this class")
+    top.add_argument("--rank", dest="rank_name", help="Only this rank")
+    top.add_argument("--active", action="store_true", help="Only active characters")
+    top.add_argument("--visible", action="store_true", help="Exclude hidden characters")
+    top.add_argument("--pool", help="Rank by the points of this DKP pool (name or id)")
+
+    alts = add("alts", "Print every character in a character's alt group")
+    alts.add_argument("name", help="Character name")
+
+    items = add("items", "Print the items a character and its alts bought")
+    items.add_argument("name", help="Character name")
+    items.add_argument("--own", action="store_true", help="Only the character itself, not its alts")
+
+    price = add("price", "Print sale statistics of items starting with a name")
+    price.add_argument("item", nargs="+", help="Item name or name prefix")
+
+    history_parser = add("history", "Print a character's points after every refresh that changed them")
+    history_parser.add_argument("name", help="Character name")
+    history_parser.add_argument("--own", action="store_true", help="Only the character itself, not its alts")
+
+    movers_parser = add("movers", "Print the mains whose points moved the most between two dates")
+    movers_parser.add_argument("count", type=int, nargs="?", default=10, help="Number of mains")
+    movers_parser.add_argument("--by", choices=SNAPSHOT_METRICS, default="earned", help="Points metric")
+    movers_parser.add_argument("--from", dest="start", type=date_to_timestamp, help="Start date (YYYY-MM-DD), exclusive")
+    movers_parser.add_argument("--to", dest="end", type=date_to_timestamp, help="End date (YYYY-MM-DD), inclusive")
+
+    analyze_parser = add("analyze", "Print points statistics per class and rank and of inactive mains")
+    analyze_parser.add_argument("--by", choices=list(LEADERBOARD_METRICS), default="current", help="Points metric")
+    analyze_parser.add_argument("--visible", action="store_true", help="Exclude hidden characters")
+
+    export_parser = subparsers.add_parser("export", help="Write the standings to a CSV, NDJSON or Parquet file")
+    export_parser.add_argument("--format", dest="export_format", choices=EXPORT_FORMATS, default="csv",
+                               help="File format")
+    export_parser.add_argument("--out", help="Output file (default: CSV_OUTPUT_FILE, processed_data.csv)")
+    export_parser.add_argument("--columns", help="Comma-separated columns to write")
+    export_parser.add_argument("--class", dest="class_name", help="Only this class")
+    export_parser.add_argument("--rank", dest="rank_name", help="Only this rank")
+    export_parser.add_argument("--active", action="store_true", help="Only active characters")
+    export_parser.add_argument("--visible", action="store_true", help="Exclude hidden characters")
+    export_parser.add_argument("--all", action="store_true", help="Every character, not one row per main")
+
+    add("refresh", "Fetch the feeds, update the database and print a summary")
@@ -6,6 +6,8 @@ from typing import Optional
 import os
 from dotenv import load_dotenv, set_key
 from pathlib import Path
+from core.exporter import DEFAULT_EXPORT_FILE
+from core.log_tailer import DEFAULT_BID_PATTERN
 
 @dataclass
 class AppConfig:
@@ -13,14 +15,25 @@ class AppConfig:
     
     api_key: Optional[str]
     xml_output_file: str = "response.xml"
-    csv_output_file: str = "processed_data.csv"
+    csv_output_file: str = DEFAULT_EXPORT_FILE
     log_directory: str = "logs"
+    db_batch_size: int = 1000
+    incremental_sync: bool = True
+    cache_directory: str = ".cache"
+    cache_ttl_seconds: float = 300.0
+    eq_log_file: Optional[str] = None
+    bid_pattern: str = DEFAULT_BID_PATTERN
+    show_banner: bool = True
+    auto_refresh_minutes: float = 0.0
 
     @classmethod
-    def load(cls) -> 'AppConfig':
+    def load(cls, require_api_key: bool = True) -> 'AppConfig':
         """
         Load and validate configuration from environment variables.
         
+        Args:
+            require_api_key: Prompt for the API key if it is missing (not needed offline)
+
         Returns:
             AppConfig instance with loaded settings
         """
@@ -28,12 +41,19 @@ class AppConfig:
         
         api_key = os.getenv('API_KEY')
 
-        if not api_key:
+        if not api_key and require_api_key:
             print("Missing environment variable: API_KEY")
             cls.prompt_for_missing_vars(['API_KEY'])
             return cls.load()  # Retry loading after setting missing variables
         
-        return cls(api_key=api_key)
+        return cls(
+            api_key=api_key,
+            csv_output_file=os.getenv('CSV_OUTPUT_FILE', DEFAULT_EXPORT_FILE),
+            eq_log_file=os.getenv('EQ_LOG_FILE'),
+            bid_pattern=os.getenv('BID_PATTERN', DEFAULT_BID_PATTERN),
+            show_banner=os.getenv('SHOW_BANNER', 'true').lower() not in ('0', 'false', 'no'),
+            auto_refresh_minutes=float(os.getenv('AUTO_REFRESH_MINUTES', 0)),
+        )
 
     @staticmethod
     def prompt_for_missing_vars(missing_vars: list) -> None:
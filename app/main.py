@@ -1,55 +1,117 @@
 """
 Main entry point for the EQDKP Parser application.
 """
-from typing import NoReturn
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, NoReturn, Optional
 import sys
 import os
-import pyfiglet
+import threading
 
 from app.config import AppConfig
-from core.data_fetcher import DataFetcher
+from app.refresher import BackgroundRefresher, describe_age
 from interface.cli import CLI
 from utils.logger import get_logger
 from utils.progress import ProgressManager
 from rich.console import Console
 from core.database import DatabaseManager
-from core.data_parser import DataParser
+from core.data_parser import SYNCED_AT_KEY, DataParser, SyncResult
 
 logger = get_logger(__name__)
 
+BANNER_TEXT = "EQDKP Parser"
+BANNER_FONT = "slant"
+
+
+@dataclass
+class RefreshResult:
+    """Outcome of fetching and ingesting both feeds; None where a feed failed."""
+
+    points: Optional[SyncResult] = None
+    ranks: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'points_updated': self.points is not None,
+            'points_summary': str(self.points) if self.points is not None else None,
+            'feed_timestamp': self.points.feed_timestamp if self.points is not None else None,
+            'ranks_applied': self.ranks,
+        }
+
+
 class EQDKPParserApp:
     """Main application class that orchestrates the EQDKP Parser functionality."""
     
-    def __init__(self) -> None:
-        """Initialize application components and configuration."""
-        self.config = AppConfig.load()
-        self.data_fetcher = DataFetcher()
-        self.data_parser = DataParser()
+    def __init__(self, offline: bool = False, show_banner: Optional[bool] = None,
+                 config: Optional[AppConfig] = None) -> None:
+        """
+        Initialize application components and configuration.
+
+        Args:
+            offline: Start from the local database without contacting the API.
+            show_banner: Draw the startup banner; defaults to ``AppConfig.show_banner``.
+            config: Configuration to use; loaded from the environment (prompting
+                for a missing API key unless offline) when omitted.
+        """
+        self.offline = offline
+        self.config = config or AppConfig.load(require_api_key=not offline)
+        self.show_banner = self.config.show_banner if show_banner is None else show_banner
         self.progress = ProgressManager()
         self.console = Console()
         self.cli = None
+        self.refresher: Optional[BackgroundRefresher] = None
         self.db_manager = DatabaseManager()
         
         logger.info("Application initialized")
 
+    @cached_property
+    def data_fetcher(self):
+        """API client, created (and ``requests`` imported) only when a fetch is made."""
+        from core.data_fetcher import DataFetcher
+        from core.http_cache import ResponseCache
+
+        return DataFetcher(cache=ResponseCache(self.config.cache_directory, self.config.cache_ttl_seconds))
+
+    @cached_property
+    def data_parser(self) -> DataParser:
+        return DataParser(batch_size=self.config.db_batch_size)
+
     def run(self) -> NoReturn:
         """
         Run the main application loop.
         
         This method orchestrates the main application flow:
         1. Validates configuration
-        2. Fetches data from API
-        3. Processes the data
-        4. Starts the CLI interface
+        2. Starts the CLI from the local database, marked with the data's age
+        3. Fetches and ingests fresh data in the background (and on the
+           auto-refresh interval), swapping it in when complete
+        
+        Only a first run with an empty database waits for the fetch.
         """
         try:
-            # Display header first
-            ascii_art = pyfiglet.figlet_format("EQDKP Parser", font="slant")
-            self.console.print(f"[bold cyan]{ascii_art}[/bold cyan]")
-            
-            self._fetch_character_data()
-            self._fetch_ranks_data()
-            self.cli = CLI()
+            if self.show_banner:
+                self._display_banner()
+
+            synced_at = self.db_manager.get_sync_value(SYNCED_AT_KEY)
+            fetched = False
+            if self.offline:
+                self.progress.show_progress("Offline: using the local database", success=False)
+            elif synced_at is None:
+                # Nothing stored yet, so there is nothing to show until the first fetch lands
+                self._fetch_data()
+                synced_at = self.db_manager.get_sync_value(SYNCED_AT_KEY)
+                fetched = True
+            self.progress.show_progress(f"Data from {describe_age(synced_at)}", success=synced_at is not None)
+
+            # Warm the read model in the background; the first lookup waits for it if needed
+            threading.Thread(target=self.db_manager.refresh_read_model, name="read-model", daemon=True).start()
+            if not self.offline:
+                self.refresher = BackgroundRefresher(self.refresh_data, self.db_manager,
+                                                     self.config.auto_refresh_minutes * 60)
+                self.refresher.start(immediately=not fetched)
+            self.cli = CLI(log_file=self.config.eq_log_file, bid_pattern=self.config.bid_pattern,
+                           refresher=self.refresher, export_file=self.config.csv_output_file)
             self.cli.start()
             
         except Exception as e:
@@ -61,41 +123,99 @@ class EQDKPParserApp:
             sys.exit(1)
 
 
-    def _fetch_character_data(self) -> None:
-        """Fetch character data from the API and update the local list of characters."""
-        self.progress.show_progress("Fetching character data from API...", success=False)
-        character_data = self.data_fetcher.fetch_character_data(self.config.api_key)
+    def _display_banner(self) -> None:
+        """Print the figlet banner, rendered once and then read from the cache directory."""
+        path = os.path.join(self.config.cache_directory, f"banner-{BANNER_FONT}.txt")
+        try:
+            with open(path, 'r') as f:
+                ascii_art = f.read()
+        except OSError:
+            import pyfiglet
+
+            ascii_art = pyfiglet.figlet_format(BANNER_TEXT, font=BANNER_FONT)
+            try:
+                os.makedirs(self.config.cache_directory, exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(ascii_art)
+            except OSError as e:
+                logger.warning(f"Could not cache banner: {e}")
+        self.console.print(f"[bold cyan]{ascii_art}[/bold cyan]")
+
+    def _fetch_data(self) -> None:
+        """Fetch both feeds, update the database and report the outcome."""
+        self.progress.show_progress("Fetching character and ranks data from API...", success=False)
+        result = self.refresh_data()
+
+        if result.points is None:
+            self.progress.show_progress("Character data could not be fetched", success=False)
+        else:
+            self.progress.show_progress(f"Character data successfully fetched and updated ({result.points})")
 
-        # Parse the XML data and save to database
-        try:    
-            self.progress.show_progress("Parsing character data...", success=False)
-            self.data_parser.parse_character_data(character_data)
+        if result.ranks is None:
+            self.progress.show_progress("Ranks data could not be fetched", success=False)
+        else:
+            self.progress.show_progress("Ranks data successfully fetched and updated")
+
+    def refresh_data(self) -> RefreshResult:
+        """
+        Fetch the points and ranks feeds concurrently and update the database.
+
+        Each feed is parsed while it downloads. The points feed is ingested as it
+        arrives, the rank rows are collected, and the ranks are applied once both
+        streams have landed. Failures are logged and reported as missing results.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="fetch") as pool:
+            points_future = pool.submit(self._ingest_character_data)
+            ranks_future = pool.submit(self._load_ranks_data)
 
+        result = RefreshResult()
+        try:
+            result.points = points_future.result()
         except Exception as e:
-            self.progress.show_progress("Error parsing XML data", success=False)
             logger.error(f"Error parsing XML data: {e}")
-            return
-        
-        self.progress.show_progress("Character data successfully fetched and updated")
 
-    def _fetch_ranks_data(self) -> None:
-        """Fetch ranks data from the API and update the local list of ranks."""
-        self.progress.show_progress("Fetching ranks data from API...", success=False)
-        ranks_data = self.data_fetcher.fetch_ranks_data(self.config.api_key)
-        self.data_parser.parse_character_rank_data(ranks_data)
-        self.progress.show_progress("Ranks data successfully fetched and updated")  
+        try:
+            rank_rows = ranks_future.result()
+        except Exception as e:
+            logger.error(f"Error parsing ranks XML data: {e}")
+            rank_rows = None
+
+        if rank_rows is not None:
+            self.data_parser.apply_ranks(rank_rows)
+            result.ranks = len(rank_rows)
+        return result
+
+    def _ingest_character_data(self) -> Optional[SyncResult]:
+        """Stream the points feed straight into the database. Runs on a worker thread."""
+        with self.data_fetcher.stream_character_data(self.config.api_key) as stream:
+            if stream is None:
+                return None
+            result = self.data_parser.parse_character_stream(stream, incremental=self.config.incremental_sync)
+            if result.skipped:
+                # Unchanged feed: don't download the rest of it
+                stream.close()
+            return result
+
+    def _load_ranks_data(self) -> Optional[List[Dict[str, Any]]]:
+        """Stream and parse the ranks feed into rank rows. Runs on a worker thread."""
+        with self.data_fetcher.stream_ranks_data(self.config.api_key) as stream:
+            if stream is None:
+                return None
+            return list(self.data_parser.iter_ranks(stream))
 
-def main(debug: bool = False) -> None:
+def main(debug: bool = False, offline: bool = False, show_banner: Optional[bool] = None) -> None:
     """
     Application entry point.
     
     Args:
         debug: Enable debug output if True
+        offline: Skip the API fetch and use the local database
+        show_banner: Override ``AppConfig.show_banner``
     """
     # Set debug mode environment variable
     os.environ['DEBUG_MODE'] = 'true' if debug else 'false'
     
-    app = EQDKPParserApp()
+    app = EQDKPParserApp(offline=offline, show_banner=show_banner)
     app.run()
 
 if __name__ == "__main__":
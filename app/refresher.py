@@ -0,0 +1,136 @@
+"""
+Background refresh of the local database while the CLI stays usable.
+"""
+import queue
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, List, Optional
+from core.database import DatabaseManager
+from core.data_parser import SYNCED_AT_KEY
+from utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from app.main import RefreshResult
+
+logger = get_logger(__name__)
+
+
+def describe_age(synced_at: Optional[str], now: Optional[datetime] = None) -> str:
+    """
+    Describe how old the stored data is, e.g. ``"12 minutes ago"``.
+
+    Args:
+        synced_at: UTC ISO timestamp of the last sync (``points_synced_at``), or None.
+        now: Current UTC time; defaults to ``datetime.utcnow()``.
+    """
+    if not synced_at:
+        return "never synced"
+    try:
+        seconds = ((now or datetime.utcnow()) - datetime.fromisoformat(synced_at)).total_seconds()
+    except ValueError:
+        return f"synced at {synced_at}"
+
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            value = int(seconds // size)
+            return f"{value} {unit}{'s' if value != 1 else ''} ago"
+    return "just now"
+
+
+class BackgroundRefresher:
+    """
+    Fetches and ingests the feeds on a worker thread, on demand and on an interval.
+
+    The ingest runs inside ``DatabaseManager.hold_read_model``, so commands keep
+    reading the previous data until the new data is complete and swapped in.
+    Outcomes are queued as notices for the CLI to print between commands rather
+    than written over whatever the user is doing.
+    """
+
+    def __init__(self, refresh: Callable[[], 'RefreshResult'], db_manager: Optional[DatabaseManager] = None,
+                 interval_seconds: float = 0.0) -> None:
+        """
+        Initialize the refresher.
+
+        Args:
+            refresh: Fetches both feeds and updates the database, e.g. ``EQDKPParserApp.refresh_data``.
+            db_manager: Database whose read model is swapped after each refresh.
+            interval_seconds: Time between automatic refreshes; 0 only refreshes on ``trigger``.
+        """
+        self.refresh = refresh
+        self.db_manager = db_manager or DatabaseManager()
+        self.interval_seconds = interval_seconds
+        self.notices: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._busy = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a refresh is running."""
+        return self._busy.is_set()
+
+    def start(self, immediately: bool = True) -> None:
+        """
+        Start the worker thread.
+
+        Args:
+            immediately: Refresh right away instead of waiting for the first interval or trigger.
+        """
+        if immediately:
+            self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="refresh", daemon=True)
+        self._thread.start()
+
+    def trigger(self) -> None:
+        """Ask for a refresh now; ignored if one is already running."""
+        if not self.busy:
+            self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker after the current refresh, if any."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def drain_notices(self) -> List[str]:
+        """Return and clear the notices queued since the last call."""
+        notices = []
+        while True:
+            try:
+                notices.append(self.notices.get_nowait())
+            except queue.Empty:
+                return notices
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.interval_seconds or None)
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            self.refresh_once()
+
+    def refresh_once(self) -> None:
+        """Run one refresh on the calling thread and queue a notice with the outcome."""
+        self._busy.set()
+        try:
+            with self.db_manager.hold_read_model():
+                result = self.refresh()
+        except Exception as e:
+            logger.error(f"Background refresh failed: {e}")
+            self.notices.put(f"[red]Refresh failed ({e}); still showing data from {self._age()}.[/red]")
+            return
+        finally:
+            self._busy.clear()
+
+        if result.points is None:
+            self.notices.put(f"[red]Character data could not be fetched; still showing data from {self._age()}.[/red]")
+        else:
+            self.notices.put(f"[green]Data refreshed: {result.points}.[/green]")
+        if result.ranks is None:
+            self.notices.put("[yellow]Ranks data could not be fetched.[/yellow]")
+
+    def _age(self) -> str:
+        return describe_age(self.db_manager.get_sync_value(SYNCED_AT_KEY))
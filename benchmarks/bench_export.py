@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming standings export on a synthetic roster.
+
+Builds a temporary database with ``--rows`` characters (every third one a
+main with two alts) and times each export format, and reports the peak Python memory of one more run.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import DatabaseManager
+from core.exporter import EXPORT_FORMATS, export_standings
+
+
+def build_roster(db_manager: DatabaseManager, rows: int) -> None:
+    """Insert ``rows`` characters, grouped into a main and two alts."""
+    db_manager.bulk_upsert_characters({
+        'id': character_id, 'name': f'Char{character_id}', 'class_id': 1, 'class_name': 'Enchanter',
+        'active': True, 'hidden': False, 'main_id': character_id - (character_id - 1) % 3,
+        'current': float(character_id % 997), 'current_with_twink': float(character_id % 997),
+    } for character_id in range(1, rows + 1))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the standings export')
+    parser.add_argument('--rows', type=int, default=100000, help='Characters in the synthetic roster')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per format (best is reported)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(f"sqlite:///{os.path.join(directory, 'bench.db')}", use_read_model=False)
+        build_roster(db_manager, args.rows)
+
+        print(f"{'export':<16} {'rows':>8} {'best s':>8} {'peak MiB':>9}")
+        for output_format in EXPORT_FORMATS:
+            for mains_only in (True, False):
+                path = os.path.join(directory, f'export.{output_format}')
+                samples = []
+                try:
+                    for _ in range(args.repeat):
+                        started = time.perf_counter()
+                        count = export_standings(path, output_format, mains_only=mains_only, db_manager=db_manager)
+                        samples.append(time.perf_counter() - started)
+                except ImportError as e:
+                    print(f"{output_format:<16} skipped: {e}")
+                    break
+                # Memory is traced in a separate run; tracing slows the export down
+                tracemalloc.start()
+                export_standings(path, output_format, mains_only=mains_only, db_manager=db_manager)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                name = f"{output_format} {'mains' if mains_only else 'all'}"
+                print(f"{name:<16} {count:>8} {min(samples):>8.3f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
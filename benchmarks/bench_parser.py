@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming points parser against the original full-tree parser.
+
+Usage:
+    python benchmarks/bench_parser.py [--file tests/sample_data.xml] [--scale 4] [--repeat 3]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_parser import iter_elements, player_to_row
+
+DEFAULT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'sample_data.xml')
+
+
+def tree_parse(data: bytes) -> int:
+    """The original path: build the whole tree, then run findtext per field."""
+    root = ET.fromstring(data)
+    count = 0
+    for player in root.find('players').findall('player'):
+        int(player.findtext('id', 0))
+        player.findtext('name', 'Unknown')
+        int(player.findtext('class_id', 0))
+        player.findtext('class_name', 'Unknown')
+        bool(int(player.findtext('active', 0)))
+        bool(int(player.findtext('hidden', 0)))
+        int(player.findtext('main_id', 0)) if player.find('main_id') is not None else None
+        player.findtext('main_name', None)
+        float(player.findtext('points/multidkp_points/points_current', 0))
+        float(player.findtext('points/multidkp_points/points_current_with_twink', 0))
+        float(player.findtext('points/multidkp_points/points_earned', 0))
+        float(player.findtext('points/multidkp_points/points_earned_with_twink', 0))
+        float(player.findtext('points/multidkp_points/points_spent', 0))
+        float(player.findtext('points/multidkp_points/points_spent_with_twink', 0))
+        float(player.findtext('points/multidkp_points/points_adjustment', 0))
+        float(player.findtext('points/multidkp_points/points_adjustment_with_twink', 0))
+        count += 1
+    return count
+
+
+def stream_parse(data: bytes) -> int:
+    """The streaming path: iterparse, one pass per player, clear as we go."""
+    count = 0
+    for player in iter_elements(io.BytesIO(data), {('players', 'player')}):
+        player_to_row(player)
+        count += 1
+    return count
+
+
+def scale_feed(data: bytes, factor: int) -> bytes:
+    """Repeat the <players> block to simulate a larger, merged feed."""
+    if factor <= 1:
+        return data
+    start = data.index(b'<players>') + len(b'<players>')
+    end = data.index(b'</players>')
+    return data[:start] + data[start:end] * factor + data[end:]
+
+
+def measure(func, data: bytes, repeat: int):
+    """Return (players, best seconds, peak traced bytes) for a parse function."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        count = func(data)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark points feed parsing')
+    parser.add_argument('--file', default=DEFAULT_FILE, help='Points XML to parse')
+    parser.add_argument('--scale', type=int, default=1, help='Repeat the player list N times')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per parser')
+    args = parser.parse_args()
+
+    with open(args.file, 'rb') as f:
+        data = scale_feed(f.read(), args.scale)
+
+    print(f"Feed: {args.file} x{args.scale} ({len(data) / 1024 / 1024:.1f} MiB)")
+    print(f"{'parser':<8} {'players':>8} {'seconds':>9} {'peak MiB':>9}")
+    for name, func in (('tree', tree_parse), ('stream', stream_parse)):
+        count, seconds, peak = measure(func, data, args.repeat)
+        print(f"{name:<8} {count:>8} {seconds:>9.3f} {peak / 1024 / 1024:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long the interactive CLI takes to become usable.
+
+Measures, in fresh interpreters, the import of the application module and the
+wall time from launching ``run.py`` until the first command prompt is printed.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 5] [--online] [--banner]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b"Enter command"
+
+
+def time_import(module: str) -> float:
+    """Seconds to start an interpreter and import ``module``."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', f'import {module}'], cwd=ROOT, check=True)
+    return time.perf_counter() - started
+
+
+def time_to_prompt(args) -> float:
+    """Seconds from launching ``run.py`` until the first prompt appears on stdout."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, 'run.py', *args], cwd=ROOT,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    output = b""
+    try:
+        while PROMPT not in output:
+            chunk = os.read(process.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError(f"run.py exited before prompting: {output[-500:]!r}")
+            output += chunk
+        elapsed = time.perf_counter() - started
+        process.communicate(b"exit\n", timeout=30)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup time')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+    parser.add_argument('--online', action='store_true', help='Fetch the feeds before prompting')
+    parser.add_argument('--banner', action='store_true', help='Draw the startup banner')
+    args = parser.parse_args()
+
+    run_args = [] if args.online else ['--offline']
+    if not args.banner:
+        run_args.append('--no-banner')
+
+    print(f"{'measurement':<20} {'best s':>8} {'median s':>9}")
+    for name, func in (('import app.main', lambda: time_import('app.main')),
+                       ('time to prompt', lambda: time_to_prompt(run_args))):
+        samples = sorted(func() for _ in range(args.repeat))
+        print(f"{name:<20} {samples[0]:>8.3f} {samples[len(samples) // 2]:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Class- and rank-level statistics of the standings, computed with vectorized NumPy operations.
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.models import Character
+from core.read_model import LEADERBOARD_METRICS
+
+# Percentiles reported for every group
+PERCENTILES = (25, 50, 75, 90)
+
+# Share of the mains counted as the top of the standings
+TOP_FRACTION = 0.10
+
+
+@dataclass(frozen=True)
+class GroupStats:
+    """Distribution of one metric over a group of mains."""
+
+    name: str
+    mains: int
+    total: float
+    share: float
+    mean: float
+    p25: float
+    median: float
+    p75: float
+    p90: float
+    maximum: float
+
+
+@dataclass(frozen=True)
+class Holder:
+    """A main holding points, as listed in the report."""
+
+    name: str
+    class_name: str
+    rank_name: Optional[str]
+    points: float
+
+
+@dataclass
+class StandingsReport:
+    """Aggregates of one metric over every main."""
+
+    metric: str
+    overall: GroupStats
+    top_count: int
+    top_share: float
+    classes: List[GroupStats] = field(default_factory=list)
+    ranks: List[GroupStats] = field(default_factory=list)
+    inactive: Optional[GroupStats] = None
+    inactive_holders: List[Holder] = field(default_factory=list)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Every group as a flat dictionary with a ``group_by`` key, for machine-readable output."""
+        groups = [('all', [self.overall]), ('class', self.classes), ('rank', self.ranks),
+                  ('inactive', [self.inactive] if self.inactive else [])]
+        return [{'group_by': group_by, **asdict(stats)} for group_by, rows in groups for stats in rows]
+
+
+def group_stats(keys: np.ndarray, values: np.ndarray, grand_total: float) -> List[GroupStats]:
+    """
+    Compute ``GroupStats`` for every distinct key in one pass.
+
+    The values are sorted once by (key, value); each group is then a contiguous
+    slice, so sums come from ``np.add.reduceat`` and percentiles from linear
+    interpolation at computed positions, with no Python loop over rows.
+
+    Args:
+        keys: Group name per main.
+        values: Metric per main.
+        grand_total: Denominator of the ``share`` column.
+
+    Returns:
+        One entry per group, largest total first.
+    """
+    if len(values) == 0:
+        return []
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    names, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+    totals = np.add.reduceat(values, starts)
+
+    def percentile(q: float) -> np.ndarray:
+        # Same interpolation as np.percentile's default, for every group at once
+        position = starts + (counts - 1) * q / 100
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts + counts - 1)
+        return values[low] + (values[high] - values[low]) * (position - low)
+
+    p25, p50, p75, p90 = (percentile(q) for q in PERCENTILES)
+    maxima = values[starts + counts - 1]
+    shares = totals / grand_total if grand_total else np.zeros(len(totals))
+    stats = [
+        GroupStats(str(names[i]), int(counts[i]), float(totals[i]), float(shares[i]), float(totals[i] / counts[i]),
+                   float(p25[i]), float(p50[i]), float(p75[i]), float(p90[i]), float(maxima[i]))
+        for i in range(len(names))
+    ]
+    return sorted(stats, key=lambda s: (-s.total, s.name))
+
+
+def analyze_standings(session: Session, metric: str = 'current', visible_only: bool = False,
+                      holders: int = 10) -> StandingsReport:
+    """
+    Build the report from one columnar read of the mains.
+
+    Args:
+        session: Session to read with.
+        metric: One of ``LEADERBOARD_METRICS``; alt group totals are used.
+        visible_only: Leave out hidden characters.
+        holders: Number of inactive mains with the most points to list.
+
+    Raises:
+        ValueError: For an unknown metric.
+    """
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Unknown leaderboard metric '{metric}'; expected one of {', '.join(LEADERBOARD_METRICS)}")
+
+    query = select(Character.name, Character.class_name, Character.rank_name, Character.active,
+                   Character.__table__.c[LEADERBOARD_METRICS[metric]]).where(Character.is_main.is_(True))
+    if visible_only:
+        query = query.where(Character.hidden.is_not(True))
+    columns = list(zip(*session.execute(query).all())) or [()] * 5
+    names = np.array(columns[0], dtype=object)
+    classes = np.array([value or 'Unknown' for value in columns[1]], dtype=str)
+    ranks = np.array([value or 'No rank' for value in columns[2]], dtype=str)
+    active = np.array(columns[3], dtype=bool)
+    values = np.array(columns[4], dtype=np.float64)
+
+    total = float(values.sum())
+    overall = group_stats(np.full(len(values), 'All mains'), values, total)
+    top_count = int(np.ceil(len(values) * TOP_FRACTION))
+    # np.partition puts the top_count largest values last without a full sort
+    cut = len(values) - top_count
+    top_total = float(np.partition(values, cut)[cut:].sum()) if top_count else 0.0
+
+    holding = ~active & (values > 0)
+    inactive = group_stats(np.full(int(holding.sum()), 'Inactive with points'), values[holding], total)
+    positions = np.flatnonzero(holding)
+    positions = positions[np.argsort(-values[positions], kind='stable')[:holders]]
+
+    return StandingsReport(
+        metric=metric,
+        overall=overall[0] if overall else GroupStats('All mains', 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+        top_count=top_count,
+        top_share=top_total / total if total else 0.0,
+        classes=group_stats(classes, values, total),
+        ranks=group_stats(ranks, values, total),
+        inactive=inactive[0] if inactive else None,
+        inactive_holders=[Holder(names[i], str(classes[i]), columns[2][i], float(values[i])) for i in positions],
+    )
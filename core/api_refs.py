@@ -1,5 +1,7 @@
 import os
+from typing import Optional
 import requests
+from core.http_client import HTTPClient, get_http_client
 
 
 # Environment Variable for Base URL
@@ -18,13 +20,15 @@ class APIReadPaths:
     ME = "/api.php?function=me&atoken={api_token}&atype=api"
     RANKS = "/api.php?function=character_ranks&atoken={api_token}&atype=api"
     
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, client: Optional[HTTPClient] = None):
         """
         Initialize the APIReadPaths with an API token.
         
         :param api_token: The API token for authentication.
+        :param client: HTTP client to use; defaults to the shared pooled client.
         """
         self.api_token = api_token
+        self.client = client or get_http_client()
 
     def build_url(self, path: str, **params) -> str:
         """
@@ -48,9 +52,9 @@ class APIReadPaths:
         """
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=headers)
+                response = self.client.get(url, headers=headers)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=payload)
+                response = self.client.post(url, headers=headers, json=payload)
             else:
                 raise ValueError("Unsupported HTTP method.")
 
@@ -1,6 +1,59 @@
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from core.database import DatabaseManager
+from core.models import DKPPool, name_key
+from core.read_model import CharacterCard
+
+# "[timestamp] Name tells the raid, '...'" and similar chat lines; the speaker is the bidder
+CHAT_LINE_PATTERN = re.compile(r"^(?:\[[^\]]*\]\s*)?([A-Za-z]+)\s+(?:tells|says|shouts|auctions)\b")
+
+# EverQuest character names are letters only
+NAME_PATTERN = re.compile(r"[A-Za-z]+")
+
+
+def parse_names(text: str) -> List[str]:
+    """
+    Extract character names from pasted text, keeping the first occurrence of each.
+
+    Lines that look like chat (e.g. a ``/rs`` tell dump) contribute their speaker;
+    any other line is read as a comma or space separated list of names.
+
+    Args:
+        text: One or more lines of names or chat output.
+
+    Returns:
+        Unique names in the order they first appear.
+    """
+    names: Dict[str, str] = {}
+    for line in text.splitlines():
+        match = CHAT_LINE_PATTERN.match(line.strip())
+        for name in [match.group(1)] if match else NAME_PATTERN.findall(line):
+            names.setdefault(name_key(name), name)
+    return list(names.values())
+
+
+@dataclass(frozen=True)
+class BidParticipant:
+    """A main character taking part in a bid, entered under one of its characters."""
+
+    main_id: int
+    name: str
+    rank_name: Optional[str]
+    points_current: float
+
+    @property
+    def sort_key(self) -> Tuple[float, str, int]:
+        """Highest points first, then alphabetical."""
+        return (-self.points_current, name_key(self.name), self.main_id)
+
+    @property
+    def main_character(self) -> str:
+        return f"{self.name} ({self.rank_name})"
+
 
 class BiddingManager:
     """Manages bidding sessions for characters."""
@@ -8,13 +61,39 @@ class BiddingManager:
     def __init__(self) -> None:
         """Initialize the bidding manager."""
         self.db_manager = DatabaseManager()
-        self.current_bid = []
         self.console = Console()
+        self._participants: Dict[int, BidParticipant] = {}
+        # Min-heap of sort keys: O(log n) per insert and the leader at [0];
+        # the fully sorted view is built only when the bid is shown
+        self._heap: List[Tuple[float, str, int]] = []
+        self._sorted: Optional[List[BidParticipant]] = []
+        self.pool: Optional[DKPPool] = None
+        self._pool_standings = None
+
+    @property
+    def current_bid(self) -> List[BidParticipant]:
+        """Participants ordered by points, highest first; sorted once per change, then cached."""
+        if self._sorted is None:
+            self._sorted = [self._participants[main_id] for _, _, main_id in sorted(self._heap)]
+        return self._sorted
+
+    def _reset(self) -> None:
+        self._participants = {}
+        self._heap = []
+        self._sorted = []
+
+    def start_bid(self, pool: Optional[DKPPool] = None) -> None:
+        """
+        Start a new bidding session.
 
-    def start_bid(self) -> None:
-        """Start a new bidding session."""
-        self.current_bid = []
-        self.console.print("[green]Bidding session started![/green]")
+        Args:
+            pool: DKP pool the bid is paid from; None uses the default points.
+        """
+        self._reset()
+        self.pool = pool
+        self._pool_standings = self.db_manager.get_pool_standings(pool.id) if pool is not None else None
+        suffix = f" ({pool.name} pool)" if pool is not None else ""
+        self.console.print(f"[green]Bidding session started{suffix}![/green]")
 
     def add_character(self, character_name: str) -> None:
         """
@@ -23,38 +102,72 @@ class BiddingManager:
         Args:
             character_name: Name of the character to add.
         """
-        # Query the database for the character
-        character_info = self.db_manager.get_character_by_name(character_name)
-        if character_info is not None:
-            main_character = character_info.name
-            character_rank = character_info.rank_name
-            points_current = character_info.current_with_twink
-
-            # Check if the main character is already in the current bid
-            if any(char['main_character'].lower() == main_character.lower() for char in self.current_bid):
-                self.console.print(f"[yellow]Character '{main_character}' is already in the bid![/yellow]")
-                return
-
-            # Add character to the current bid
-            self.current_bid.append({
-                'main_character': f"{main_character} ({character_rank})",
-                'points_current': points_current
-            })
-            self.current_bid.sort(key=lambda x: x['points_current'], reverse=True)
-            self.console.print(f"[cyan]Added {main_character} to the bid.[/cyan]")
+        self.add_characters([character_name])
+
+    def add_characters(self, character_names: Iterable[str]) -> int:
+        """
+        Add many characters with one database lookup and a single redraw.
+
+        Args:
+            character_names: Names of the characters to add, e.g. from ``parse_names``.
+
+        Returns:
+            Number of participants added.
+        """
+        character_names = list(character_names)
+        cards = self.db_manager.get_character_cards(character_names)
+        missing = [name for name in character_names if name_key(name) not in cards]
+        if missing:
+            self.console.print(f"[red]Not found: {', '.join(missing)}[/red]")
+        return self.add_cards(cards.values())
+
+    def add_cards(self, cards: Iterable[CharacterCard]) -> int:
+        """
+        Add already resolved characters to the bid and redraw the standings once.
+
+        A character whose main (through any of its alts) is already bidding is skipped.
+        In a pool bid the main's points in that pool are used (0 if it has none).
+        Each participant is pushed onto a heap in O(log n); the sorted standings
+        are rebuilt once per call, when they are redrawn.
+
+        Args:
+            cards: Character cards to add.
+
+        Returns:
+            Number of participants added.
+        """
+        added, duplicates = [], []
+        for card in cards:
+            if card.main_id in self._participants:
+                duplicates.append(card.name)
+                continue
+            points = card.current_with_twink
+            if self._pool_standings is not None:
+                entry = self._pool_standings.entry(card.main_id)
+                points = entry.current_with_twink if entry is not None else 0.0
+            participant = BidParticipant(card.main_id, card.name, card.rank_name, points)
+            self._participants[card.main_id] = participant
+            heapq.heappush(self._heap, participant.sort_key)
+            self._sorted = None
+            added.append(card.name)
+
+        for name in duplicates:
+            self.console.print(f"[yellow]Character '{name}' is already in the bid![/yellow]")
+        if added:
+            self.console.print(f"[cyan]Added {', '.join(added)} to the bid.[/cyan]")
             self.display_sorted_bid()
-        else:
-            self.console.print(f"[red]Character '{character_name}' not found![/red]")
+        return len(added)
 
     def display_sorted_bid(self) -> None:
         """Display the current bid participants sorted by points."""
-        table = Table(title="Current Bid Participants")
+        title = "Current Bid Participants" + (f" ({self.pool.name})" if self.pool is not None else "")
+        table = Table(title=title)
         table.add_column("Main Character", style="magenta")
         table.add_column("Current Points", justify="right", style="red")
 
-        for index, char in enumerate(self.current_bid):
+        for index, participant in enumerate(self.current_bid):
             style = "green" if index == 0 else None  # Highlight the top character in green
-            table.add_row(char['main_character'], str(char['points_current']), style=style)
+            table.add_row(participant.main_character, str(participant.points_current), style=style)
 
         self.console.print(table)
 
@@ -63,11 +176,11 @@ class BiddingManager:
         self.console.print("[yellow]Bidding session ended![/yellow]")
         self.display_sorted_bid()
 
-        if self.current_bid:
-            # The winner is the character with the highest points
-            winner = self.current_bid[0]
-            self.console.print(f"[bold green]Winner: {winner['main_character']} with {winner['points_current']} points![/bold green]")
+        if self._heap:
+            # The heap's smallest key is the character with the highest points
+            winner = self._participants[self._heap[0][2]]
+            self.console.print(f"[bold green]Winner: {winner.main_character} with {winner.points_current} points![/bold green]")
         else:
             self.console.print("[red]No participants in the bid.[/red]")
 
-        self.current_bid = [] 
\ No newline at end of file
+        self._reset()
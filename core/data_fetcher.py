@@ -1,20 +1,78 @@
-from typing import Optional
+from contextlib import contextmanager
+from typing import IO, ContextManager, Iterator, List, Optional, Tuple
+import hashlib
+import io
 import requests
 from rich.console import Console
 from utils.logger import get_logger
+from core.api_refs import APIReadPaths
 from core.database import DatabaseManager
+from core.http_client import HTTPClient, get_http_client
+from core.http_cache import AtomicFile, CacheEntry, ResponseCache
 
 
 logger = get_logger(__name__)
 
+# API function names
+POINTS = "points"
+CHARACTER_RANKS = "character_ranks"
+
+# API function name -> APIReadPaths path
+API_PATHS = {
+    POINTS: APIReadPaths.POINTS,
+    CHARACTER_RANKS: APIReadPaths.RANKS,
+}
+
+# Local copy of the last downloaded points feed
+POINTS_FILE = "points.xml"
+
+
+class _TeeReader:
+    """Binary reader that copies everything read from ``source`` into a list of sinks."""
+
+    def __init__(self, source: IO[bytes], sinks: List[AtomicFile]) -> None:
+        self.source = source
+        self.sinks = sinks
+        self.size = 0
+        self.eof = False
+        self.closed = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.source.read(size)
+        if not data or size is None or size < 0:
+            self.eof = True
+        self.size += len(data)
+        for sink in self.sinks:
+            sink.write(data)
+        return data
+
+    def drain(self, chunk_size: int = 64 * 1024) -> None:
+        while not self.eof:
+            self.read(chunk_size)
+
+    def close(self) -> None:
+        """Stop reading early; the rest of the body is neither downloaded nor copied."""
+        self.closed = True
+
+    def discard(self) -> None:
+        for sink in self.sinks:
+            sink.discard()
+
 class DataFetcher:
     """Handles fetching data from the EQDKP API."""
     
-    def __init__(self) -> None:
-        """Initialize the DataFetcher."""
+    def __init__(self, cache: Optional[ResponseCache] = None, client: Optional[HTTPClient] = None) -> None:
+        """
+        Initialize the DataFetcher.
+
+        Args:
+            cache: Optional on-disk response cache. Without one every call hits the network.
+            client: HTTP client to use; defaults to the shared pooled client.
+        """
         self.console = Console()
-        self.base_url = "https://dkp.kwsm.app/api.php"
         self.db_manager = DatabaseManager()
+        self.cache = cache
+        self.client = client or get_http_client()
 
     def fetch_character_data(self, api_token: str) -> Optional[str]:
         """
@@ -27,29 +85,14 @@ class DataFetcher:
             The raw XML data as a string, or None if the request fails.
         """
         logger.info("Starting data fetch...")
-        
-        api_url = f"{self.base_url}?function=points&atoken={api_token}&atype=api"
-
-        try:
-            response = requests.get(api_url)
-            if response.status_code == 200:
-                logger.info("Data successfully fetched from the API")
-                logger.debug(f"Response content type: {type(response.text)}")
-                logger.debug(f"First 200 characters of response: {response.text[:200]}")
-
-                # save to file
-                with open("points.xml", "w") as f:
-                    f.write(response.text)
-
-                return response.text  # Ensure this is being handled correctly
-            else:
-                logger.error(f"Failed to fetch data. Status: {response.status_code}")
-                return None
-
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
+        body = self._fetch(POINTS, api_token)
+        if body is None:
             return None
 
+        logger.info("Data successfully fetched from the API")
+        logger.debug(f"First 200 characters of response: {body[:200]!r}")
+        return body.decode('utf-8')
+
     def fetch_ranks_data(self, api_token: str) -> Optional[str]:    
         """
         Fetch ranks data from the API and return the XML data.
@@ -60,22 +103,185 @@ class DataFetcher:
         Returns:
             The raw XML data as a string, or None if the request fails.
         """
-        api_url = f"{self.base_url}?function=character_ranks&atoken={api_token}&atype=api"
+        body = self._fetch(CHARACTER_RANKS, api_token)
+        if body is None:
+            return None
+
+        logger.info("Ranks data successfully fetched from the API")
+        return body.decode('utf-8')
+
+    def stream_character_data(self, api_token: str) -> ContextManager[Optional[IO[bytes]]]:
+        """
+        Open the points feed as a binary stream that can be parsed while it downloads.
+
+        Usage::
+
+            with fetcher.stream_character_data(token) as stream:
+                if stream is not None:
+                    parser.parse_character_stream(stream)
+
+        Close the stream to stop early; the rest of the body is then not downloaded.
+
+        Args:
+            api_token: The API token for authentication
+
+        Returns:
+            A context manager yielding a readable binary stream, or None if the request fails.
+        """
+        return self._stream(POINTS, api_token)
+
+    def stream_ranks_data(self, api_token: str) -> ContextManager[Optional[IO[bytes]]]:
+        """
+        Open the character ranks feed as a binary stream.
+
+        Args:
+            api_token: The API token for authentication
+
+        Returns:
+            A context manager yielding a readable binary stream, or None if the request fails.
+        """
+        return self._stream(CHARACTER_RANKS, api_token)
+
+    def _fetch(self, function: str, api_token: str) -> Optional[bytes]:
+        """
+        Fetch the raw body of an API function, going through the response cache if configured.
+
+        A fresh cache entry is returned without touching the network. A stale one
+        is revalidated with ETag/Last-Modified, and a 304 reuses the cached body.
+
+        Args:
+            function: The API function name (e.g. ``points``).
+            api_token: The API token for authentication
+
+        Returns:
+            The response body, or None if the request fails.
+        """
+        key = self._cache_key(function, api_token)
+        entry, body = self._lookup(function, key)
+        if body is not None:
+            return body
+
+        response = self._send(function, api_token, entry)
+        if response is None:
+            return None
+
+        if response.status_code == 304 and entry is not None:
+            return self._revalidated(function, key, entry)
+
+        if response.status_code != 200:
+            logger.error(f"Failed to fetch {function} data. Status: {response.status_code}")
+            return None
+
+        body = response.content
+        if function == POINTS:
+            # save to file
+            with open(POINTS_FILE, "wb") as f:
+                f.write(body)
+
+        if self.cache:
+            self.cache.store(key, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            self._record_miss(function, int(response.headers.get('Content-Length') or len(body)), len(body))
+        return body
+
+    @contextmanager
+    def _stream(self, function: str, api_token: str) -> Iterator[Optional[IO[bytes]]]:
+        """
+        Yield an API function's body as a stream, teeing it into the cache and points.xml.
+
+        The copies are committed once the consumer is done and the rest of the
+        body has been read. If the consumer raises or closes the stream they are
+        discarded, so a failed or abandoned parse never leaves a truncated cache
+        entry or temporary file behind.
+        """
+        key = self._cache_key(function, api_token)
+        entry, body = self._lookup(function, key)
+        if body is not None:
+            yield io.BytesIO(body)
+            return
+
+        response = self._send(function, api_token, entry, stream=True)
+        if response is None:
+            yield None
+            return
 
         try:
-            response = requests.get(api_url)
-            if response.status_code == 200:
-                logger.info("Ranks data successfully fetched from the API")
+            if response.status_code == 304 and entry is not None:
+                yield io.BytesIO(self._revalidated(function, key, entry))
+                return
 
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch {function} data. Status: {response.status_code}")
+                yield None
+                return
 
-                return response.text
-            else:
-                logger.error(f"Failed to fetch ranks data. Status: {response.status_code}")
-                return None
+            response.raw.decode_content = True
+            points_copy = AtomicFile(POINTS_FILE) if function == POINTS else None
+            cache_copy = self.cache.begin(key) if self.cache else None
+            reader = _TeeReader(response.raw, [sink for sink in (points_copy, cache_copy) if sink])
+
+            committed = False
+            try:
+                yield reader
+                # The parser stops at the closing root tag; finish the download so the
+                # copies are complete. A consumer that closed the stream (an incremental
+                # sync that found the feed unchanged) needs none of the rest, and the
+                # cache entry it already has stays valid.
+                if not reader.closed:
+                    reader.drain()
+                    if points_copy:
+                        points_copy.commit()
+                    if cache_copy:
+                        self.cache.commit(key, cache_copy, response.headers.get('ETag'),
+                                          response.headers.get('Last-Modified'))
+                        self._record_miss(function, response.raw.tell(), reader.size)
+                    committed = True
+            finally:
+                if not committed:
+                    reader.discard()
+        finally:
+            response.close()
+
+    @staticmethod
+    def _cache_key(function: str, api_token: str) -> str:
+        return f"{function}-{hashlib.sha1(api_token.encode('utf-8')).hexdigest()[:8]}"
+
+    def _lookup(self, function: str, key: str) -> Tuple[Optional[CacheEntry], Optional[bytes]]:
+        """Return the cache entry for ``key`` and, if it is still fresh, the body to serve."""
+        entry = self.cache.get(key) if self.cache else None
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.stats.hits += 1
+            self.cache.stats.bytes_saved += len(entry.body)
+            logger.info(f"Cache hit for {function} ({len(entry.body)} bytes); {self.cache.stats}")
+            return entry, entry.body
+        return entry, None
+
+    def _send(self, function: str, api_token: str, entry: Optional[CacheEntry],
+              stream: bool = False) -> Optional[requests.Response]:
+        """Issue the GET request, conditional on ``entry`` if there is one."""
+        api_url = APIReadPaths(api_token, self.client).build_url(API_PATHS[function])
+        headers = {'Accept-Encoding': 'gzip, deflate'}
+        if self.cache:
+            headers.update(self.cache.conditional_headers(entry))
+
+        try:
+            return self.client.get(api_url, headers=headers, stream=stream)
         except Exception as e:
             logger.error(f"An error occurred: {e}")
             return None
-        
+
+    def _revalidated(self, function: str, key: str, entry: CacheEntry) -> bytes:
+        """Refresh a cache entry after a 304 Not Modified and return its body."""
+        self.cache.touch(key, entry)
+        self.cache.stats.revalidated += 1
+        self.cache.stats.bytes_saved += len(entry.body)
+        logger.info(f"Cache revalidated for {function} (304 Not Modified); {self.cache.stats}")
+        return entry.body
+
+    def _record_miss(self, function: str, wire_size: int, body_size: int) -> None:
+        self.cache.stats.misses += 1
+        self.cache.stats.bytes_saved += max(body_size - wire_size, 0)
+        logger.info(f"Cache miss for {function} ({wire_size} bytes on the wire, "
+                    f"{body_size} decoded); {self.cache.stats}")
 
     def debug_response(self, response: requests.Response, file_path: str) -> None:
         """
@@ -1,71 +1,381 @@
+import hashlib
+import io
+import os
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 from utils.logger import get_logger
-from core.database import DatabaseManager
-from core.models import Character
+from core.database import CHARACTER_CHILDREN, DEFAULT_BATCH_SIZE, FEED_TIMESTAMP_KEY, DatabaseManager
+from core.models import DKPEvent, DKPPool, ItemPool, name_key
 
 logger = get_logger(__name__)
 
+# A feed can be handed over as a file path or as a binary stream
+XMLSource = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+def _to_bool(text: str) -> bool:
+    return bool(int(text))
+
+
+def _to_timestamp(text: str) -> Optional[int]:
+    """Unix time from a feed date; None when the date is not numeric."""
+    try:
+        return int(float(text))
+    except ValueError:
+        return None
+
+
+# <player> child element -> (characters column, converter)
+PLAYER_FIELDS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    'id': ('id', int),
+    'name': ('name', str),
+    'class_id': ('class_id', int),
+    'class_name': ('class_name', str),
+    'active': ('active', _to_bool),
+    'hidden': ('hidden', _to_bool),
+    'main_id': ('main_id', int),
+    'main_name': ('main_name', str),
+}
+
+# <multidkp_points> child element -> characters column
+POINTS_FIELDS: Dict[str, str] = {
+    'points_current': 'current',
+    'points_current_with_twink': 'current_with_twink',
+    'points_earned': 'earned',
+    'points_earned_with_twink': 'earned_with_twink',
+    'points_spent': 'spent',
+    'points_spent_with_twink': 'spent_with_twink',
+    'points_adjustment': 'adjustment',
+    'points_adjustment_with_twink': 'adjustment_with_twink',
+}
+
+# <item> child element -> (items column, converter)
+ITEM_FIELDS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    'name': ('name', str),
+    'game_id': ('game_id', str),
+    'value': ('value', float),
+    'itempool_id': ('itempool_id', int),
+    'event_id': ('event_id', int),
+    'date': ('timestamp', _to_timestamp),
+    'timestamp': ('timestamp', _to_timestamp),
+}
+
+# <adjustment> child element -> (adjustments column, converter)
+ADJUSTMENT_FIELDS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    'reason': ('reason', str),
+    'value': ('value', float),
+    'event_id': ('event_id', int),
+    'date': ('timestamp', _to_timestamp),
+    'timestamp': ('timestamp', _to_timestamp),
+}
+
+# Values used when a field is missing from an <item> or <adjustment> element
+ITEM_DEFAULTS: Dict[str, Any] = {
+    'name': 'Unknown', 'game_id': None, 'value': 0.0, 'itempool_id': None, 'event_id': None, 'timestamp': None,
+}
+ADJUSTMENT_DEFAULTS: Dict[str, Any] = {'reason': None, 'value': 0.0, 'event_id': None, 'timestamp': None}
+
+# Values used when a field is missing from a <player> element
+PLAYER_DEFAULTS: Dict[str, Any] = {
+    'id': 0,
+    'name': 'Unknown',
+    'class_id': 0,
+    'class_name': 'Unknown',
+    'active': False,
+    'hidden': False,
+    'main_id': None,
+    'main_name': None,
+    **{column: 0.0 for column in POINTS_FIELDS.values()},
+}
+
+# Pool of a <multidkp_points> block that has no <multidkp_id>
+DEFAULT_POOL_ID = 1
+
+# Feed fields that make up a character's content fingerprint, in a fixed order (plus its child rows)
+FINGERPRINT_COLUMNS: Tuple[str, ...] = tuple(PLAYER_DEFAULTS)
+
+# sync_state keys (FEED_TIMESTAMP_KEY is defined with the database, which resets it on migration)
+SYNCED_AT_KEY = 'points_synced_at'
+
+
+@dataclass
+class SyncResult:
+    """Summary of a points feed ingest."""
+
+    feed_timestamp: Optional[str] = None
+    skipped: bool = False
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+    def __str__(self) -> str:
+        if self.skipped:
+            return f"feed unchanged since {self.feed_timestamp}, ingest skipped"
+        return (f"{self.inserted} inserted, {self.updated} updated, "
+                f"{self.unchanged} unchanged, {self.removed} removed")
+
+
+def iter_elements(source: XMLSource, records: Set[Tuple[str, str]]) -> Iterator[ET.Element]:
+    """
+    Incrementally parse an XML feed and yield every completed record element.
+
+    Records are identified by ``(parent_tag, tag)`` pairs. Each yielded element is
+    cleared and detached once the caller resumes the iterator, and top-level
+    sections are dropped as soon as they close, so memory stays flat no matter
+    how large the feed is.
+
+    Args:
+        source: File path or binary stream containing the XML feed.
+        records: ``(parent_tag, tag)`` pairs of the elements to yield.
+
+    Yields:
+        Fully parsed record elements, in document order.
+    """
+    stack = []
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        if not stack:
+            break
+
+        parent = stack[-1]
+        if (parent.tag, elem.tag) in records:
+            yield elem
+            elem.clear()
+            parent.remove(elem)
+        elif len(stack) == 1:
+            # A top-level section we have no use for once it is closed
+            parent.remove(elem)
+
+
+def _element_to_row(elem: ET.Element, fields: Dict[str, Tuple[str, Callable[[str], Any]]],
+                    defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the known children of a flat record element into a row."""
+    row = dict(defaults)
+    for child in elem:
+        spec = fields.get(child.tag)
+        if spec is not None and child.text:
+            column, convert = spec
+            row[column] = convert(child.text)
+    return row
+
+
+def player_to_row(player: ET.Element) -> Dict[str, Any]:
+    """
+    Convert a ``<player>`` element into a ``characters`` row in one pass over its children.
+
+    Every ``<multidkp_points>`` block is read into ``row['pools']``, one
+    ``character_points`` dictionary per pool. The character's own point
+    columns hold the first block, the default pool. The player's ``<items>``
+    and ``<adjustments>`` go to ``row['items']`` and ``row['adjustments']``.
+
+    Args:
+        player: A completed ``<player>`` element.
+
+    Returns:
+        Dictionary keyed by ``Character`` column names, plus the ``CHARACTER_CHILDREN`` lists.
+    """
+    row = dict(PLAYER_DEFAULTS)
+    row['pools'] = pools = []
+    row['items'] = items = []
+    row['adjustments'] = adjustments = []
+    for child in player:
+        if child.tag == 'points':
+            for block in child.iter('multidkp_points'):
+                points = {'pool_id': DEFAULT_POOL_ID, **{column: 0.0 for column in POINTS_FIELDS.values()}}
+                for field in block:
+                    column = POINTS_FIELDS.get(field.tag)
+                    if column is not None and field.text:
+                        points[column] = float(field.text)
+                    elif field.tag == 'multidkp_id' and field.text:
+                        points['pool_id'] = int(field.text)
+                pools.append(points)
+            if pools:
+                row.update((column, pools[0][column]) for column in POINTS_FIELDS.values())
+        elif child.tag == 'items':
+            for elem in child:
+                item = _element_to_row(elem, ITEM_FIELDS, ITEM_DEFAULTS)
+                item['name_lower'] = name_key(item['name'])
+                items.append(item)
+        elif child.tag == 'adjustments':
+            adjustments.extend(_element_to_row(elem, ADJUSTMENT_FIELDS, ADJUSTMENT_DEFAULTS) for elem in child)
+        else:
+            spec = PLAYER_FIELDS.get(child.tag)
+            if spec is not None and child.text:
+                column, convert = spec
+                row[column] = convert(child.text)
+    return row
+
+
+def pool_to_row(pool: ET.Element) -> Dict[str, Any]:
+    """Convert a ``<multidkp_pool>`` or ``<itempool>`` element into a ``dkp_pools``/``item_pools`` row."""
+    return {
+        'id': int(pool.findtext('id') or DEFAULT_POOL_ID),
+        'name': (pool.findtext('name') or 'Unknown').strip(),
+        'description': pool.findtext('desc'),
+    }
+
+
+def pool_events(pool: ET.Element) -> Iterator[Dict[str, Any]]:
+    """Yield a ``dkp_events`` row for every ``<event>`` of a ``<multidkp_pool>`` element."""
+    pool_id = int(pool.findtext('id') or DEFAULT_POOL_ID)
+    for event in pool.iterfind('events/event'):
+        yield {
+            'id': int(event.findtext('id') or 0),
+            'pool_id': pool_id,
+            'name': (event.findtext('name') or 'Unknown').strip(),
+            'value': float(event.findtext('value') or 0),
+        }
+
+
+def row_fingerprint(row: Dict[str, Any]) -> str:
+    """Return a stable content hash of a character row's feed fields and child rows."""
+    payload = '\x1f'.join([*(repr(row[column]) for column in FINGERPRINT_COLUMNS),
+                           *(repr(row.get(key)) for key in CHARACTER_CHILDREN)])
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
 
 class DataParser:
     """Handles parsing of XML data from EQDKP with focus on character relationships."""
-    
-    def __init__(self) -> None:
-        """Initialize the DataParser with a DatabaseManager instance."""
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        Initialize the DataParser with a DatabaseManager instance.
+
+        Args:
+            batch_size: Number of character rows written per bulk upsert batch.
+        """
         self.db_manager = DatabaseManager()
-    
-    def parse_character_data(self, xml_data: str) -> None:
+        self.batch_size = batch_size
+
+    def iter_players(self, source: XMLSource) -> Iterator[Dict[str, Any]]:
+        """
+        Stream character rows out of a points feed.
+
+        Args:
+            source: File path or binary stream containing the points XML.
+
+        Yields:
+            One ``characters`` row dictionary per ``<player>`` element.
+        """
+        for player in iter_elements(source, {('players', 'player')}):
+            yield player_to_row(player)
+
+    def parse_character_data(self, xml_data: str, incremental: bool = False) -> SyncResult:
         """Parse the XML data and save to the database."""
-        session = self.db_manager.get_session()
-        logger.info("Starting XML data parsing")
-        
-        try:    
-            root = ET.fromstring(xml_data)
-            logger.info("Successfully parsed XML string into ElementTree")
-
-            players_element = root.find('players')
-            if players_element is None:
-                logger.error("No players element found in XML data")
-                return
-            
-            for player in players_element.findall('player'):
-                player_name = player.findtext('name', 'Unknown')
-                logger.debug(f"Processing player: {player_name}")
-                
-                character_model = Character(
-                    id=int(player.findtext('id', 0)),
-                    name=player_name,
-                    class_id=int(player.findtext('class_id', 0)),
-                    class_name=player.findtext('class_name', 'Unknown'),
-                    active=bool(int(player.findtext('active', 0))),
-                    hidden=bool(int(player.findtext('hidden', 0))),
-                    main_id=int(player.findtext('main_id', 0)) if player.find('main_id') is not None else None,
-                    main_name=player.findtext('main_name', None),
-                    rank_id=None,
-                    rank_name=None,
-                    current=float(player.findtext('points/multidkp_points/points_current', 0)),
-                    current_with_twink=float(player.findtext('points/multidkp_points/points_current_with_twink', 0)),
-                    earned=float(player.findtext('points/multidkp_points/points_earned', 0)),
-                    earned_with_twink=float(player.findtext('points/multidkp_points/points_earned_with_twink', 0)),
-                    spent=float(player.findtext('points/multidkp_points/points_spent', 0)),
-                    spent_with_twink=float(player.findtext('points/multidkp_points/points_spent_with_twink', 0)),
-                    adjustment=float(player.findtext('points/multidkp_points/points_adjustment', 0)),
-                    adjustment_with_twink=float(player.findtext('points/multidkp_points/points_adjustment_with_twink', 0))
-                )
-                
-                session.merge(character_model)
-            
-            session.commit()
-            logger.info("XML parsing complete.")
-        
+        return self.parse_character_stream(io.BytesIO(xml_data.encode('utf-8')), incremental)
+
+    def parse_character_stream(self, source: XMLSource, incremental: bool = False) -> SyncResult:
+        """
+        Parse a points feed incrementally and save the characters to the database.
+
+        Every row is stored with a content fingerprint. In incremental mode the
+        ingest is skipped entirely when the feed's ``<info><timestamp>`` matches
+        the last sync, and otherwise only rows whose fingerprint changed are
+        written. In both modes players that disappeared from the feed are removed.
+        Points of every pool, items and adjustments are stored per character, and
+        the pool, event and item pool definitions replace the stored ones, all in
+        the same transaction as the characters. Every ingest that is not skipped
+        is recorded as a snapshot of how the points moved.
+
+        Args:
+            source: File path or binary stream containing the points XML.
+            incremental: Only write rows that changed since the last sync.
+
+        Returns:
+            Counts of inserted, updated, unchanged and removed rows.
+        """
+        logger.info(f"Starting streaming XML data parsing ({'incremental' if incremental else 'full'})")
+        result = SyncResult()
+        known = self.db_manager.get_fingerprints()
+        last_timestamp = self.db_manager.get_sync_value(FEED_TIMESTAMP_KEY) if incremental else None
+        seen: Set[int] = set()
+        pools: List[Dict[str, Any]] = []
+        events: Dict[int, Dict[str, Any]] = {}
+        itempools: List[Dict[str, Any]] = []
+
+        def changed_rows() -> Iterator[Dict[str, Any]]:
+            records = {('info', 'timestamp'), ('players', 'player'),
+                       ('multidkp_pools', 'multidkp_pool'), ('itempools', 'itempool')}
+            for elem in iter_elements(source, records):
+                if elem.tag == 'multidkp_pool':
+                    pools.append(pool_to_row(elem))
+                    events.update((event['id'], event) for event in pool_events(elem))
+                    continue
+                if elem.tag == 'itempool':
+                    itempools.append(pool_to_row(elem))
+                    continue
+                if elem.tag == 'timestamp':
+                    result.feed_timestamp = elem.text
+                    if last_timestamp is not None and elem.text == last_timestamp:
+                        result.skipped = True
+                        return
+                    continue
+
+                row = player_to_row(elem)
+                row['fingerprint'] = row_fingerprint(row)
+                seen.add(row['id'])
+                if row['id'] not in known:
+                    result.inserted += 1
+                elif incremental and known[row['id']] == row['fingerprint']:
+                    result.unchanged += 1
+                    continue
+                else:
+                    result.updated += 1
+                yield row
+
+        # Filled while the rows stream and written at the end of the same transaction
+        definitions = {DKPPool.__table__: pools, DKPEvent.__table__: events.values(), ItemPool.__table__: itempools}
+        try:
+            self.db_manager.bulk_upsert_characters(changed_rows(), self.batch_size, definitions)
         except Exception as e:
             logger.error(f"Critical error parsing XML data: {e}")
-            session.rollback()
             raise
-        
-        finally:
-            session.close()
-            logger.info("Database session closed")
-    
+
+        if result.skipped:
+            logger.info(f"XML parsing skipped: {result}")
+            return result
+
+        if not seen:
+            logger.error("No player elements found in XML data")
+            return result
+
+        departed = known.keys() - seen
+        if departed:
+            result.removed = self.db_manager.delete_characters(departed, self.batch_size)
+
+        self.db_manager.record_snapshot(result.feed_timestamp)
+        self.db_manager.set_sync_values({
+            FEED_TIMESTAMP_KEY: result.feed_timestamp,
+            SYNCED_AT_KEY: datetime.utcnow().isoformat(),
+        })
+        logger.info(f"XML parsing complete: {result}")
+        return result
+
+    def iter_ranks(self, source: XMLSource) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rank rows out of a character_ranks feed.
+
+        Args:
+            source: File path or binary stream containing the ranks XML.
+
+        Yields:
+            Dictionaries with ``id``, ``name``, ``rank_id`` and ``rank_name`` keys.
+        """
+        for character in iter_elements(source, {('characters', 'character')}):
+            yield {
+                'id': int(character.findtext('character_id') or 0),
+                'name': character.findtext('character_name') or 'Unknown',
+                'rank_id': int(character.findtext('rank_id') or 0),
+                'rank_name': character.findtext('rank_name') or 'Unknown',
+            }
+
     def parse_character_rank_data(self, xml_data: str) -> None:
         """
         Parse the XML data from the character_rank API call and update character ranks.
@@ -73,44 +383,29 @@ class DataParser:
         Args:
             xml_data (str): The XML data as a string.
         """
-        session = self.db_manager.get_session()
-        logger.info("Starting XML data parsing")
-        
-        try:
-            root = ET.fromstring(xml_data)
-            logger.info("Successfully parsed XML string into ElementTree")
-
-            # Navigate to the characters element
-            characters_element = root.find('characters')
-            if characters_element is None:
-                logger.error("No characters element found in XML data")
-                return
-
-            for character in characters_element:
-                character_name = character.findtext('character_name', 'Unknown')
-                character_id = int(character.findtext('character_id', 0))
-                rank_id = int(character.findtext('rank_id', 0))
-                rank_name = character.findtext('rank_name', 'Unknown')
-
-                # Retrieve the character from the database
-                character_data = session.query(Character).filter_by(id=character_id).first()
-                
-                if character_data is not None:
-                    logger.debug(f"Updating rank for character ID {character_id}")
-                    character_data.rank_id = rank_id
-                    character_data.rank_name = rank_name
-                else:
-                    logger.warning(f"Character {character_name} with ID {character_id} not found in the database")
+        self.apply_ranks(list(self.iter_ranks(io.BytesIO(xml_data.encode('utf-8')))))
+
+    def apply_ranks(self, rank_rows: List[Dict[str, Any]]) -> None:
+        """
+        Update character ranks from parsed rank rows in a single bulk statement.
 
-            session.commit()
-            logger.info("Character ranks updated successfully")
+        Args:
+            rank_rows: Rows produced by ``iter_ranks``.
+        """
+        if not rank_rows:
+            logger.error("No character elements found in rank XML data")
+            return
 
+        try:
+            missing = self.db_manager.bulk_update_ranks(rank_rows, self.batch_size)
         except Exception as e:
-            logger.error(f"Error parsing XML data: {e}")
+            logger.error(f"Error updating character ranks: {e}")
             logger.exception("Full traceback:")
-            session.rollback()
             raise  # Re-raise the exception after logging
 
-        finally:
-            session.close()
-            logger.info("Database session closed")
+        if missing:
+            sample = ', '.join(f"{row['name']} ({row['id']})" for row in missing[:10])
+            more = f" and {len(missing) - 10} more" if len(missing) > 10 else ""
+            logger.warning(f"{len(missing)} ranked characters not found in the database: {sample}{more}")
+
+        logger.info(f"Character ranks updated successfully ({len(rank_rows) - len(missing)} matched)")
@@ -1,45 +1,1007 @@
-from sqlalchemy import create_engine, desc
-from sqlalchemy.orm import sessionmaker
-from core.models import Base, Character
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from datetime import datetime
+from sqlalchemy import Column, Integer, MetaData, String, Table, and_, create_engine, delete, desc, event, exists, func, inspect, literal, or_, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, aliased, sessionmaker
+from core.models import (
+    Adjustment, AltGroup, Base, Character, CharacterPoints, DKPEvent, DKPPool, Item, ItemPool, Snapshot, SnapshotDelta,
+    SnapshotState, SyncState, name_key,
+)
+from core.name_index import NameIndex
+from core.read_model import (
+    LEADERBOARD_GROUPS, LEADERBOARD_METRICS, AltMember, CharacterCard, CharacterReadModel, Cursor,
+    LeaderboardFilter, LeaderboardPage, RosterCursor, RosterPage, leaderboard_key,
+)
+
+if TYPE_CHECKING:  # numpy is only imported once a pool is queried
+    from core.pools import PoolStandings
+
+DEFAULT_DB_URL = "sqlite:///eqdkp_data.db"
+
+# Rows written per executemany call during bulk ingest
+DEFAULT_BATCH_SIZE = 1000
+
+# sync_state key of the <info><timestamp> of the last ingested points feed
+FEED_TIMESTAMP_KEY = 'points_feed_timestamp'
+
+# Keys of a character row that hold its child rows (without character_id), replaced along with the character
+CHARACTER_CHILDREN: Dict[str, Table] = {
+    'pools': CharacterPoints.__table__,
+    'items': Item.__table__,
+    'adjustments': Adjustment.__table__,
+}
+
+# A character's own point columns whose movement every snapshot records
+SNAPSHOT_METRICS: Tuple[str, ...] = ('current', 'earned', 'spent', 'adjustment')
+
+# Feed definition tables, replaced wholesale by each full ingest
+DEFINITION_TABLES: Tuple[Table, ...] = (DKPPool.__table__, DKPEvent.__table__, ItemPool.__table__)
+
+# Per-connection staging table the rank feed is loaded into before the set-based update
+rank_staging = Table(
+    'rank_staging',
+    MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('name', String),
+    Column('rank_id', Integer),
+    Column('rank_name', String),
+    prefixes=['TEMPORARY'],
+)
+
+
+def batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Split an iterable of rows into lists of at most ``size`` rows."""
+    if size < 1:
+        raise ValueError("Batch size must be at least 1")
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def date_to_timestamp(text: str) -> int:
+    """
+    Convert a ``YYYY-MM-DD`` date (local midnight) or a unix time to a unix time.
+
+    Raises:
+        ValueError: If ``text`` is neither.
+    """
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        return int(datetime.strptime(text, '%Y-%m-%d').timestamp())
+    except ValueError:
+        raise ValueError(f"Invalid date '{text}'; expected YYYY-MM-DD") from None
+
+
+# Connection settings tuned for a read-heavy CLI with periodic bulk ingests
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MiB of memory-mapped I/O
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+
+@dataclass
+class _DatabaseState:
+    """Everything shared by the DatabaseManagers of one database."""
+
+    engine: Engine
+    Session: sessionmaker
+    read_model: Optional[CharacterReadModel] = None
+    read_model_stale: bool = True
+    name_index: Optional[NameIndex] = None
+    # Open hold_read_model blocks; while any is open readers keep the current model
+    holds: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+# Process-wide engine, session factory and read model per database URL
+_registry: Dict[str, _DatabaseState] = {}
+_registry_lock = threading.Lock()
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Apply ``SQLITE_PRAGMAS`` to every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+# Statements that fill a newly added column for rows that predate it
+BACKFILLS = {
+    ('characters', 'name_lower'): "UPDATE characters SET name_lower = lower(name)",
+    ('characters', 'is_main'): "UPDATE characters SET is_main = coalesce(main_id = id, 0)",
+    ('alt_groups', 'main_name_lower'): "UPDATE alt_groups SET main_name_lower = lower(coalesce(main_name, ''))",
+}
+
+
+def rebuild_alt_groups(connection, group_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Recompute the materialized ``alt_groups`` rows from ``characters``.
+
+    Runs as two set-based statements on the caller's transaction, so the groups
+    always match the characters written alongside them.
+
+    Args:
+        connection: Connection or session to execute on.
+        group_ids: Main ids of the groups to refresh; all groups if omitted.
+    """
+    group_id = func.coalesce(Character.main_id, Character.id)
+    grouped = select(
+        group_id.label('main_id'),
+        func.count().label('member_count'),
+        func.max(Character.main_name).label('main_name'),
+        *(func.max(Character.__table__.c[column]).label(column) for column in LEADERBOARD_METRICS.values()),
+        func.json_group_array(func.json_object(
+            'id', Character.id, 'name', Character.name,
+            'class_name', Character.class_name, 'rank_name', Character.rank_name,
+        )).label('members'),
+    ).group_by(group_id)
+
+    clear = delete(AltGroup)
+    if group_ids is not None:
+        group_ids = list(group_ids)
+        grouped = grouped.where(group_id.in_(group_ids))
+        clear = clear.where(AltGroup.main_id.in_(group_ids))
+    grouped = grouped.subquery()
+
+    main = Character.__table__.alias('main')
+    main_name = func.coalesce(main.c.name, grouped.c.main_name)
+    totals = [func.coalesce(main.c[column], grouped.c[column]) for column in LEADERBOARD_METRICS.values()]
+    connection.execute(clear)
+    connection.execute(AltGroup.__table__.insert().from_select(
+        ['main_id', 'main_name', 'main_name_lower', 'main_rank_name', 'member_count',
+         *LEADERBOARD_METRICS.values(), 'members'],
+        select(
+            grouped.c.main_id,
+            main_name,
+            func.lower(func.coalesce(main_name, '')),
+            main.c.rank_name,
+            grouped.c.member_count,
+            *totals,
+            grouped.c.members,
+        ).select_from(grouped.outerjoin(main, main.c.id == grouped.c.main_id)),
+    ))
+
+
+def _group_ids_of(session, condition) -> Set[int]:
+    """Return the alt group (``coalesce(main_id, id)``) of every character matching ``condition``."""
+    return set(session.scalars(select(func.coalesce(Character.main_id, Character.id)).where(condition)))
+
+
+def _refresh_alt_groups(session, group_ids: Set[int], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+    """Rebuild only the given alt groups, a batch of ids per statement."""
+    for batch in batched(sorted(group_ids), batch_size):
+        rebuild_alt_groups(session, batch)
+
+
+def _migrate(engine: Engine, created: Set[str] = frozenset()) -> None:
+    """
+    Bring an existing database file up to the current models.
+
+    ``create_all`` only creates missing tables, so columns and indexes added to
+    a model after the database was first created are added here. New columns
+    must be nullable; ``BACKFILLS`` populates them for existing rows.
+
+    Args:
+        engine: Engine of the database to migrate.
+        created: Tables ``create_all`` just added to the database.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(engine.dialect)
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    backfill = BACKFILLS.get((table.name, column.name))
+                    if backfill:
+                        connection.execute(text(backfill))
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+        # Databases created before alt groups were materialized
+        if connection.execute(select(AltGroup.main_id).limit(1)).first() is None:
+            rebuild_alt_groups(connection)
+
+        # Databases created before a child table existed: its rows only come from the feed,
+        # so drop the fingerprints and feed timestamp to have the next sync rewrite every row
+        if created & {table.name for table in CHARACTER_CHILDREN.values()}:
+            connection.execute(update(Character).values(fingerprint=None))
+            connection.execute(delete(SyncState).where(SyncState.key == FEED_TIMESTAMP_KEY))
+
+
+def _create_state(db_name: str) -> _DatabaseState:
+    engine = create_engine(db_name)
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _configure_sqlite_connection)
+    existing = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(engine)
+    # A brand new database has nothing to migrate
+    _migrate(engine, set(Base.metadata.tables) - existing if existing else set())
+    return _DatabaseState(engine, sessionmaker(bind=engine, expire_on_commit=False))
+
+
+def _get_state(db_name: str) -> _DatabaseState:
+    if db_name.endswith(':memory:') or db_name == 'sqlite://':
+        return _create_state(db_name)
+
+    with _registry_lock:
+        if db_name not in _registry:
+            _registry[db_name] = _create_state(db_name)
+        return _registry[db_name]
+
+
+def get_engine(db_name: str = DEFAULT_DB_URL) -> Tuple[Engine, sessionmaker]:
+    """
+    Return the shared engine and session factory for a database URL.
+
+    The engine is created, tuned and migrated once per process. In-memory SQLite
+    URLs are private to each caller, since every such engine is its own database.
+
+    Args:
+        db_name: SQLAlchemy database URL.
+
+    Returns:
+        Tuple of the engine and its session factory.
+    """
+    state = _get_state(db_name)
+    return state.engine, state.Session
+
 
 class DatabaseManager:
-    def __init__(self, db_name: str = "sqlite:///eqdkp_data.db"):
-        self.engine = create_engine(db_name)
-        Base.metadata.create_all(self.engine)
-        self.Session = sessionmaker(bind=self.engine)
+    def __init__(self, db_name: str = DEFAULT_DB_URL, use_read_model: bool = True):
+        """
+        Args:
+            db_name: SQLAlchemy database URL.
+            use_read_model: Serve name lookups, alt groups and top-N from the shared
+                in-memory read model instead of querying the database.
+        """
+        self._state = _get_state(db_name)
+        self.engine, self.Session = self._state.engine, self._state.Session
+        self.use_read_model = use_read_model
 
-    def get_session(self):
+    def get_session(self) -> Session:
         return self.Session() 
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session that commits on success, rolls back on error and is always closed."""
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @property
+    def read_model(self) -> CharacterReadModel:
+        """The current read model, rebuilt first if the characters table changed since it was built."""
+        state = self._state
+        model = state.read_model
+        if model is None or (state.read_model_stale and not state.holds):
+            model = self.refresh_read_model()
+        return model
+
+    @contextmanager
+    def hold_read_model(self) -> Iterator[None]:
+        """
+        Keep serving the current read model while a series of writes runs, then swap once.
+
+        Writes inside the block only mark the model stale, so readers on other
+        threads keep the previous snapshot instead of rebuilding it from a
+        half-applied refresh. When the last hold ends the model is rebuilt on
+        the calling thread and swapped in.
+        """
+        state = self._state
+        with state.lock:
+            state.holds += 1
+        try:
+            yield
+        finally:
+            with state.lock:
+                state.holds -= 1
+                released = state.holds == 0
+            if released and state.read_model is not None and state.read_model_stale:
+                self.refresh_read_model()
+
+    def refresh_read_model(self) -> CharacterReadModel:
+        """
+        Rebuild the read model from the database and swap it in.
+
+        Readers keep using the previous model until the new one is complete. The
+        name search index is patched with just the names that were added or removed.
+        """
+        state = self._state
+        with state.lock:
+            # Cleared before loading so a write that lands meanwhile marks it stale again
+            state.read_model_stale = False
+            with self.get_session() as session:
+                model = CharacterReadModel.load(session)
+
+            names = {record.name for record in model.by_id.values()}
+            if state.name_index is None:
+                state.name_index = NameIndex(names)
+            else:
+                previous = {record.name for record in state.read_model.by_id.values()} if state.read_model else set()
+                state.name_index.update(added=names - previous, removed=previous - names)
+            state.read_model = model
+        return model
+
+    def suggest_names(self, query: str, limit: int = 5) -> List[str]:
+        """
+        Return the best prefix and fuzzy matches for a name that was not found.
+
+        Args:
+            query: The name as typed.
+            limit: Maximum number of suggestions.
+        """
+        self.read_model  # make sure the index reflects the latest roster
+        return self._state.name_index.suggest(query, limit)
+
+    def complete_names(self, prefix: str, limit: int = 20) -> List[str]:
+        """Return names starting with ``prefix`` for type-ahead completion."""
+        self.read_model
+        return self._state.name_index.prefix(prefix, limit)
+
+    def _invalidate_read_model(self) -> None:
+        self._state.read_model_stale = True
+
+    def get_sync_value(self, key: str) -> Optional[str]:
+        """Return a stored sync bookkeeping value, or None if it was never set."""
+        with self.get_session() as session:
+            return session.execute(select(SyncState.value).where(SyncState.key == key)).scalar()
+
+    def set_sync_values(self, values: Dict[str, Optional[str]]) -> None:
+        """Store several sync bookkeeping values in one transaction."""
+        with self.session_scope() as session:
+            for key, value in values.items():
+                session.merge(SyncState(key=key, value=value))
+
+    def get_pools(self) -> List[DKPPool]:
+        """Return every DKP pool, ordered by id."""
+        with self.get_session() as session:
+            return list(session.scalars(select(DKPPool).order_by(DKPPool.id)))
+
+    def find_pool(self, selector: str) -> Optional[DKPPool]:
+        """
+        Look up a pool by id or by name, case insensitively.
+
+        Args:
+            selector: Pool id or name as typed by the user.
+        """
+        selector = selector.strip()
+        for pool in self.get_pools():
+            if str(pool.id) == selector or name_key(pool.name.strip()) == name_key(selector):
+                return pool
+        return None
+
+    def get_pool_standings(self, pool_id: int) -> 'PoolStandings':
+        """
+        Return the columnar standings of one pool.
+
+        With the read model enabled the arrays are loaded once per read model
+        snapshot and shared; otherwise they are loaded on every call.
+
+        Args:
+            pool_id: Id of the pool.
+        """
+        from core.pools import PoolStandings
+
+        if not self.use_read_model:
+            with self.get_session() as session:
+                return PoolStandings.load(session, pool_id)
+
+        def load() -> PoolStandings:
+            with self.get_session() as session:
+                return PoolStandings.load(session, pool_id)
+
+        return self.read_model.pool_standings(pool_id, load)
+
+    def get_purchases(self, character_name: str, include_alts: bool = True) -> List[Dict[str, Any]]:
+        """
+        Return the items bought by a character, newest first.
+
+        Args:
+            character_name: Name of the character, case insensitive.
+            include_alts: Include the items of every character in its alt group.
+
+        Returns:
+            Dictionaries with ``character``, ``item``, ``value``, ``itempool`` and ``timestamp`` keys.
+        """
+        with self.get_session() as session:
+            character = session.execute(
+                select(Character.id, func.coalesce(Character.main_id, Character.id))
+                .where(Character.name_lower == name_key(character_name))
+            ).first()
+            if character is None:
+                return []
+
+            buyer = (func.coalesce(Character.main_id, Character.id) == character[1]) if include_alts \
+                else (Character.id == character[0])
+            rows = session.execute(
+                select(Character.name.label('character'), Item.name.label('item'), Item.value,
+                       ItemPool.name.label('itempool'), Item.timestamp)
+                .join(Character, Character.id == Item.character_id)
+                .outerjoin(ItemPool, ItemPool.id == Item.itempool_id)
+                .where(buyer)
+                .order_by(Item.timestamp.desc(), Item.id.desc())
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+    def get_item_prices(self, item_name: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Return price statistics of every item whose name starts with ``item_name``.
+
+        Served from the index on ``items.name_lower`` as a range scan.
+
+        Args:
+            item_name: Item name or name prefix, case insensitive.
+            limit: Maximum number of distinct items.
+
+        Returns:
+            Dictionaries with ``item``, ``sold``, ``average``, ``minimum``, ``maximum``
+            and ``last_sold`` keys, exact matches first, then by name.
+        """
+        key = name_key(item_name.strip())
+        with self.get_session() as session:
+            rows = session.execute(
+                select(func.max(Item.name).label('item'), func.count().label('sold'),
+                       func.avg(Item.value).label('average'), func.min(Item.value).label('minimum'),
+                       func.max(Item.value).label('maximum'), func.max(Item.timestamp).label('last_sold'))
+                .where(Item.name_lower >= key, Item.name_lower < key + '\U0010ffff')
+                .group_by(Item.name_lower)
+                .order_by((Item.name_lower != key), Item.name_lower)
+                .limit(limit)
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+    def record_snapshot(self, feed_timestamp: Optional[int] = None) -> int:
+        """
+        Record how every character's points moved since the previous snapshot.
+
+        Set-based: ``characters`` is compared with ``snapshot_state`` (the points
+        as of the last snapshot), a delta row is written for every character that
+        differs, including departed characters as negative deltas, and the state
+        is advanced for those characters only. Anything that changed since the
+        last snapshot is attributed to this one, so a sync interrupted before
+        its snapshot is caught up by the next.
+
+        Args:
+            feed_timestamp: ``<info><timestamp>`` of the feed; defaults to now.
+                Recording the same timestamp again adds to that snapshot.
+
+        Returns:
+            Number of characters whose points changed.
+        """
+        feed_timestamp = int(feed_timestamp) if feed_timestamp else int(datetime.now().timestamp())
+        character, state, deltas = Character.__table__.c, SnapshotState.__table__.c, SnapshotDelta.__table__
+        with self.session_scope() as session:
+            snapshot = session.scalars(select(Snapshot).where(Snapshot.feed_timestamp == feed_timestamp)).first()
+            if snapshot is None:
+                snapshot = Snapshot(feed_timestamp=feed_timestamp, changed=0)
+                session.add(snapshot)
+                session.flush()
+
+            columns = ['snapshot_id', 'character_id', *SNAPSHOT_METRICS]
+            changed = select(
+                literal(snapshot.id), character.id,
+                *(character[metric] - func.coalesce(state[metric], 0.0) for metric in SNAPSHOT_METRICS),
+            ).select_from(Character.__table__.outerjoin(SnapshotState.__table__, state.character_id == character.id)) \
+                .where(or_(*(character[metric] != func.coalesce(state[metric], 0.0) for metric in SNAPSHOT_METRICS)))
+            departed = select(literal(snapshot.id), state.character_id, *(-state[metric] for metric in SNAPSHOT_METRICS)) \
+                .where(~exists().where(character.id == state.character_id),
+                       or_(*(state[metric] != 0 for metric in SNAPSHOT_METRICS)))
+
+            count = 0
+            for rows in (changed, departed):
+                stmt = sqlite_insert(deltas).from_select(columns, rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[deltas.c.character_id, deltas.c.snapshot_id],
+                    set_={metric: deltas.c[metric] + stmt.excluded[metric] for metric in SNAPSHOT_METRICS},
+                )
+                count += session.execute(stmt).rowcount
+
+            touched = select(deltas.c.character_id).where(deltas.c.snapshot_id == snapshot.id)
+            session.execute(delete(SnapshotState).where(SnapshotState.character_id.in_(touched)))
+            session.execute(SnapshotState.__table__.insert().from_select(
+                ['character_id', *SNAPSHOT_METRICS],
+                select(character.id, *(character[metric] for metric in SNAPSHOT_METRICS)).where(character.id.in_(touched)),
+            ))
+            snapshot.changed += count
+        return count
+
+    def get_trajectory(self, character_name: str, include_alts: bool = True) -> List[Dict[str, Any]]:
+        """
+        Return a character's points after every snapshot in which they changed.
+
+        Args:
+            character_name: Name of the character, case insensitive.
+            include_alts: Sum the points of the whole alt group, as the standings do.
+
+        Returns:
+            Dictionaries with ``feed_timestamp``, the running ``SNAPSHOT_METRICS``
+            totals and ``change`` (movement of current points), oldest first.
+        """
+        with self.get_session() as session:
+            character = session.execute(
+                select(Character.id, func.coalesce(Character.main_id, Character.id))
+                .where(Character.name_lower == name_key(character_name))
+            ).first()
+            if character is None:
+                return []
+
+            members = select(Character.id).where(
+                func.coalesce(Character.main_id, Character.id) == character[1] if include_alts
+                else Character.id == character[0])
+            per_snapshot = (
+                select(Snapshot.feed_timestamp,
+                       *(func.sum(SnapshotDelta.__table__.c[metric]).label(metric) for metric in SNAPSHOT_METRICS))
+                .join(Snapshot, Snapshot.id == SnapshotDelta.snapshot_id)
+                .where(SnapshotDelta.character_id.in_(members))
+                .group_by(Snapshot.id)
+                .subquery()
+            )
+            rows = session.execute(
+                select(per_snapshot.c.feed_timestamp,
+                       *(func.sum(per_snapshot.c[metric]).over(order_by=per_snapshot.c.feed_timestamp).label(metric)
+                         for metric in SNAPSHOT_METRICS),
+                       per_snapshot.c.current.label('change'))
+                .order_by(per_snapshot.c.feed_timestamp)
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+    def get_movers(self, metric: str = 'earned', start: Optional[int] = None, end: Optional[int] = None,
+                   count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the alt groups whose points moved the most between two feed timestamps.
+
+        Only the snapshots in the range are read, through the index on their
+        timestamp and the snapshot_id index of the deltas. Characters that have
+        since left the roster are not ranked.
+
+        Args:
+            metric: One of ``SNAPSHOT_METRICS``; ``earned`` finds the biggest gainers,
+                ``spent`` the biggest spenders.
+            start: Only snapshots after this unix time; None for no lower bound.
+            end: Only snapshots up to this unix time; None for no upper bound.
+            count: Number of groups.
+
+        Returns:
+            Dictionaries with ``main_id``, ``main_name`` and ``change``, largest change first.
+        """
+        if metric not in SNAPSHOT_METRICS:
+            raise ValueError(f"Unknown snapshot metric '{metric}'; expected one of {', '.join(SNAPSHOT_METRICS)}")
+
+        group_id = func.coalesce(Character.main_id, Character.id)
+        change = func.sum(SnapshotDelta.__table__.c[metric])
+        stmt = (
+            select(group_id.label('main_id'), func.max(AltGroup.main_name).label('main_name'), change.label('change'))
+            .select_from(Snapshot)
+            .join(SnapshotDelta, SnapshotDelta.snapshot_id == Snapshot.id)
+            .join(Character, Character.id == SnapshotDelta.character_id)
+            .outerjoin(AltGroup, AltGroup.main_id == group_id)
+            .group_by(group_id)
+            .having(change != 0)
+            .order_by(change.desc(), group_id)
+            .limit(count)
+        )
+        if start is not None:
+            stmt = stmt.where(Snapshot.feed_timestamp > start)
+        if end is not None:
+            stmt = stmt.where(Snapshot.feed_timestamp <= end)
+        with self.get_session() as session:
+            return [dict(row) for row in session.execute(stmt).mappings().all()]
+
+    def get_fingerprints(self) -> Dict[int, Optional[str]]:
+        """Return the stored content fingerprint of every character, keyed by id."""
+        with self.get_session() as session:
+            return dict(session.execute(select(Character.id, Character.fingerprint)).all())
+
+    def delete_characters(self, character_ids: Iterable[int], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Delete characters by id.
+
+        Args:
+            character_ids: Ids of the characters to delete.
+            batch_size: Number of ids per DELETE statement.
+
+        Returns:
+            Number of rows deleted.
+        """
+        count = 0
+        with self.session_scope() as session:
+            ids = iter(character_ids)
+            groups: Set[int] = set()
+            while batch := list(islice(ids, batch_size)):
+                groups |= _group_ids_of(session, Character.id.in_(batch))
+                for table in CHARACTER_CHILDREN.values():
+                    session.execute(delete(table).where(table.c.character_id.in_(batch)))
+                count += session.execute(delete(Character).where(Character.id.in_(batch))).rowcount
+            _refresh_alt_groups(session, groups, batch_size)
+        self._invalidate_read_model()
+        return count
     
+    def bulk_upsert_characters(self, rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE,
+                               definitions: Optional[Dict[Table, Iterable[Dict[str, Any]]]] = None) -> int:
+        """
+        Insert or update character rows in batches using SQLite's native upsert.
+
+        All batches are written in a single transaction. Existing rows keep any
+        column that is not present in the row dictionaries (e.g. rank data).
+        Rows that carry ``CHARACTER_CHILDREN`` keys (pool points, items,
+        adjustments) have those child rows replaced in the same transaction.
+
+        Args:
+            rows: Plain dictionaries keyed by ``Character`` column names, optionally
+                with child lists under ``CHARACTER_CHILDREN`` keys (rows without
+                ``character_id``). Every row must carry the same keys, including ``id``.
+            batch_size: Number of rows sent per executemany call.
+            definitions: Rows (any iterable) to replace the contents of ``DEFINITION_TABLES`` with,
+                written after ``rows`` is exhausted so a streaming producer can fill
+                them as it goes. Empty lists leave their table untouched.
+
+        Returns:
+            Number of rows written.
+        """
+        count = 0
+        with self.session_scope() as session:
+            groups: Set[int] = set()
+            for batch in batched(rows, batch_size):
+                # Groups the rows leave and join both need refreshing
+                ids = [row['id'] for row in batch]
+                children = {key: [dict(child, character_id=row['id']) for row in batch for child in row[key]]
+                            for key in CHARACTER_CHILDREN if key in batch[0]}
+                # The caller's rows are left untouched; the character columns go in as copies
+                params = [{key: value for key, value in row.items() if key not in CHARACTER_CHILDREN} for row in batch]
+                groups |= _group_ids_of(session, Character.id.in_(ids))
+                session.execute(self._character_upsert(params[0].keys()), params)
+                groups |= _group_ids_of(session, Character.id.in_(ids))
+                for key, child_rows in children.items():
+                    table = CHARACTER_CHILDREN[key]
+                    session.execute(delete(table).where(table.c.character_id.in_(ids)))
+                    for child_batch in batched(child_rows, batch_size):
+                        session.execute(table.insert(), child_batch)
+                count += len(batch)
+            _refresh_alt_groups(session, groups, batch_size)
+
+            for table, definition_rows in (definitions or {}).items():
+                definition_rows = list(definition_rows)
+                if definition_rows:
+                    session.execute(delete(table))
+                    session.execute(table.insert(), definition_rows)
+        self._invalidate_read_model()
+        return count
+
+    @staticmethod
+    def _character_upsert(columns: Iterable[str]):
+        """Build an INSERT .. ON CONFLICT(id) DO UPDATE statement for the given columns."""
+        stmt = sqlite_insert(Character)
+        updates = {column: stmt.excluded[column] for column in columns if column != 'id'}
+        if 'name' in updates:
+            # Filled in by the column default on the inserted row
+            updates['name_lower'] = stmt.excluded.name_lower
+        if 'main_id' in updates:
+            updates['is_main'] = stmt.excluded.is_main
+        updates['updated_at'] = stmt.excluded.updated_at
+        return stmt.on_conflict_do_update(index_elements=[Character.id], set_=updates)
+
+    def bulk_update_ranks(self, rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Apply a whole rank feed with one set-based UPDATE.
+
+        The rows are loaded into a temporary staging table and joined against
+        ``characters`` by id, so the cost is one bulk statement regardless of
+        roster size. Only characters whose rank actually changed are touched.
+
+        Args:
+            rows: Dictionaries with ``id``, ``name``, ``rank_id`` and ``rank_name`` keys.
+            batch_size: Number of rows sent per executemany call into the staging table.
+
+        Returns:
+            The staged rows whose id does not exist in ``characters``.
+        """
+        with self.session_scope() as session:
+            connection = session.connection()
+            rank_staging.create(connection, checkfirst=True)
+            session.execute(rank_staging.delete())
+            for batch in batched(rows, batch_size):
+                session.execute(rank_staging.insert().prefix_with('OR REPLACE'), batch)
+
+            staged = rank_staging.c
+            matching = staged.id == Character.id
+            rank_changed = exists().where(matching, or_(
+                staged.rank_id.is_distinct_from(Character.rank_id),
+                staged.rank_name.is_distinct_from(Character.rank_name),
+            ))
+            groups = _group_ids_of(session, rank_changed)
+            session.execute(
+                update(Character)
+                .where(rank_changed)
+                .values(
+                    rank_id=select(staged.rank_id).where(matching).scalar_subquery(),
+                    rank_name=select(staged.rank_name).where(matching).scalar_subquery(),
+                    updated_at=datetime.utcnow(),
+                )
+            )
+            _refresh_alt_groups(session, groups, batch_size)
+
+            missing = session.execute(
+                select(staged.id, staged.name, staged.rank_id, staged.rank_name)
+                .where(~exists().where(Character.id == staged.id))
+            ).mappings().all()
+
+            session.execute(rank_staging.delete())
+
+        self._invalidate_read_model()
+        return [dict(row) for row in missing]
+
     def get_character_by_name(self, character_name: str):
         """Get a character by its name. This is case insensitive."""
-        session = self.get_session()
-        return session.query(Character).filter(Character.name.ilike(character_name)).first()
+        if self.use_read_model:
+            return self.read_model.get(character_name)
+        with self.get_session() as session:
+            return session.query(Character).filter(Character.name_lower == name_key(character_name)).first()
     
     def update_character_rank(self, character_name: str, rank_id: int, rank_name: str):
-        session = self.get_session()
-        character = session.query(Character).filter(Character.name == character_name).first()
-        character.rank_id = rank_id
-        character.rank_name = rank_name
-        session.commit()
+        with self.session_scope() as session:
+            character = session.query(Character).filter(Character.name_lower == name_key(character_name)).first()
+            character.rank_id = rank_id
+            character.rank_name = rank_name
+            session.flush()
+            rebuild_alt_groups(session, [character.main_id if character.main_id is not None else character.id])
+        self._invalidate_read_model()
 
     def get_all_characters(self, character_name: str):
         # given a character name, lookup the main character and return all characters that are alts of that main character
-        session = self.get_session()
-        character = session.query(Character).filter(Character.name == character_name).first()
-        # return all characters that have the same main_id as the character
-        return session.query(Character).filter(Character.main_id == character.main_id).all()
+        if self.use_read_model:
+            return self.read_model.alt_group(character_name)
+        with self.get_session() as session:
+            character = session.query(Character).filter(Character.name_lower == name_key(character_name)).first()
+            if character is None:
+                return []
+            # return all characters that have the same main_id as the character
+            return session.query(Character).filter(Character.main_id == character.main_id).all()
     
+    def get_character_cards(self, character_names: Iterable[str]) -> Dict[str, CharacterCard]:
+        """
+        Get complete character cards (main, alts, ranks and points) for many names at once.
+
+        In the SQL path this is a single query joining the characters to their
+        materialized alt groups, however many names are asked for.
+
+        Args:
+            character_names: Names to look up, any case.
+
+        Returns:
+            Lowercased name -> card, for every name that exists.
+        """
+        keys = list(dict.fromkeys(name_key(name) for name in character_names))
+        if not keys:
+            return {}
+
+        if self.use_read_model:
+            model = self.read_model
+            cards = (model.card(key) for key in keys)
+            return {name_key(card.name): card for card in cards if card is not None}
+
+        query = (
+            select(Character.id, Character.name, Character.class_name, Character.rank_name,
+                   AltGroup.main_id, AltGroup.main_name, AltGroup.main_rank_name,
+                   *(getattr(AltGroup, column) for column in LEADERBOARD_METRICS.values()), AltGroup.members)
+            .join(AltGroup, AltGroup.main_id == func.coalesce(Character.main_id, Character.id))
+            .where(Character.name_lower.in_(keys))
+        )
+        cards = {}
+        with self.get_session() as session:
+            for row in session.execute(query).mappings():
+                card = self._card_from_row(row)
+                cards.setdefault(name_key(card.name), card)
+        return cards
+
+    @staticmethod
+    def _card_from_row(row) -> CharacterCard:
+        """Build a card from a row of character and alt group columns, ``members`` as stored JSON."""
+        members = sorted(json.loads(row['members']), key=lambda member: name_key(member['name']))
+        fields = {key: value for key, value in row.items() if key != 'members'}
+        return CharacterCard(**fields, members=tuple(AltMember(**member) for member in members))
+
+    def get_roster_page(self, page_size: int = 25, after: Optional[RosterCursor] = None,
+                        before: Optional[RosterCursor] = None) -> RosterPage:
+        """
+        Get one page of every main with its alts and group points, ordered by name.
+
+        Reads the materialized alt groups through the index on their lowercased
+        main name, seeking from a cursor like the leaderboard does, so every page
+        costs the same however deep into the roster it is.
+
+        Args:
+            page_size: Mains per page.
+            after: ``next_cursor`` of the previous page, or None for the first page.
+            before: ``previous_cursor`` of the following page, to page backwards.
+
+        Returns:
+            The page, with cursors to the pages on either side of it.
+        """
+        page_size = max(page_size, 1)
+        key = (AltGroup.main_name_lower, AltGroup.main_id)
+        main = Character.__table__.alias('main')
+        query = (
+            select(AltGroup.main_id.label('id'), func.coalesce(AltGroup.main_name, '').label('name'),
+                   func.coalesce(main.c.class_name, '').label('class_name'),
+                   AltGroup.main_rank_name.label('rank_name'),
+                   AltGroup.main_id, AltGroup.main_name, AltGroup.main_rank_name,
+                   *(getattr(AltGroup, column) for column in LEADERBOARD_METRICS.values()), AltGroup.members,
+                   AltGroup.main_name_lower)
+            .outerjoin(main, main.c.id == AltGroup.main_id)
+            .limit(page_size + 1)
+        )
+        if before is not None:
+            query = query.where(self._roster_before(before)).order_by(*(column.desc() for column in key))
+        else:
+            if after is not None:
+                query = query.where(self._roster_after(after))
+            query = query.order_by(*key)
+
+        with self.get_session() as session:
+            total = session.scalar(select(func.count()).select_from(AltGroup))
+            rows = session.execute(query).mappings().all()
+        if before is not None and len(rows) < page_size:
+            # Paging back from a page that did not start on a page boundary
+            return self.get_roster_page(page_size)
+        more = len(rows) > page_size
+        rows = rows[:page_size]
+        if before is not None:
+            rows.reverse()
+        if not rows:
+            return RosterPage([], total)
+
+        # One extra row tells whether the roster goes on in the direction read;
+        # the other direction goes on whenever a cursor was given
+        has_next = more if before is None else True
+        has_previous = more if before is not None else after is not None
+        cursors = [(row['main_name_lower'], row['main_id']) for row in (rows[0], rows[-1])]
+        entries = [self._card_from_row({k: v for k, v in row.items() if k != 'main_name_lower'}) for row in rows]
+        return RosterPage(entries, total,
+                          next_cursor=cursors[1] if has_next else None,
+                          previous_cursor=cursors[0] if has_previous else None)
+
+    def find_roster_cursor(self, character_name: str) -> Optional[RosterCursor]:
+        """
+        Return the cursor of a roster page starting with the alt group of ``character_name``.
+
+        Args:
+            character_name: Name of a main or alt, any case.
+
+        Returns:
+            The cursor to pass as ``after``, or None if there is no such character.
+        """
+        with self.get_session() as session:
+            group = session.execute(
+                select(AltGroup.main_name_lower, AltGroup.main_id)
+                .join(Character, AltGroup.main_id == func.coalesce(Character.main_id, Character.id))
+                .where(Character.name_lower == name_key(character_name))
+            ).first()
+        if group is None:
+            return None
+        # Main ids are integers, so nothing sorts between this and the group itself
+        return group.main_name_lower, group.main_id - 1
+
+    @staticmethod
+    def _roster_after(cursor: RosterCursor):
+        key, main_id = cursor
+        return or_(AltGroup.main_name_lower > key, and_(AltGroup.main_name_lower == key, AltGroup.main_id > main_id))
+
+    @staticmethod
+    def _roster_before(cursor: RosterCursor):
+        key, main_id = cursor
+        return or_(AltGroup.main_name_lower < key, and_(AltGroup.main_name_lower == key, AltGroup.main_id < main_id))
+
     def get_top_characters_by_points(self, count: int):
         """Get the top N characters by their current points."""
-        session = self.get_session()
-        
-        # return the top N characters by their current points
-        # should only return main characters
-        characters = session.query(Character).filter(Character.main_id == Character.id).order_by(desc(Character.current_with_twink)).limit(count).all()
+        if self.use_read_model:
+            return self.read_model.top(count)
+        return self.get_leaderboard('current', count).entries
+
+    def get_leaderboard(self, metric: str = 'current', count: int = 10,
+                        filters: Optional[LeaderboardFilter] = None,
+                        after: Optional[Cursor] = None) -> LeaderboardPage:
+        """
+        Get one page of main characters ranked by a points metric.
+
+        Args:
+            metric: One of ``current``, ``earned``, ``spent`` or ``adjustment``; totals include alts.
+            count: Page size.
+            filters: Restrict by active/hidden flags, class or rank.
+            after: ``next_cursor`` of the previous page, or None for the first page.
+
+        Returns:
+            The page and the cursor for the next one.
+        """
+        filters = filters or LeaderboardFilter()
+        if self.use_read_model:
+            return self.read_model.leaderboard(metric, count, filters, after)
+
+        column = self._metric_column(metric)
+        query = self._leaderboard_query(column, filters)
+        if after is not None:
+            value, key, character_id = after
+            query = query.where(or_(
+                column < -value,
+                and_(column == -value, or_(Character.name_lower > key,
+                                           and_(Character.name_lower == key, Character.id > character_id))),
+            ))
+        with self.get_session() as session:
+            entries = session.scalars(query.limit(count)).all()
+        next_cursor = leaderboard_key(entries[-1], metric) if entries and len(entries) == count else None
+        return LeaderboardPage(list(entries), next_cursor)
+
+    def get_leaderboard_groups(self, metric: str = 'current', group_by: str = 'class', count: int = 10,
+                               filters: Optional[LeaderboardFilter] = None) -> Dict[str, list]:
+        """
+        Get the top N main characters by a points metric within every class or rank.
+
+        Args:
+            metric: One of ``current``, ``earned``, ``spent`` or ``adjustment``.
+            group_by: ``class`` or ``rank``.
+            count: Entries per group.
+            filters: Restrict by active/hidden flags, class or rank.
+
+        Returns:
+            Group name -> ranked characters, ordered by group name.
+        """
+        filters = filters or LeaderboardFilter()
+        if self.use_read_model:
+            return self.read_model.leaderboard_groups(metric, group_by, count, filters)
+
+        column = self._metric_column(metric)
+        group_column = Character.__table__.c[LEADERBOARD_GROUPS[group_by]]
+        position = func.row_number().over(
+            partition_by=group_column, order_by=(desc(column), Character.name_lower, Character.id)
+        ).label('position')
+        ranked = self._leaderboard_query(column, filters).add_columns(position).subquery()
+        character = aliased(Character, ranked)
+        query = (select(character)
+                 .where(ranked.c.position <= count)
+                 .order_by(func.lower(func.coalesce(ranked.c[group_column.name], 'Unknown')), ranked.c.position))
 
-        return characters
-        
-      
+        groups: Dict[str, list] = {}
+        with self.get_session() as session:
+            for entry in session.scalars(query):
+                groups.setdefault(getattr(entry, group_column.name) or 'Unknown', []).append(entry)
+        return groups
 
+    @staticmethod
+    def _metric_column(metric: str):
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown leaderboard metric '{metric}'; expected one of {', '.join(LEADERBOARD_METRICS)}")
+        return Character.__table__.c[LEADERBOARD_METRICS[metric]]
 
+    @staticmethod
+    def _leaderboard_query(column, filters: LeaderboardFilter):
+        """SELECT of the mains matching ``filters`` in leaderboard order, served by the ix_characters_main_* indexes."""
+        query = select(Character).where(Character.is_main.is_(True))
+        if filters.active is not None:
+            query = query.where(Character.active.is_(filters.active))
+        if filters.hidden is not None:
+            query = query.where(Character.hidden.is_(filters.hidden))
+        if filters.class_name is not None:
+            query = query.where(func.lower(Character.class_name) == name_key(filters.class_name))
+        if filters.rank_name is not None:
+            query = query.where(func.lower(Character.rank_name) == name_key(filters.rank_name))
+        return query.order_by(desc(column), Character.name_lower, Character.id)
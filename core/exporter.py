@@ -0,0 +1,190 @@
+"""
+Streaming export of the standings to CSV, NDJSON or Parquet.
+"""
+import csv
+import json
+import os
+from typing import Iterable, List, Optional, Sequence
+from sqlalchemy import Boolean, DateTime, Float, Integer, func, select
+from core.database import DatabaseManager
+from core.models import Character, name_key
+from core.read_model import LeaderboardFilter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson", "parquet")
+
+# Written when no output file is given; other formats swap the extension
+DEFAULT_EXPORT_FILE = "processed_data.csv"
+
+# Rows fetched from the cursor and written per chunk
+DEFAULT_CHUNK_SIZE = 10000
+
+# Exported when no columns are requested
+DEFAULT_EXPORT_COLUMNS = (
+    "id", "name", "class_name", "rank_name", "active", "hidden", "current_with_twink", "earned_with_twink",
+    "spent_with_twink", "adjustment_with_twink", "alts",
+)
+
+# Computed columns on top of the ``characters`` columns
+EXTRA_COLUMNS = ("alts",)
+
+# Bookkeeping columns of ``characters`` that are not part of the standings
+INTERNAL_COLUMNS = frozenset({"name_lower", "is_main", "fingerprint"})
+
+
+def export_columns() -> List[str]:
+    """Names of every column that can be exported."""
+    return [column.name for column in Character.__table__.columns
+            if column.name not in INTERNAL_COLUMNS] + list(EXTRA_COLUMNS)
+
+
+def default_export_path(output_format: str, csv_path: str = DEFAULT_EXPORT_FILE) -> str:
+    """The CSV output file, with the extension of ``output_format`` for the other formats."""
+    return csv_path if output_format == "csv" else f"{os.path.splitext(csv_path)[0]}.{output_format}"
+
+
+def _export_query(columns: Sequence[str], filters: LeaderboardFilter, mains_only: bool):
+    """Core SELECT of the requested columns, highest current points first."""
+    # The names of each main's alts, alphabetical, from one grouped pass over the alts.
+    # group_concat joins in the order rows reach it, so they are fed from a subquery
+    # with a total order (name, then id for equal names).
+    ordered = (
+        select(Character.main_id, Character.name)
+        .where(Character.is_main.is_not(True), Character.main_id.is_not(None))
+        .order_by(Character.main_id, Character.name_lower, Character.id)
+        .subquery()
+    )
+    alts = (
+        select(ordered.c.main_id, func.group_concat(ordered.c.name, ", ").label("alts"))
+        .group_by(ordered.c.main_id)
+        .subquery()
+    )
+    available = {**Character.__table__.c, "alts": alts.c.alts}
+    query = select(*(available[name] for name in columns)).select_from(Character.__table__)
+    if "alts" in columns:
+        query = query.outerjoin(alts, alts.c.main_id == Character.id)
+    if mains_only:
+        query = query.where(Character.is_main.is_(True))
+    if filters.active is not None:
+        query = query.where(Character.active.is_(filters.active))
+    if filters.hidden is not None:
+        query = query.where(Character.hidden.is_(filters.hidden))
+    if filters.class_name is not None:
+        query = query.where(func.lower(Character.class_name) == name_key(filters.class_name))
+    if filters.rank_name is not None:
+        query = query.where(func.lower(Character.rank_name) == name_key(filters.rank_name))
+    return query.order_by(Character.current_with_twink.desc(), Character.name_lower, Character.id)
+
+
+class _CSVWriter:
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: Sequence[tuple]) -> None:
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _NDJSONWriter:
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        self._file = open(path, "w")
+        self._columns = columns
+
+    def write(self, rows: Sequence[tuple]) -> None:
+        self._file.write("".join(json.dumps(dict(zip(self._columns, row)), default=str) + "\n" for row in rows))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+
+        # Anything else (names, alts) is written as text
+        types = {Integer: pa.int64(), Float: pa.float64(), Boolean: pa.bool_(), DateTime: pa.timestamp("us")}
+        table = Character.__table__.c
+        self._pa = pa
+        self._schema = pa.schema([
+            (name, next((t for sql_type, t in types.items()
+                         if name in table and isinstance(table[name].type, sql_type)), pa.string()))
+            for name in columns
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: Sequence[tuple]) -> None:
+        arrays = [self._pa.array(values, type=field.type)
+                  for values, field in zip(zip(*rows), self._schema)]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS = {"csv": _CSVWriter, "ndjson": _NDJSONWriter, "parquet": _ParquetWriter}
+
+
+def export_standings(
+    path: str,
+    output_format: str = "csv",
+    columns: Optional[Iterable[str]] = None,
+    filters: LeaderboardFilter = LeaderboardFilter(),
+    mains_only: bool = True,
+    db_manager: Optional[DatabaseManager] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Stream the standings from the database cursor to a file.
+
+    Rows are read as plain tuples with a Core SELECT and written ``chunk_size``
+    at a time, so memory use does not grow with the roster.
+
+    Args:
+        path: Output file.
+        output_format: One of ``EXPORT_FORMATS``.
+        columns: Columns to export, from ``export_columns()``; defaults to
+            ``DEFAULT_EXPORT_COLUMNS``.
+        filters: Restrict by active/hidden flags, class or rank.
+        mains_only: One row per main with the points of its whole alt group;
+            False exports every character.
+        db_manager: Database to read from.
+        chunk_size: Rows per chunk.
+
+    Returns:
+        Number of rows written.
+
+    Raises:
+        ValueError: For an unknown format or column.
+        ImportError: For Parquet when pyarrow is not installed.
+    """
+    if output_format not in _WRITERS:
+        raise ValueError(f"Unknown export format '{output_format}'; expected one of {', '.join(EXPORT_FORMATS)}")
+    columns = list(columns or DEFAULT_EXPORT_COLUMNS)
+    unknown = [column for column in columns if column not in export_columns()]
+    if unknown:
+        raise ValueError(f"Unknown column(s) {', '.join(unknown)}; available: {', '.join(export_columns())}")
+
+    db_manager = db_manager or DatabaseManager(use_read_model=False)
+    query = _export_query(columns, filters, mains_only)
+    count = 0
+    writer = _WRITERS[output_format](path, columns)
+    try:
+        with db_manager.engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            for rows in result.partitions():
+                writer.write(rows)
+                count += len(rows)
+    finally:
+        writer.close()
+    logger.info(f"Exported {count} rows to {path}")
+    return count
@@ -0,0 +1,160 @@
+"""
+On-disk cache for EQDKP API responses.
+"""
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AtomicFile:
+    """A file written under a temporary name and moved into place only on commit."""
+
+    def __init__(self, path: str, opener: Callable[[str, str], IO[bytes]] = open) -> None:
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.file = opener(self.tmp_path, 'wb')
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def commit(self) -> None:
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body together with its validators."""
+
+    body: bytes
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class CacheStats:
+    """Running counters for cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    bytes_saved: int = 0
+
+    def __str__(self) -> str:
+        return (f"{self.hits} hits, {self.revalidated} revalidated, {self.misses} misses, "
+                f"{self.bytes_saved / 1024:.1f} KiB saved")
+
+
+class ResponseCache:
+    """
+    Stores response bodies gzip-compressed on disk, keyed by endpoint.
+
+    Each entry is a ``<key>.xml.gz`` body plus a ``<key>.json`` sidecar holding
+    the fetch time and the ETag/Last-Modified validators used for conditional
+    requests once the entry is older than the TTL.
+    """
+
+    def __init__(self, directory: str = ".cache", ttl: float = 300.0) -> None:
+        """
+        Initialize the response cache.
+
+        Args:
+            directory: Directory the cached bodies are written to.
+            ttl: Seconds a cached body is served without contacting the server.
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.stats = CacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str) -> tuple:
+        base = os.path.join(self.directory, key)
+        return f"{base}.xml.gz", f"{base}.json"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``key``, or None if there is no usable entry."""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+        return CacheEntry(
+            body=body,
+            fetched_at=meta.get('fetched_at', 0.0),
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether the entry is young enough to be used without revalidation."""
+        return time.time() - entry.fetched_at < self.ttl
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidating ``entry``."""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key: str, body: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Write a response body and its validators, replacing any previous entry."""
+        try:
+            pending = self.begin(key)
+            pending.write(body)
+            self.commit(key, pending, etag, last_modified)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+
+    def begin(self, key: str) -> AtomicFile:
+        """Start writing a new body for ``key``; it is only visible after ``commit``."""
+        body_path, _ = self._paths(key)
+        return AtomicFile(body_path, lambda path, mode: gzip.open(path, mode, compresslevel=6))
+
+    def commit(self, key: str, pending: AtomicFile, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Move a body started with ``begin`` into place and record its validators."""
+        _, meta_path = self._paths(key)
+        pending.commit()
+        meta = {'fetched_at': time.time(), 'etag': etag, 'last_modified': last_modified, 'size': pending.size}
+        self._write_meta(meta_path, meta)
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """Mark an entry as freshly validated after a 304 Not Modified response."""
+        _, meta_path = self._paths(key)
+        entry.fetched_at = time.time()
+        meta = {'fetched_at': entry.fetched_at, 'etag': entry.etag,
+                'last_modified': entry.last_modified, 'size': len(entry.body)}
+        try:
+            self._write_meta(meta_path, meta)
+        except OSError as e:
+            logger.warning(f"Could not update cache entry {key}: {e}")
+
+    @staticmethod
+    def _write_meta(meta_path: str, meta: dict) -> None:
+        with open(f"{meta_path}.tmp", 'w') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
@@ -0,0 +1,208 @@
+"""
+Shared HTTP client for all EQDKP API calls.
+"""
+import random
+import re
+import threading
+import time
+from typing import Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Methods that may be repeated without repeating a side effect, so they are retried by default
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised when the circuit breaker is open and requests are refused without trying."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing server for a while after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and every
+    call fails immediately. Once ``reset_timeout`` seconds have passed it goes
+    half-open: a single trial call is let through while all others keep failing
+    fast. A success of the trial closes the circuit, a failure re-opens it for
+    another ``reset_timeout``.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently refused (open, or half-open with the trial call in flight)."""
+        with self._lock:
+            return self.state != self.CLOSED and not self._timed_out()
+
+    def _timed_out(self) -> bool:
+        # A trial call that never reported back releases its slot after another timeout
+        return self.state != self.CLOSED and time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted right now; claims the trial call when half-opening."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self._timed_out():
+                self.state = self.HALF_OPEN
+                self.opened_at = time.monotonic()
+                logger.info("Circuit half-open; letting one trial call through")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("Circuit closed after a successful call")
+            self.failures = 0
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+            if self.state == self.OPEN:
+                self.opened_at = time.monotonic()
+
+
+class HTTPClient:
+    """
+    Thin wrapper around a pooled ``requests.Session``.
+
+    Adds keep-alive connection pooling, a default per-request timeout, bounded
+    retries with exponential backoff and full jitter for idempotent methods,
+    and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout = (5.0, 30.0),
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        pool_size: int = 10,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Initialize the HTTP client.
+
+        Args:
+            timeout: Default (connect, read) timeout in seconds for every request.
+            retries: Retries after the first attempt for connection errors,
+                timeouts and retryable status codes of idempotent requests.
+            backoff: Base delay in seconds; attempt ``n`` waits up to ``backoff * 2**n``.
+            max_backoff: Upper bound for a single delay.
+            pool_size: Connections kept alive per host.
+            breaker: Circuit breaker to use; a default one is created if omitted.
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request. See ``request``."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request. See ``request``."""
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, retry: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying transient failures of idempotent methods.
+
+        Args:
+            method: HTTP method.
+            url: Full URL to call.
+            retry: Retry transient failures. Defaults to True only for
+                ``IDEMPOTENT_METHODS``; pass True to retry e.g. a POST that is
+                known to be safe to repeat.
+            **kwargs: Passed to ``requests.Session.request``; ``timeout`` defaults
+                to the client timeout.
+
+        Returns:
+            The final response. A retryable status is returned as-is once retries
+            are exhausted.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            requests.exceptions.RequestException: If the last attempt failed.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        retries = self.retries if retry else 0
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open; not calling {method} {self._redact(url)}")
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self.breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                logger.warning(f"{method} {self._redact(url)} failed ({e}); retrying")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if attempt >= retries:
+                    return response
+                logger.warning(f"{method} {self._redact(url)} returned {response.status_code}; retrying")
+                response.close()
+
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def _delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for the given retry attempt."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def _redact(url: str) -> str:
+        """Mask the API token before a URL is logged."""
+        return re.sub(r"atoken=[^&]*", "atoken=***", url)
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
@@ -0,0 +1,150 @@
+"""
+Incremental tailing of EverQuest client chat logs.
+"""
+import os
+import re
+import threading
+from typing import Callable, List, Optional, Pattern, Union
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# A tell, raid/guild message or chat channel message whose text contains the word "bid":
+# [Mon Oct 16 20:01:02 2026] Dainae tells the raid,  'bid'
+DEFAULT_BID_PATTERN = (
+    r"^\[[^\]]*\] (?P<name>[A-Za-z]+) tells (?:you|the raid|the guild|\w+:\d+),\s+'[^'\n]*\b(?i:bid)\b"
+)
+
+# Bytes read per chunk while catching up with a log
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def checkpoint_key(path: str) -> str:
+    """sync_state key under which the read position of a log file is kept."""
+    return f"log_checkpoint:{os.path.abspath(path)}"
+
+
+class LogTailer:
+    """
+    Follows a growing log file from a byte offset and extracts names matching a pattern.
+
+    Only complete lines are matched; a trailing partial line is kept until the
+    rest of it is written. Rotation (the path now points at a different file)
+    and truncation restart reading from the beginning of the new file. Each
+    poll costs one ``stat`` when nothing was written, and catching up reads in
+    large chunks with one regex scan per chunk, so multi-GB logs are fine.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pattern: Union[str, Pattern[str]] = DEFAULT_BID_PATTERN,
+        offset: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        inode: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the tailer.
+
+        Args:
+            path: Log file to follow.
+            pattern: Regex with a ``name`` group, matched per line (``re.MULTILINE``).
+            offset: Byte offset to resume from; defaults to the current end of the
+                file so only new lines are read.
+            chunk_size: Bytes read per chunk.
+            inode: Inode the offset belongs to; if the path now points at another
+                file the new one is read from the start.
+
+        Raises:
+            ValueError: If the pattern has no ``name`` group.
+        """
+        self.path = path
+        self.pattern = re.compile(pattern, re.MULTILINE) if isinstance(pattern, str) else pattern
+        if 'name' not in self.pattern.groupindex:
+            raise ValueError("Bid pattern must define a 'name' group")
+        self.chunk_size = chunk_size
+        self.offset = offset
+        self._inode = inode
+        self._partial = b""
+
+    @property
+    def checkpoint(self) -> Optional[str]:
+        """Read position as ``"<offset>:<inode>"``, to resume with ``from_checkpoint``."""
+        if self.offset is None:
+            return None
+        # A trailing partial line has not been matched yet, so resume from its start
+        return f"{self.offset - len(self._partial)}:{self._inode or 0}"
+
+    @classmethod
+    def from_checkpoint(cls, path: str, checkpoint: Optional[str], **kwargs) -> 'LogTailer':
+        """
+        Create a tailer that resumes where a previous one stopped.
+
+        Args:
+            path: Log file to follow.
+            checkpoint: Value of ``checkpoint`` saved earlier; None starts at the end of the file.
+            **kwargs: Passed to ``LogTailer``.
+        """
+        if checkpoint:
+            try:
+                offset, inode = (int(part) for part in checkpoint.split(':'))
+                return cls(path, offset=offset, inode=inode or None, **kwargs)
+            except ValueError:
+                logger.warning(f"Ignoring invalid log checkpoint '{checkpoint}' for {path}")
+        return cls(path, **kwargs)
+
+    def poll(self) -> List[str]:
+        """
+        Read everything written since the last poll.
+
+        Returns:
+            Names from the matching lines, in log order (may contain repeats).
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+
+        if self.offset is None:
+            self.offset = stat.st_size
+        elif self._inode is not None and stat.st_ino != self._inode:
+            logger.info(f"{self.path} was rotated; reading the new file from the start")
+            self.offset, self._partial = 0, b""
+        elif stat.st_size < self.offset:
+            logger.info(f"{self.path} was truncated; reading from the start")
+            self.offset, self._partial = 0, b""
+        self._inode = stat.st_ino
+
+        if stat.st_size == self.offset:
+            return []
+
+        names = []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while chunk := f.read(self.chunk_size):
+                self.offset += len(chunk)
+                data = self._partial + chunk
+                end = data.rfind(b"\n") + 1
+                self._partial = data[end:]
+                # latin-1 maps every byte to one character, so decoding never fails
+                text = data[:end].decode('latin-1')
+                names.extend(match.group('name') for match in self.pattern.finditer(text))
+        return names
+
+    def follow(self, on_names: Callable[[List[str]], None], stop: threading.Event, interval: float = 0.25) -> None:
+        """
+        Poll until ``stop`` is set, passing each non-empty batch of names to ``on_names``.
+
+        Sleeps on ``stop`` between polls, so an idle log costs one ``stat`` per interval.
+
+        Args:
+            on_names: Called with the names found by one poll.
+            stop: Event that ends the loop.
+            interval: Seconds to wait when nothing new was written.
+        """
+        while not stop.is_set():
+            names = self.poll()
+            if names:
+                on_names(names)
+            else:
+                stop.wait(interval)
@@ -1,10 +1,25 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy.orm import relationship, backref, validates
 from datetime import datetime
 
 Base = declarative_base()
 
+
+def name_key(name: str) -> str:
+    """Normalized form of a character name used for case-insensitive lookups."""
+    return name.lower()
+
+
+def _default_name_key(context) -> str:
+    return name_key(context.get_current_parameters()['name'])
+
+
+def _default_is_main(context) -> bool:
+    params = context.get_current_parameters()
+    return params.get('main_id') is not None and params.get('main_id') == params.get('id')
+
+
 class Character(Base):
     """Model for character information including DKP points."""
     
@@ -13,6 +28,8 @@ class Character(Base):
     # Basic Information
     id = Column(Integer, primary_key=True)
     name = Column(String, nullable=False, index=True)
+    # Lowercased name, kept in sync on insert and ORM assignment, for indexed lookups
+    name_lower = Column(String, nullable=True, index=True, default=_default_name_key)
     class_id = Column(Integer, nullable=False)
     class_name = Column(String, nullable=False)
 
@@ -27,6 +44,8 @@ class Character(Base):
     # Main/Alt Relationship
     main_id = Column(Integer, ForeignKey('characters.id'), nullable=True)
     main_name = Column(String, nullable=True)
+    # main_id == id, stored so leaderboard queries can find mains through an index
+    is_main = Column(Boolean, nullable=True, default=_default_is_main)
     
     # DKP Points
     current = Column(Float, nullable=False, default=0.0)
@@ -37,6 +56,9 @@ class Character(Base):
     spent_with_twink = Column(Float, nullable=False, default=0.0)
     adjustment = Column(Float, nullable=False, default=0.0)
     adjustment_with_twink = Column(Float, nullable=False, default=0.0)
+
+    # Content hash of the feed fields, used to skip unchanged rows on incremental sync
+    fingerprint = Column(String, nullable=True)
     
     # Relationships
     alts = relationship("Character", 
@@ -47,5 +69,220 @@ class Character(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    @validates('name')
+    def _sync_name_lower(self, key: str, name: str) -> str:
+        self.name_lower = name_key(name)
+        return name
+
+    @validates('id', 'main_id')
+    def _sync_is_main(self, key: str, value):
+        other = self.main_id if key == 'id' else self.id
+        self.is_main = value is not None and value == other
+        return value
+
+    def __repr__(self) -> str:
+        return f"<Character(name='{self.name}', class_name='{self.class_name}', active={self.active})>"
+
+
+# One index per leaderboard metric, matching its ORDER BY so the top N is read straight off the index
+for _column in (Character.current_with_twink, Character.earned_with_twink,
+                Character.spent_with_twink, Character.adjustment_with_twink):
+    Index(f'ix_characters_main_{_column.name}', Character.is_main, _column.desc(), Character.name_lower)
+
+
+class AltGroup(Base):
+    """
+    A main and all of its alts, denormalized whenever characters are written.
+
+    Lets a complete character card (main, alts, ranks and points) be read with
+    one primary key lookup instead of re-querying the group per character.
+    """
+
+    __tablename__ = 'alt_groups'
+
+    main_id = Column(Integer, primary_key=True)
+    main_name = Column(String, nullable=True)
+    # Lowercased main name ('' for a group without one), the indexed sort key of the roster
+    main_name_lower = Column(String, nullable=True, index=True)
+    main_rank_name = Column(String, nullable=True)
+    member_count = Column(Integer, nullable=False, default=0)
+
+    # Group totals, taken from the main
+    current_with_twink = Column(Float, nullable=False, default=0.0)
+    earned_with_twink = Column(Float, nullable=False, default=0.0)
+    spent_with_twink = Column(Float, nullable=False, default=0.0)
+    adjustment_with_twink = Column(Float, nullable=False, default=0.0)
+
+    # JSON array of {id, name, class_name, rank_name}, one object per member
+    members = Column(Text, nullable=False, default='[]')
+
+    def __repr__(self) -> str:
+        return f"<AltGroup(main_name='{self.main_name}', member_count={self.member_count})>"
+
+
+class DKPPool(Base):
+    """A multi-DKP pool from the feed's ``<multidkp_pools>``."""
+
+    __tablename__ = 'dkp_pools'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<DKPPool(id={self.id}, name='{self.name}')>"
+
+
+class CharacterPoints(Base):
+    """
+    A character's points in one pool.
+
+    Clustered on (pool_id, character_id) without a rowid, so a pool's points are
+    one contiguous range of the table and each row stores nothing but the key
+    and the eight point columns.
+    """
+
+    __tablename__ = 'character_points'
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    pool_id = Column(Integer, primary_key=True)
+    character_id = Column(Integer, primary_key=True, index=True)
+
+    current = Column(Float, nullable=False, default=0.0)
+    earned = Column(Float, nullable=False, default=0.0)
+    spent = Column(Float, nullable=False, default=0.0)
+    current_with_twink = Column(Float, nullable=False, default=0.0)
+    earned_with_twink = Column(Float, nullable=False, default=0.0)
+    spent_with_twink = Column(Float, nullable=False, default=0.0)
+    adjustment = Column(Float, nullable=False, default=0.0)
+    adjustment_with_twink = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<CharacterPoints(pool_id={self.pool_id}, character_id={self.character_id})>"
+
+
+class DKPEvent(Base):
+    """An event points are awarded for, from a pool's ``<events>``."""
+
+    __tablename__ = 'dkp_events'
+
+    id = Column(Integer, primary_key=True)
+    pool_id = Column(Integer, nullable=True, index=True)
+    name = Column(String, nullable=False)
+    value = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<DKPEvent(id={self.id}, name='{self.name}')>"
+
+
+class ItemPool(Base):
+    """An item pool from the feed's ``<itempools>``."""
+
+    __tablename__ = 'item_pools'
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    description = Column(String, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ItemPool(id={self.id}, name='{self.name}')>"
+
+
+class Item(Base):
+    """An item a character bought, from the player's ``<items>``."""
+
+    __tablename__ = 'items'
+
+    id = Column(Integer, primary_key=True)
+    character_id = Column(Integer, nullable=False, index=True)
+    name = Column(String, nullable=False)
+    # Lowercased name, for indexed price lookups
+    name_lower = Column(String, nullable=False, index=True)
+    game_id = Column(String, nullable=True)
+    value = Column(Float, nullable=False, default=0.0)
+    itempool_id = Column(Integer, nullable=True)
+    event_id = Column(Integer, nullable=True)
+    # Unix time of the purchase as given by the feed
+    timestamp = Column(Integer, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Item(name='{self.name}', character_id={self.character_id}, value={self.value})>"
+
+
+class Adjustment(Base):
+    """A points adjustment of a character, from the player's ``<adjustments>``."""
+
+    __tablename__ = 'adjustments'
+
+    id = Column(Integer, primary_key=True)
+    character_id = Column(Integer, nullable=False, index=True)
+    reason = Column(String, nullable=True)
+    value = Column(Float, nullable=False, default=0.0)
+    event_id = Column(Integer, nullable=True)
+    timestamp = Column(Integer, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Adjustment(character_id={self.character_id}, value={self.value}, reason='{self.reason}')>"
+
+
+class Snapshot(Base):
+    """One ingested points feed, identified by its ``<info><timestamp>``."""
+
+    __tablename__ = 'snapshots'
+
+    id = Column(Integer, primary_key=True)
+    feed_timestamp = Column(Integer, nullable=False, unique=True)
+    taken_at = Column(DateTime, default=datetime.utcnow)
+    # Characters whose points changed since the previous snapshot
+    changed = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<Snapshot(feed_timestamp={self.feed_timestamp}, changed={self.changed})>"
+
+
+class SnapshotDelta(Base):
+    """
+    How much a character's own points moved in one snapshot.
+
+    Only characters whose points changed get a row. Clustered on
+    (character_id, snapshot_id) without a rowid, so a character's history is
+    one contiguous range; the snapshot_id index serves date range queries.
+    """
+
+    __tablename__ = 'snapshot_deltas'
+    __table_args__ = {'sqlite_with_rowid': False}
+
+    character_id = Column(Integer, primary_key=True)
+    snapshot_id = Column(Integer, primary_key=True, index=True)
+    current = Column(Float, nullable=False, default=0.0)
+    earned = Column(Float, nullable=False, default=0.0)
+    spent = Column(Float, nullable=False, default=0.0)
+    adjustment = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<SnapshotDelta(character_id={self.character_id}, snapshot_id={self.snapshot_id})>"
+
+
+class SnapshotState(Base):
+    """A character's own points as of the latest snapshot; the base the next deltas are taken against."""
+
+    __tablename__ = 'snapshot_state'
+
+    character_id = Column(Integer, primary_key=True)
+    current = Column(Float, nullable=False, default=0.0)
+    earned = Column(Float, nullable=False, default=0.0)
+    spent = Column(Float, nullable=False, default=0.0)
+    adjustment = Column(Float, nullable=False, default=0.0)
+
+
+class SyncState(Base):
+    """Key/value bookkeeping about previous feed syncs (e.g. the last feed timestamp)."""
+
+    __tablename__ = 'sync_state'
+
+    key = Column(String, primary_key=True)
+    value = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
     def __repr__(self) -> str:
-        return f"<Character(name='{self.name}', class_name='{self.class_name}', active={self.active})>" 
\ No newline at end of file
+        return f"<SyncState(key='{self.key}', value='{self.value}')>"
@@ -0,0 +1,154 @@
+"""
+Prefix and fuzzy search over character names.
+"""
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+from core.models import name_key
+
+# Posting entries counted per fuzzy query; the rarest trigrams are counted first
+CANDIDATE_BUDGET = 4000
+
+# Minimum Dice similarity for a fuzzy match to be offered
+MIN_SIMILARITY = 0.3
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Return the padded trigrams of a normalized name."""
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class NameIndex:
+    """
+    Sorted-key prefix index plus trigram index over character names.
+
+    Prefix matches are a binary search over the sorted keys. Fuzzy matches count
+    shared trigrams through the posting lists of the query's trigrams and rank
+    candidates by Dice similarity. Names can be added and removed one at a time,
+    so a roster refresh only touches the names that changed.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._keys: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+        for name in names:
+            self._insert(name)
+        self._keys = sorted(self._names)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name_key(name) in self._names
+
+    def update(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        """
+        Apply a roster change incrementally.
+
+        Args:
+            added: Names that are new to the roster.
+            removed: Names that left the roster.
+        """
+        with self._lock:
+            for name in removed:
+                self._delete(name)
+            for name in added:
+                if self._insert(name):
+                    insort(self._keys, name_key(name))
+
+    def prefix(self, query: str, limit: int = 10) -> List[str]:
+        """
+        Return names starting with ``query``, alphabetically.
+
+        Args:
+            query: Name prefix, any case.
+            limit: Maximum number of names returned.
+        """
+        key = name_key(query)
+        with self._lock:
+            start = bisect_left(self._keys, key)
+            matches = []
+            for candidate in self._keys[start:start + limit]:
+                if not candidate.startswith(key):
+                    break
+                matches.append(self._names[candidate])
+            return matches
+
+    def fuzzy(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Return the names most similar to ``query`` with their similarity, best first.
+
+        Args:
+            query: Possibly misspelled name.
+            limit: Maximum number of names returned.
+        """
+        query_grams = trigrams(name_key(query))
+        with self._lock:
+            postings = sorted(
+                (self._postings[gram] for gram in query_grams if gram in self._postings), key=len
+            )
+
+            # Count candidates through the most selective trigrams; common ones
+            # (e.g. a leading letter) add cost without narrowing anything down.
+            shared: Counter = Counter()
+            counted = 0
+            for posting in postings:
+                if counted and counted + len(posting) > CANDIDATE_BUDGET:
+                    break
+                shared.update(posting)
+                counted += len(posting)
+
+            scored = []
+            for key, _ in shared.most_common(limit * 20):
+                overlap = len(query_grams & self._grams[key])
+                score = 2 * overlap / (len(query_grams) + len(self._grams[key]))
+                if score >= MIN_SIMILARITY:
+                    scored.append((score, key))
+
+            best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -len(item[1])))
+            return [(self._names[key], round(score, 3)) for score, key in best]
+
+    def suggest(self, query: str, limit: int = 5) -> List[str]:
+        """
+        Return ranked candidates for a name that had no exact match.
+
+        Prefix matches come first, followed by the closest fuzzy matches.
+        """
+        suggestions = self.prefix(query, limit)
+        if len(suggestions) < limit:
+            for name, _ in self.fuzzy(query, limit):
+                if name not in suggestions:
+                    suggestions.append(name)
+        return suggestions[:limit]
+
+    def _insert(self, name: str) -> bool:
+        """Index a name's trigrams; the caller keeps ``_keys`` sorted. Returns False if already present."""
+        key = name_key(name)
+        if key in self._names:
+            return False
+        self._names[key] = name
+        grams = trigrams(key)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+        return True
+
+    def _delete(self, name: str) -> None:
+        key = name_key(name)
+        if self._names.pop(key, None) is None:
+            return
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+        for gram in self._grams.pop(key):
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
@@ -0,0 +1,132 @@
+"""
+Columnar per-pool standings, ranked with vectorized NumPy operations.
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.models import Character, CharacterPoints, name_key
+from core.read_model import LEADERBOARD_METRICS, LeaderboardFilter
+
+
+@dataclass(frozen=True)
+class PoolEntry:
+    """A main's points in one pool, with the fields the leaderboard tables show."""
+
+    id: int
+    name: str
+    class_name: str
+    rank_name: Optional[str]
+    current_with_twink: float
+    earned_with_twink: float
+    spent_with_twink: float
+    adjustment_with_twink: float
+
+
+class PoolStandings:
+    """
+    One pool's points as parallel arrays with one element per main.
+
+    Built from a single query without ORM objects. A leaderboard is a boolean
+    mask for the filters plus one ``lexsort`` on (-points, name, id), and only
+    the rows of the requested page are turned into ``PoolEntry`` objects, so
+    each pool costs the same regardless of how many pools are queried.
+    """
+
+    def __init__(self, pool_id: int, rows: Iterable[tuple]) -> None:
+        """
+        Build the arrays.
+
+        Args:
+            pool_id: Id of the pool.
+            rows: ``(id, name, class_name, rank_name, active, hidden, *metric columns)``
+                per main, metric columns in ``LEADERBOARD_METRICS`` order.
+        """
+        self.pool_id = pool_id
+        columns = list(zip(*rows)) or [()] * (6 + len(LEADERBOARD_METRICS))
+        self.ids = np.array(columns[0], dtype=np.int64)
+        self.names = np.array(columns[1], dtype=object)
+        self.class_names = np.array(columns[2], dtype=object)
+        self.rank_names = np.array(columns[3], dtype=object)
+        # Normalized class and rank names, so filters compare whole arrays at once
+        self._class_keys = np.array([name_key(value or '') for value in self.class_names], dtype=str)
+        self._rank_keys = np.array([name_key(value or '') for value in self.rank_names], dtype=str)
+        self.active = np.array(columns[4], dtype=bool)
+        self.hidden = np.array(columns[5], dtype=bool)
+        self.metrics: Dict[str, np.ndarray] = {
+            column: np.array(values, dtype=np.float64)
+            for column, values in zip(LEADERBOARD_METRICS.values(), columns[6:])
+        }
+
+        # Alphabetical position of each name, so ties sort like the other leaderboards
+        name_keys = np.array([name_key(name) for name in self.names], dtype=str)
+        self._name_order = np.empty(len(self.ids), dtype=np.int64)
+        self._name_order[np.argsort(name_keys, kind='stable')] = np.arange(len(self.ids))
+        self._id_order = np.argsort(self.ids)
+
+    @classmethod
+    def load(cls, session: Session, pool_id: int) -> 'PoolStandings':
+        """Load the standings of ``pool_id`` for every main in one query."""
+        points = CharacterPoints.__table__.c
+        rows = session.execute(
+            select(Character.id, Character.name, Character.class_name, Character.rank_name,
+                   Character.active, Character.hidden, *(points[column] for column in LEADERBOARD_METRICS.values()))
+            .join(CharacterPoints.__table__, points.character_id == Character.id)
+            .where(points.pool_id == pool_id, Character.is_main.is_(True))
+        ).all()
+        return cls(pool_id, rows)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def ranked(self, metric: str = 'current', filters: LeaderboardFilter = LeaderboardFilter()) -> np.ndarray:
+        """
+        Return the array positions of the matching mains, best first.
+
+        Args:
+            metric: One of ``LEADERBOARD_METRICS``.
+            filters: Which mains are eligible.
+        """
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown leaderboard metric '{metric}'; expected one of {', '.join(LEADERBOARD_METRICS)}")
+
+        mask = np.ones(len(self.ids), dtype=bool)
+        if filters.active is not None:
+            mask &= self.active == filters.active
+        if filters.hidden is not None:
+            mask &= self.hidden == filters.hidden
+        for keys, wanted in ((self._class_keys, filters.class_name), (self._rank_keys, filters.rank_name)):
+            if wanted is not None:
+                mask &= keys == name_key(wanted)
+
+        positions = np.flatnonzero(mask)
+        values = self.metrics[LEADERBOARD_METRICS[metric]][positions]
+        # lexsort sorts by the last key first
+        return positions[np.lexsort((self.ids[positions], self._name_order[positions], -values))]
+
+    def leaderboard(self, metric: str = 'current', count: int = 10,
+                    filters: LeaderboardFilter = LeaderboardFilter(), offset: int = 0) -> List[PoolEntry]:
+        """
+        Return one page of mains ranked by ``metric`` within the pool.
+
+        Args:
+            metric: One of ``LEADERBOARD_METRICS``.
+            count: Page size.
+            filters: Which mains are eligible.
+            offset: Number of ranked mains to skip.
+        """
+        return [self._entry(position) for position in self.ranked(metric, filters)[offset:offset + max(count, 0)]]
+
+    def entry(self, main_id: int) -> Optional[PoolEntry]:
+        """Return the pool points of one main, or None if it has none in this pool."""
+        index = np.searchsorted(self.ids, main_id, sorter=self._id_order)
+        if index == len(self.ids) or self.ids[self._id_order[index]] != main_id:
+            return None
+        return self._entry(self._id_order[index])
+
+    def _entry(self, position: int) -> PoolEntry:
+        return PoolEntry(
+            int(self.ids[position]), self.names[position], self.class_names[position], self.rank_names[position],
+            *(float(self.metrics[column][position]) for column in LEADERBOARD_METRICS.values()),
+        )
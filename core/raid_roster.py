@@ -0,0 +1,182 @@
+"""
+Import of EverQuest raid roster dumps (``/outputfile raidlist``).
+"""
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from glob import glob
+from typing import Dict, Iterable, List, Optional
+from core.database import DatabaseManager
+from core.models import name_key
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Raid dumps are written as RaidRoster-<date>-<time>.txt (RaidRoster_<server>-... on newer clients)
+ROSTER_GLOB = "RaidRoster*.txt"
+
+# Column of the character name in a tab-separated dump line: group, name, level, class, role, ...
+NAME_COLUMN = 1
+
+# Written when no output file is given
+DEFAULT_OUTPUT_FILE = "raid_roster.csv"
+
+
+def find_roster_files(path: str) -> List[str]:
+    """
+    Return the roster dumps at ``path``: the file itself, or every dump in a directory.
+
+    Args:
+        path: A dump file or a directory containing dumps.
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist.
+    """
+    if os.path.isdir(path):
+        return sorted(glob(os.path.join(path, ROSTER_GLOB)))
+    if os.path.isfile(path):
+        return [path]
+    raise FileNotFoundError(f"No roster file or directory at '{path}'")
+
+
+def read_roster(path: str) -> List[str]:
+    """
+    Read the character names from one tab-separated raid roster dump.
+
+    Args:
+        path: Dump file to read.
+
+    Returns:
+        Character names in file order.
+    """
+    names = []
+    with open(path, 'r', encoding='latin-1') as f:
+        for line in f:
+            columns = line.rstrip('\r\n').split('\t')
+            if len(columns) > NAME_COLUMN and columns[NAME_COLUMN].isalpha():
+                names.append(columns[NAME_COLUMN])
+    return names
+
+
+@dataclass
+class RosterEntry:
+    """One character line of a dump, resolved against the roster."""
+
+    file: str
+    name: str
+    found: bool
+    main_id: Optional[int] = None
+    main_name: Optional[str] = None
+    class_name: Optional[str] = None
+    rank_name: Optional[str] = None
+    current_with_twink: Optional[float] = None
+
+
+@dataclass
+class Attendance:
+    """A main seen in one or more dumps, through any of its characters."""
+
+    main_id: int
+    main_name: str
+    rank_name: Optional[str]
+    current_with_twink: float
+    dumps: int = 0
+    characters: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RosterImport:
+    """Result of importing one or more raid roster dumps."""
+
+    files: List[str]
+    entries: List[RosterEntry]
+    attendance: List[Attendance]
+
+    @property
+    def unknown(self) -> List[str]:
+        """Names that are not in the characters table, without repeats."""
+        return list(dict.fromkeys(entry.name for entry in self.entries if not entry.found))
+
+    def write(self, path: str) -> None:
+        """
+        Write the import to ``path``: JSON for ``.json`` files, CSV (one row per entry) otherwise.
+
+        Args:
+            path: Output file.
+        """
+        if path.lower().endswith('.json'):
+            payload = {
+                'files': self.files,
+                'attendance': [asdict(attendance) for attendance in self.attendance],
+                'unknown': self.unknown,
+                'entries': [asdict(entry) for entry in self.entries],
+            }
+            with open(path, 'w') as f:
+                json.dump(payload, f, indent=2)
+        else:
+            columns = list(RosterEntry.__dataclass_fields__)
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=columns)
+                writer.writeheader()
+                writer.writerows(asdict(entry) for entry in self.entries)
+        logger.info(f"Wrote raid roster import to {path}")
+
+
+class RaidRosterImporter:
+    """Reads raid roster dumps in parallel and resolves every name with one lookup."""
+
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, max_workers: int = 8) -> None:
+        """
+        Initialize the importer.
+
+        Args:
+            db_manager: Database to resolve names against.
+            max_workers: Dumps read concurrently.
+        """
+        self.db_manager = db_manager or DatabaseManager()
+        self.max_workers = max_workers
+
+    def import_paths(self, paths: Iterable[str]) -> RosterImport:
+        """
+        Import every dump found at ``paths``.
+
+        Args:
+            paths: Dump files and/or directories of dumps.
+
+        Returns:
+            Per-line entries and per-main attendance, mains ordered by dumps attended then points.
+        """
+        files = [file for path in paths for file in find_roster_files(path)]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="roster") as pool:
+            rosters = list(pool.map(read_roster, files))
+
+        cards = self.db_manager.get_character_cards({name for names in rosters for name in names})
+
+        entries: List[RosterEntry] = []
+        attendance: Dict[int, Attendance] = {}
+        for file, names in zip(files, rosters):
+            attended = set()
+            for name in names:
+                card = cards.get(name_key(name))
+                if card is None:
+                    entries.append(RosterEntry(os.path.basename(file), name, False))
+                    continue
+
+                entries.append(RosterEntry(
+                    os.path.basename(file), card.name, True, card.main_id, card.main_name,
+                    card.class_name, card.rank_name, card.current_with_twink,
+                ))
+                main = attendance.setdefault(card.main_id, Attendance(
+                    card.main_id, card.main_name or card.name, card.main_rank_name, card.current_with_twink,
+                ))
+                if card.name not in main.characters:
+                    main.characters.append(card.name)
+                attended.add(card.main_id)
+            for main_id in attended:
+                attendance[main_id].dumps += 1
+
+        ordered = sorted(attendance.values(), key=lambda a: (-a.dumps, -a.current_with_twink, name_key(a.main_name)))
+        logger.info(f"Imported {len(files)} raid roster dumps: {len(entries)} lines, {len(ordered)} mains")
+        return RosterImport(files, entries, ordered)
@@ -0,0 +1,327 @@
+"""
+In-memory read model of the characters table for fast CLI lookups.
+"""
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from core.models import Character, name_key
+
+
+@dataclass(frozen=True)
+class CharacterRecord:
+    """Immutable snapshot of one ``characters`` row."""
+
+    id: int
+    name: str
+    class_id: int
+    class_name: str
+    rank_id: Optional[int]
+    rank_name: Optional[str]
+    active: bool
+    hidden: bool
+    main_id: Optional[int]
+    main_name: Optional[str]
+    current: float
+    earned: float
+    spent: float
+    current_with_twink: float
+    earned_with_twink: float
+    spent_with_twink: float
+    adjustment: float
+    adjustment_with_twink: float
+
+    @property
+    def group_id(self) -> int:
+        """Id of the main this character belongs to (itself if it has no main)."""
+        return self.main_id if self.main_id is not None else self.id
+
+    @property
+    def is_main(self) -> bool:
+        return self.main_id == self.id
+
+
+@dataclass(frozen=True)
+class AltMember:
+    """One character of an alt group, as shown on a character card."""
+
+    id: int
+    name: str
+    class_name: str
+    rank_name: Optional[str]
+
+
+@dataclass(frozen=True)
+class CharacterCard:
+    """Everything shown for a character: itself, its main, every alt and the group's points."""
+
+    id: int
+    name: str
+    class_name: str
+    rank_name: Optional[str]
+    main_id: int
+    main_name: Optional[str]
+    main_rank_name: Optional[str]
+    current_with_twink: float
+    earned_with_twink: float
+    spent_with_twink: float
+    adjustment_with_twink: float
+    members: Tuple[AltMember, ...]
+
+    @property
+    def alts(self) -> List[AltMember]:
+        """Members of the group other than this character."""
+        return [member for member in self.members if member.id != self.id]
+
+
+RECORD_COLUMNS = [Character.__table__.c[f.name] for f in fields(CharacterRecord)]
+
+# Leaderboard metric -> column it ranks on; mains are ranked on totals including their alts
+LEADERBOARD_METRICS: Dict[str, str] = {
+    'current': 'current_with_twink',
+    'earned': 'earned_with_twink',
+    'spent': 'spent_with_twink',
+    'adjustment': 'adjustment_with_twink',
+}
+
+# Leaderboard grouping -> column the groups are taken from
+LEADERBOARD_GROUPS: Dict[str, str] = {
+    'class': 'class_name',
+    'rank': 'rank_name',
+}
+
+# Position of a row in a leaderboard: (-metric value, name key, id). Pages start after a cursor.
+Cursor = Tuple[float, str, int]
+
+# Position of an alt group in the roster: (lowercased main name, main id)
+RosterCursor = Tuple[str, int]
+
+
+def leaderboard_key(record, metric: str) -> Cursor:
+    """Return the sort key of a character in the leaderboard for ``metric``."""
+    return (-getattr(record, LEADERBOARD_METRICS[metric]), name_key(record.name), record.id)
+
+
+@dataclass(frozen=True)
+class LeaderboardFilter:
+    """Restricts which mains appear on a leaderboard; ``None`` means no restriction."""
+
+    active: Optional[bool] = None
+    hidden: Optional[bool] = None
+    class_name: Optional[str] = None
+    rank_name: Optional[str] = None
+
+    def matches(self, record) -> bool:
+        return ((self.active is None or bool(record.active) == self.active)
+                and (self.hidden is None or bool(record.hidden) == self.hidden)
+                and (self.class_name is None or name_key(record.class_name or '') == name_key(self.class_name))
+                and (self.rank_name is None or name_key(record.rank_name or '') == name_key(self.rank_name)))
+
+
+@dataclass
+class LeaderboardPage:
+    """One page of a leaderboard and the cursor to pass for the next page."""
+
+    entries: list
+    next_cursor: Optional[Cursor] = None
+
+
+@dataclass
+class RosterPage:
+    """One page of the full roster: a card per main with its alts, in name order."""
+
+    entries: List[CharacterCard]
+    total: int
+    # Pass as ``after`` for the next page / ``before`` for the previous one; None at either end
+    next_cursor: Optional[RosterCursor] = None
+    previous_cursor: Optional[RosterCursor] = None
+
+
+@dataclass
+class _Ranking:
+    records: List[CharacterRecord] = field(default_factory=list)
+    keys: List[Cursor] = field(default_factory=list)
+
+    def append(self, record: CharacterRecord, key: Cursor) -> None:
+        self.records.append(record)
+        self.keys.append(key)
+
+
+class CharacterReadModel:
+    """
+    Indexes over every character, built in one query and not mutated afterwards.
+
+    Holds a lowercase name map, alt groups keyed by main id and the mains
+    presorted by every metric, overall and per class and rank. All of them are
+    built in ``__init__``, so a swapped-in instance is read without locking.
+    The only exception is the per-pool standings, which need their own query
+    and are loaded on first use under a lock by ``pool_standings``. A refresh
+    builds a new instance and swaps it in, so readers always see a consistent
+    snapshot.
+    """
+
+    def __init__(self, records: Iterable[CharacterRecord]) -> None:
+        """
+        Build the indexes.
+
+        Args:
+            records: Every character in the roster.
+        """
+        self.by_id: Dict[int, CharacterRecord] = {}
+        self.by_name: Dict[str, CharacterRecord] = {}
+        self.groups: Dict[int, List[CharacterRecord]] = {}
+
+        for record in records:
+            self.by_id[record.id] = record
+            self.by_name.setdefault(name_key(record.name), record)
+            self.groups.setdefault(record.group_id, []).append(record)
+
+        for members in self.groups.values():
+            members.sort(key=lambda member: member.name.lower())
+
+        mains = [record for record in self.by_id.values() if record.is_main]
+        self._rankings: Dict[Tuple[str, Optional[str], Optional[str]], _Ranking] = {}
+        for metric in LEADERBOARD_METRICS:
+            ranking = _Ranking()
+            for key, record in sorted((leaderboard_key(record, metric), record) for record in mains):
+                ranking.append(record, key)
+            self._rankings[(metric, None, None)] = ranking
+            for column in LEADERBOARD_GROUPS.values():
+                self._partition(metric, column)
+        self.standings = self._rankings[('current', None, None)].records
+        # Columnar per-pool standings (pool id -> PoolStandings), loaded on first use
+        self.pools: Dict[int, object] = {}
+        self._pools_lock = threading.Lock()
+        self.built_at = datetime.utcnow()
+
+    @classmethod
+    def load(cls, session: Session) -> 'CharacterReadModel':
+        """Build a read model from the database in a single query."""
+        rows = session.execute(select(*RECORD_COLUMNS)).all()
+        return cls(CharacterRecord(*row) for row in rows)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, name: str) -> Optional[CharacterRecord]:
+        """Look up a character by name, case insensitively."""
+        return self.by_name.get(name_key(name))
+
+    def alt_group(self, name: str) -> List[CharacterRecord]:
+        """Return every character sharing a main with ``name`` (including itself)."""
+        record = self.get(name)
+        if record is None:
+            return []
+        return list(self.groups.get(record.group_id, [record]))
+
+    def card(self, name: str) -> Optional[CharacterCard]:
+        """Build the character card for ``name`` from the in-memory alt groups."""
+        record = self.get(name)
+        if record is None:
+            return None
+        members = self.groups.get(record.group_id, [record])
+        main = self.by_id.get(record.group_id)
+        totals = {column: getattr(main, column) if main else max(getattr(m, column) for m in members)
+                  for column in LEADERBOARD_METRICS.values()}
+        return CharacterCard(
+            id=record.id,
+            name=record.name,
+            class_name=record.class_name,
+            rank_name=record.rank_name,
+            main_id=record.group_id,
+            main_name=main.name if main else max(m.main_name or '' for m in members) or None,
+            main_rank_name=main.rank_name if main else None,
+            **totals,
+            members=tuple(AltMember(m.id, m.name, m.class_name, m.rank_name) for m in members),
+        )
+
+    def top(self, count: int) -> List[CharacterRecord]:
+        """Return the top ``count`` mains by current points."""
+        return self.standings[:max(count, 0)]
+
+    def leaderboard(self, metric: str = 'current', count: int = 10,
+                    filters: LeaderboardFilter = LeaderboardFilter(),
+                    after: Optional[Cursor] = None) -> LeaderboardPage:
+        """
+        Return one page of mains ranked by ``metric``.
+
+        Args:
+            metric: One of ``LEADERBOARD_METRICS``.
+            count: Page size.
+            filters: Which mains are eligible.
+            after: ``next_cursor`` of the previous page, or None for the first page.
+
+        Returns:
+            The page, with a cursor for the next one if the page is full.
+        """
+        ranking = self._ranking(metric, filters)
+        entries = []
+        index = bisect_right(ranking.keys, after) if after is not None else 0
+        while index < len(ranking.records) and len(entries) < count:
+            record = ranking.records[index]
+            if filters.matches(record):
+                entries.append(record)
+            index += 1
+
+        next_cursor = leaderboard_key(entries[-1], metric) if entries and len(entries) == count else None
+        return LeaderboardPage(entries, next_cursor)
+
+    def leaderboard_groups(self, metric: str = 'current', group_by: str = 'class', count: int = 10,
+                           filters: LeaderboardFilter = LeaderboardFilter()) -> Dict[str, List[CharacterRecord]]:
+        """
+        Return the top ``count`` mains by ``metric`` within every class or rank.
+
+        Args:
+            metric: One of ``LEADERBOARD_METRICS``.
+            group_by: One of ``LEADERBOARD_GROUPS``.
+            count: Entries per group.
+            filters: Which mains are eligible.
+
+        Returns:
+            Group name -> ranked mains, ordered by group name.
+        """
+        column = LEADERBOARD_GROUPS[group_by]
+        groups: Dict[str, List[CharacterRecord]] = {}
+        for record in self._ranking(metric, filters).records:
+            if filters.matches(record):
+                members = groups.setdefault(getattr(record, column) or 'Unknown', [])
+                if len(members) < count:
+                    members.append(record)
+        return dict(sorted(groups.items(), key=lambda item: name_key(item[0])))
+
+    def _ranking(self, metric: str, filters: LeaderboardFilter) -> _Ranking:
+        """Return the narrowest presorted ranking that still contains every match for ``filters``."""
+        if metric not in LEADERBOARD_METRICS:
+            raise ValueError(f"Unknown leaderboard metric '{metric}'; expected one of {', '.join(LEADERBOARD_METRICS)}")
+
+        for column, value in (('class_name', filters.class_name), ('rank_name', filters.rank_name)):
+            if value is not None:
+                return self._rankings.get((metric, column, name_key(value)), _Ranking())
+        return self._rankings[(metric, None, None)]
+
+    def _partition(self, metric: str, column: str) -> None:
+        """Split a metric's ranking by class or rank while building; each slice stays sorted."""
+        full = self._rankings[(metric, None, None)]
+        for record, key in zip(full.records, full.keys):
+            group = (metric, column, name_key(getattr(record, column) or ''))
+            self._rankings.setdefault(group, _Ranking()).append(record, key)
+
+    def pool_standings(self, pool_id: int, load: Callable[[], object]) -> object:
+        """
+        Return the cached standings of a pool, calling ``load`` once to build them.
+
+        The lock makes concurrent first calls load the pool only once and never
+        expose a half-filled cache.
+
+        Args:
+            pool_id: Id of the pool.
+            load: Builds the ``PoolStandings`` of the pool.
+        """
+        with self._pools_lock:
+            standings = self.pools.get(pool_id)
+            if standings is None:
+                standings = self.pools[pool_id] = load()
+            return standings
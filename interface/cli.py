@@ -1,14 +1,24 @@
 """
 Command Line Interface module for user interaction.
 """
-from typing import List
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from rich.console import Console
 from rich.prompt import Prompt, IntPrompt
 from interface.display import DisplayManager
 from utils.logger import get_logger
-from core.bidding_manager import BiddingManager
-from core.database import DatabaseManager
+from core.bidding_manager import BiddingManager, parse_names
+from core.database import SNAPSHOT_METRICS, DatabaseManager, date_to_timestamp
+from core.exporter import DEFAULT_EXPORT_FILE, EXPORT_FORMATS, default_export_path, export_standings
+from core.log_tailer import DEFAULT_BID_PATTERN, LogTailer, checkpoint_key
+from core.models import DKPPool, name_key
+from core.raid_roster import DEFAULT_OUTPUT_FILE, ROSTER_GLOB, RaidRosterImporter
+from core.read_model import (
+    LEADERBOARD_GROUPS, LEADERBOARD_METRICS, CharacterCard, Cursor, LeaderboardFilter, LeaderboardPage, leaderboard_key,
+)
 from rich.table import Table
 logger = get_logger(__name__)
 
@@ -20,21 +30,46 @@ class Command:
     handler: callable
     shorthand: str
 
+@dataclass
+class _TopQuery:
+    """The last ``top`` listing, kept so ``top next`` can continue from its cursor."""
+    metric: str
+    count: int
+    filters: LeaderboardFilter
+    cursor: Optional[Cursor]
+    shown: int
+    pool: Optional[DKPPool] = None
+
+def _format_timestamp(timestamp: Optional[int]) -> str:
+    """Render a feed's unix time as a local date, or an empty string if it is unknown."""
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d") if timestamp else ""
+
+
 class CLI:
     """Handles command-line interface operations."""
     
-    def __init__(self) -> None:
+    def __init__(self, log_file: Optional[str] = None, bid_pattern: str = DEFAULT_BID_PATTERN,
+                 refresher=None, export_file: str = DEFAULT_EXPORT_FILE) -> None:
         """
         Initialize the CLI interface.
         
         Args:
-            data: DataFrame containing the processed DKP data
+            log_file: EverQuest log followed by the ``follow`` command when no path is given.
+            bid_pattern: Regex with a ``name`` group that marks a log line as a bid.
+            refresher: ``BackgroundRefresher`` run by the ``refresh`` command; None when offline.
+            export_file: CSV file written by ``export`` when no path is given.
         """
         self.console = Console()
         # add database manager
         self.db_manager = DatabaseManager()
         self.display = DisplayManager()
         self.bidding_manager = BiddingManager()
+        self.log_file = log_file
+        self.bid_pattern = bid_pattern
+        self.refresher = refresher
+        self.export_file = export_file
+        self._completions: List[str] = []
+        self._last_top: Optional[_TopQuery] = None
         self.commands = {
             "character": Command(
                 name="character",
@@ -48,12 +83,72 @@ class CLI:
                 handler=self._handle_top_display,
                 shorthand="t"
             ),
+            "roster": Command(
+                name="roster",
+                description="Page through every main and its alts",
+                handler=self._handle_roster,
+                shorthand="l"
+            ),
             "bid": Command(
                 name="bid",
                 description="Enter bidding mode",
                 handler=self._handle_bid_mode,
                 shorthand="b"
             ),
+            "spent": Command(
+                name="spent",
+                description="Show what a character and its alts bought",
+                handler=self._handle_purchases,
+                shorthand="s"
+            ),
+            "price": Command(
+                name="price",
+                description="Show what an item has sold for",
+                handler=self._handle_item_price,
+                shorthand="p"
+            ),
+            "history": Command(
+                name="history",
+                description="Show how a character's points moved over time",
+                handler=self._handle_history,
+                shorthand="hi"
+            ),
+            "movers": Command(
+                name="movers",
+                description="Show the biggest gainers or spenders between dates",
+                handler=self._handle_movers,
+                shorthand="m"
+            ),
+            "follow": Command(
+                name="follow",
+                description="Collect bids from an EverQuest log",
+                handler=self._handle_follow,
+                shorthand="f"
+            ),
+            "import": Command(
+                name="import",
+                description="Check raid roster dumps against the DKP roster",
+                handler=self._handle_roster_import,
+                shorthand="i"
+            ),
+            "analyze": Command(
+                name="analyze",
+                description="Show points statistics per class and rank",
+                handler=self._handle_analyze,
+                shorthand="a"
+            ),
+            "export": Command(
+                name="export",
+                description="Write the standings to a CSV, NDJSON or Parquet file",
+                handler=self._handle_export,
+                shorthand="x"
+            ),
+            "refresh": Command(
+                name="refresh",
+                description="Fetch fresh data in the background",
+                handler=self._handle_refresh,
+                shorthand="r"
+            ),
             "help": Command(
                 name="help",
                 description="Show available commands",
@@ -70,31 +165,118 @@ class CLI:
 
     def start(self) -> None:
         """Start the CLI interface."""
+        self._setup_completion()
         self._display_welcome()
         self._command_loop()
 
+    def _setup_completion(self) -> None:
+        """Enable tab completion of commands and character names where readline is available."""
+        try:
+            import readline
+        except ImportError:
+            logger.debug("readline not available; tab completion disabled")
+            return
+
+        readline.set_completer(self._complete)
+        readline.set_completer_delims(" ")
+        readline.parse_and_bind("tab: complete")
+
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        """
+        readline completer: the first word completes to a command, later words to character names.
+
+        Args:
+            text: The word being completed.
+            state: Index of the match readline is asking for.
+        """
+        import readline
+
+        if state == 0:
+            if readline.get_line_buffer()[:readline.get_begidx()].strip():
+                self._completions = self.db_manager.complete_names(text)
+            else:
+                self._completions = [name for cmd in self.commands.values()
+                                     for name in (cmd.name, cmd.shorthand) if name.startswith(text)]
+        return self._completions[state] if state < len(self._completions) else None
+
+    def _resolve_characters(self, character_names: List[str]) -> List[CharacterCard]:
+        """
+        Look up character cards in one batch, offering close matches for names that are not found.
+
+        Args:
+            character_names: Names as entered by the user.
+
+        Returns:
+            Cards for the names found or picked from the suggestions, in input order.
+        """
+        cards = self.db_manager.get_character_cards(character_names)
+        resolved = []
+        for character_name in character_names:
+            card = cards.get(name_key(character_name)) or self._suggest_character(character_name)
+            if card is not None:
+                resolved.append(card)
+        return resolved
+
+    def _suggest_character(self, character_name: str) -> Optional[CharacterCard]:
+        """
+        Offer close matches for a name that was not found and let the user pick one.
+
+        Args:
+            character_name: Name as entered by the user.
+
+        Returns:
+            The card of the suggestion the user picked, or None.
+        """
+        suggestions = self.db_manager.suggest_names(character_name)
+        if not suggestions:
+            self.console.print(f"[bold red]Character '{character_name}' not found![/bold red]")
+            return None
+
+        self.console.print(f"[yellow]Character '{character_name}' not found. Did you mean:[/yellow]")
+        for index, name in enumerate(suggestions, start=1):
+            self.console.print(f"  [cyan]{index}[/cyan]. {name}")
+
+        choice = Prompt.ask("Pick a number (Enter to skip)", default="", show_default=False).strip()
+        if not choice.isdigit() or not 1 <= int(choice) <= len(suggestions):
+            return None
+        picked = suggestions[int(choice) - 1]
+        return self.db_manager.get_character_cards([picked]).get(name_key(picked))
+
     def _display_welcome(self) -> None:
         """Display welcome message and command help."""
-        self.console.print("[cyan]Data fetched and processed successfully![/cyan]")
         self._handle_help()
 
+    def _print_notices(self) -> None:
+        """Print what the background refresher reported since the last command."""
+        if self.refresher is not None:
+            for notice in self.refresher.drain_notices():
+                self.console.print(notice)
+
 
     def _command_loop(self) -> None:
         """Main command processing loop."""
         while True:
             try:
+                self._print_notices()
                 # Show available commands on each loop in yellow
                 self.console.print("\n[yellow]Options: character <name> or c <name>, "
-                                 "top <number> or t <number>, "
-                                 "bid, b, "
+                                 "top <number> [--by metric] [--class name] or t <number>, "
+                                 "roster or l, bid, b, "
+                                 "spent <name> or s <name>, price <item> or p <item>, "
+                                 "history <name> or hi <name>, movers [N] or m, "
+                                 "follow <log> or f <log>, "
+                                 "import <dump or dir> or i <path>, "
+                                 "analyze or a, export <file> or x, "
+                                 "refresh or r, "
                                  "help or h, "
                                  "exit or e[/yellow]")
                 
-                user_input = Prompt.ask("\nEnter command").lower().split()
+                user_input = Prompt.ask("\nEnter command").split()
                 if not user_input:
                     continue
 
-                command = user_input[0]
+                # Arguments keep their case (file paths); names and options are matched case-insensitively
+                command = user_input[0].lower()
                 args = user_input[1:] if len(user_input) > 1 else []
 
                 # Check for both full command and shorthand
@@ -114,74 +296,453 @@ class CLI:
                 self.console.print(f"[bold red]Error: {e}[/bold red]")
 
     def _handle_character_search(self, args: List[str]) -> None:
-        """Handle character search command."""
-        character_name = args[0] if args else Prompt.ask("Enter character name")
-        
-        # Query the database for the character
-        character_info = self.db_manager.get_character_by_name(character_name)
-        
-        # Check if character_info is None and print an error message
-        if not character_info:
-            self.console.print(f"[bold red]Character '{character_name}' not found![/bold red]")
+        """Handle character search command; several names are looked up together, ``--pool`` picks a DKP pool."""
+        character_names, options = self._parse_options(args)
+        character_names = character_names or Prompt.ask("Enter character name").split()
+        pool = self._select_pool(options)
+
+        # Query the database for every character at once, falling back to suggestions
+        cards = self._resolve_characters(character_names)
+        if not cards:
             return
-        
-        alt_characters = self.db_manager.get_all_characters(character_info.name)
-        alt_characters_str = "\n".join([f"{alt.name} ({alt.rank_name})" for alt in alt_characters if alt.name != character_info.name])
-        
+        standings = self.db_manager.get_pool_standings(pool.id) if pool is not None else None
+
         # Display character information
-        table = Table(title=f"Character: {character_info.name}")
+        title = f"Character: {cards[0].name}" if len(cards) == 1 else f"Characters ({len(cards)})"
+        if pool is not None:
+            title += f" - {pool.name} pool"
+        table = Table(title=title)
         table.add_column("ID", style="cyan")
         table.add_column("Main Character", style="magenta")
         table.add_column("Alts", style="green")
         table.add_column("MMBz (C)", style="red")
         table.add_column("MMBz (L)", style="yellow")
 
-        # add a single row with the main character info
-        table.add_row(
-            str(character_info.id),
-            f"[bold]{character_info.name}[/bold] ({character_info.rank_name})",
-            alt_characters_str,
-            str(character_info.current_with_twink),
-            str(character_info.earned_with_twink)
-        )
+        # add one row per character with its alt group
+        for card in cards:
+            points = card if standings is None else standings.entry(card.main_id)
+            table.add_row(
+                str(card.id),
+                f"[bold]{card.name}[/bold] ({card.rank_name})",
+                "\n".join(f"{alt.name} ({alt.rank_name})" for alt in card.alts),
+                str(points.current_with_twink if points else 0.0),
+                str(points.earned_with_twink if points else 0.0)
+            )
 
         self.console.print(table)
 
     def _handle_top_display(self, args: List[str]) -> None:
-        """Handle top N display command."""
+        """
+        Handle top N display command.
+
+        Supports ``--by <metric>``, ``--class <name>``, ``--rank <name>``, ``--active``,
+        ``--visible``, ``--per class|rank`` and ``--pool <name or id>``; ``top next``
+        pages through the last list.
+        """
+        if args and args[0].lower() in ("next", "n"):
+            self._show_next_top_page()
+            return
+
         try:
-            count = int(args[0]) if args else IntPrompt.ask("Enter number of characters to show", default=5)
-            
-            # Query the database for the top N characters by points
-            top_characters = self.db_manager.get_top_characters_by_points(count)
-            
-            if top_characters:
-                # Create a rich table to display the top characters
-                table = Table(title=f"Top {count} Characters by Points")
-                table.add_column("Rank", style="magenta")
-                table.add_column("Name", style="cyan")
-                table.add_column("Class", style="green")
-                table.add_column("Current Points", justify="right", style="red")
-                
-                for index, character in enumerate(top_characters, start=1):
-                    table.add_row(str(index), character.name, character.class_name, str(character.current_with_twink))
-                
-                self.console.print(table)
-            else:
-                self.console.print("[red]No characters found in the database.[/red]")
+            positional, options = self._parse_options(args)
+            count = int(positional[0]) if positional else IntPrompt.ask("Enter number of characters to show", default=5)
         except ValueError:
             self.console.print("[red]Please provide a valid number[/red]")
+            return
+
+        metric = options.get("by", "current").lower()
+        group_by = options.get("per", "").lower() or None
+        if metric not in LEADERBOARD_METRICS:
+            self.console.print(f"[red]Unknown metric '{metric}'. Use one of: {', '.join(LEADERBOARD_METRICS)}[/red]")
+            return
+        if group_by is not None and group_by not in LEADERBOARD_GROUPS:
+            self.console.print(f"[red]Unknown grouping '{group_by}'. Use one of: {', '.join(LEADERBOARD_GROUPS)}[/red]")
+            return
+
+        filters = LeaderboardFilter(
+            active=True if "active" in options else None,
+            hidden=False if "visible" in options else None,
+            class_name=options.get("class"),
+            rank_name=options.get("rank"),
+        )
+        pool = self._select_pool(options)
+
+        if group_by is not None and pool is not None:
+            self.console.print("[red]--per cannot be combined with --pool.[/red]")
+            return
+        if group_by is not None:
+            groups = self.db_manager.get_leaderboard_groups(metric, group_by, count, filters)
+            if not groups:
+                self.console.print("[red]No characters found in the database.[/red]")
+            for group, entries in groups.items():
+                self._print_leaderboard(f"Top {count} {group} by {metric.title()} Points", entries, metric)
+            return
+
+        query = _TopQuery(metric, count, filters, None, 0, pool)
+        page = self._top_page(query)
+        self._last_top = _TopQuery(metric, count, filters, page.next_cursor, len(page.entries), pool)
+        if page.entries:
+            in_pool = f" in {pool.name}" if pool is not None else ""
+            self._print_leaderboard(f"Top {count} Characters by {metric.title()} Points{in_pool}", page.entries, metric)
+            if page.next_cursor is not None:
+                self.console.print("[dim]Type 'top next' for the next page.[/dim]")
+        else:
+            self.console.print("[red]No characters found in the database.[/red]")
+
+    def _show_next_top_page(self) -> None:
+        """Show the page following the last ``top`` listing."""
+        query = self._last_top
+        if query is None or query.cursor is None:
+            self.console.print("[yellow]No more characters to show.[/yellow]")
+            return
+
+        page = self._top_page(query)
+        if not page.entries:
+            self._last_top = None
+            self.console.print("[yellow]No more characters to show.[/yellow]")
+            return
+
+        title = f"Characters {query.shown + 1}-{query.shown + len(page.entries)} by {query.metric.title()} Points"
+        self._print_leaderboard(title, page.entries, query.metric, start=query.shown + 1)
+        self._last_top = _TopQuery(query.metric, query.count, query.filters, page.next_cursor,
+                                   query.shown + len(page.entries), query.pool)
+
+    def _top_page(self, query: _TopQuery) -> LeaderboardPage:
+        """Fetch the page after ``query``: from the cursor, or by offset from a pool's columnar standings."""
+        if query.pool is None:
+            return self.db_manager.get_leaderboard(query.metric, query.count, query.filters, after=query.cursor)
+
+        standings = self.db_manager.get_pool_standings(query.pool.id)
+        entries = standings.leaderboard(query.metric, query.count, query.filters, offset=query.shown)
+        full = bool(entries) and len(entries) == query.count
+        return LeaderboardPage(entries, leaderboard_key(entries[-1], query.metric) if full else None)
+
+    def _select_pool(self, options: Dict[str, str]) -> Optional[DKPPool]:
+        """
+        Resolve a ``--pool <name or id>`` option.
+
+        Returns:
+            The pool, or None if the option was not given.
+
+        Raises:
+            ValueError: If no pool matches.
+        """
+        if "pool" not in options:
+            return None
+        pool = self.db_manager.find_pool(options["pool"])
+        if pool is None:
+            known = ", ".join(f"{pool.id} ({pool.name})" for pool in self.db_manager.get_pools()) or "none"
+            raise ValueError(f"Unknown pool '{options['pool']}'. Available pools: {known}")
+        return pool
+
+    def _print_leaderboard(self, title: str, entries: list, metric: str, start: int = 1) -> None:
+        """Render ranked characters as a table."""
+        table = Table(title=title)
+        table.add_column("Rank", style="magenta")
+        table.add_column("Name", style="cyan")
+        table.add_column("Class", style="green")
+        table.add_column(f"{metric.title()} Points", justify="right", style="red")
+
+        for index, character in enumerate(entries, start=start):
+            table.add_row(str(index), character.name, character.class_name,
+                          str(getattr(character, LEADERBOARD_METRICS[metric])))
+
+        self.console.print(table)
+
+    @staticmethod
+    def _parse_options(args: List[str]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Split command arguments into positionals and ``--name [value]`` options.
+
+        Option values may span several words (e.g. ``--class shadow knight``); an
+        option without a value is stored with an empty string.
+        """
+        positional: List[str] = []
+        options: Dict[str, str] = {}
+        current = None
+        for arg in args:
+            if arg.startswith("--"):
+                current = arg[2:]
+                options[current] = ""
+            elif current is not None:
+                options[current] = f"{options[current]} {arg}".strip()
+            else:
+                positional.append(arg)
+        return positional, options
+
+    def _handle_roster(self, args: List[str]) -> None:
+        """Page through the full roster, starting at the page of a name if one is given."""
+        self.display.display_data(start=" ".join(args) or None)
 
     def _handle_bid_mode(self, args: List[str]) -> None:
-        """Enter bidding mode."""
-        self.bidding_manager.start_bid()
+        """
+        Enter bidding mode.
+
+        A single name is looked up with suggestions; several names on one line, or a
+        list entered after ``paste``, are added together with one lookup. ``--pool``
+        bids with the points of one DKP pool.
+        """
+        _, options = self._parse_options(args)
+        self.bidding_manager.start_bid(self._select_pool(options))
         while True:
-            command = Prompt.ask("[bold cyan]Enter character name to add or 'end'/'e' to finish bidding[/bold cyan]")
+            command = Prompt.ask("[bold cyan]Enter character name(s) to add, 'paste' to add a list, "
+                                 "or 'end'/'e' to finish bidding[/bold cyan]")
             if command.lower() in ['end', 'e']:
                 self.bidding_manager.end_bid()
                 break
+            elif command.lower() == 'paste':
+                self.bidding_manager.add_characters(parse_names(self._read_pasted_lines()))
             else:
-                self.bidding_manager.add_character(command)
+                names = parse_names(command)
+                if len(names) == 1:
+                    self.bidding_manager.add_cards(self._resolve_characters(names))
+                elif names:
+                    self.bidding_manager.add_characters(names)
+
+    def _handle_purchases(self, args: List[str]) -> None:
+        """Show the items bought by a character's alt group (or the character alone with ``--own``)."""
+        positional, options = self._parse_options(args)
+        character_name = " ".join(positional) or Prompt.ask("Enter character name")
+        purchases = self.db_manager.get_purchases(character_name, include_alts="own" not in options)
+        if not purchases:
+            self.console.print(f"[yellow]No items found for '{character_name}'.[/yellow]")
+            return
+
+        table = Table(title=f"Items bought by {character_name}" + ("" if "own" in options else " and alts"))
+        table.add_column("Date", style="cyan")
+        table.add_column("Character", style="magenta")
+        table.add_column("Item", style="green")
+        table.add_column("Pool", style="blue")
+        table.add_column("Points", justify="right", style="red")
+        for purchase in purchases:
+            table.add_row(_format_timestamp(purchase["timestamp"]), purchase["character"], purchase["item"],
+                          purchase["itempool"] or "", str(purchase["value"]))
+        self.console.print(table)
+        self.console.print(f"[cyan]{len(purchases)} items, {sum(p['value'] for p in purchases)} points spent.[/cyan]")
+
+    def _handle_item_price(self, args: List[str]) -> None:
+        """Show sale statistics of every item whose name starts with the given text."""
+        item_name = " ".join(args) or Prompt.ask("Enter item name")
+        prices = self.db_manager.get_item_prices(item_name)
+        if not prices:
+            self.console.print(f"[yellow]No sales found for '{item_name}'.[/yellow]")
+            return
+
+        table = Table(title=f"Prices of '{item_name}'")
+        table.add_column("Item", style="green")
+        table.add_column("Sold", justify="right", style="cyan")
+        table.add_column("Average", justify="right", style="red")
+        table.add_column("Min", justify="right", style="yellow")
+        table.add_column("Max", justify="right", style="yellow")
+        table.add_column("Last Sold", style="magenta")
+        for price in prices:
+            table.add_row(price["item"], str(price["sold"]), f"{price['average']:.1f}", str(price["minimum"]),
+                          str(price["maximum"]), _format_timestamp(price["last_sold"]))
+        self.console.print(table)
+
+    def _handle_history(self, args: List[str]) -> None:
+        """Show a character's points after every snapshot that changed them (``--own`` skips the alts)."""
+        positional, options = self._parse_options(args)
+        character_name = " ".join(positional) or Prompt.ask("Enter character name")
+        trajectory = self.db_manager.get_trajectory(character_name, include_alts="own" not in options)
+        if not trajectory:
+            self.console.print(f"[yellow]No history found for '{character_name}'.[/yellow]")
+            return
+
+        table = Table(title=f"Points history of {character_name}" + ("" if "own" in options else " and alts"))
+        table.add_column("Date", style="cyan")
+        for metric in SNAPSHOT_METRICS:
+            table.add_column(metric.title(), justify="right", style="red" if metric == "current" else "yellow")
+        table.add_column("Change", justify="right", style="magenta")
+        for point in trajectory:
+            table.add_row(_format_timestamp(point["feed_timestamp"]),
+                          *(f"{point[metric]:g}" for metric in SNAPSHOT_METRICS), f"{point['change']:+g}")
+        self.console.print(table)
+
+    def _handle_movers(self, args: List[str]) -> None:
+        """
+        Show the mains whose points moved the most between two dates.
+
+        ``movers [N] [--by earned|spent|current|adjustment] [--from YYYY-MM-DD] [--to YYYY-MM-DD]``
+        """
+        positional, options = self._parse_options(args)
+        try:
+            count = int(positional[0]) if positional else 10
+            metric = options.get("by") or "earned"
+            start = date_to_timestamp(options["from"]) if options.get("from") else None
+            end = date_to_timestamp(options["to"]) if options.get("to") else None
+            movers = self.db_manager.get_movers(metric, start, end, count)
+        except ValueError as e:
+            self.console.print(f"[red]{e}[/red]")
+            return
+        if not movers:
+            self.console.print("[yellow]No point changes recorded in that range.[/yellow]")
+            return
+
+        period = " ".join(filter(None, (f"from {options['from']}" if options.get("from") else "",
+                                        f"to {options['to']}" if options.get("to") else "")))
+        table = Table(title=f"Biggest {metric} changes {period}".strip())
+        table.add_column("Rank", style="magenta")
+        table.add_column("Main", style="cyan")
+        table.add_column(f"{metric.title()} Change", justify="right", style="red")
+        for index, mover in enumerate(movers, start=1):
+            table.add_row(str(index), mover["main_name"] or str(mover["main_id"]), f"{mover['change']:+g}")
+        self.console.print(table)
+
+    def _handle_follow(self, args: List[str]) -> None:
+        """
+        Follow an EverQuest log and add everyone who bids to a new bid session.
+
+        New matching lines are added in batches as they are written; Ctrl+C ends
+        the session and announces the winner. ``--pool`` bids with the points of one DKP pool.
+        """
+        positional, options = self._parse_options(args)
+        pool = self._select_pool(options)
+        path = " ".join(positional) or self.log_file or Prompt.ask("Enter EverQuest log file")
+        if not os.path.isfile(path):
+            self.console.print(f"[red]Log file '{path}' not found.[/red]")
+            return
+
+        # Resume where the last follow of this log stopped, so bids written in between are not lost
+        key = checkpoint_key(path)
+        tailer = LogTailer.from_checkpoint(path, self.db_manager.get_sync_value(key), pattern=self.bid_pattern)
+        if tailer.offset is None:
+            tailer.poll()  # first follow of this log: start at its current end
+
+        def add_bidders(names: List[str]) -> None:
+            self.bidding_manager.add_characters(names)
+            self.db_manager.set_sync_values({key: tailer.checkpoint})
+
+        self.bidding_manager.start_bid(pool)
+        self.console.print(f"[cyan]Following {path}. Press Ctrl+C to end the bid.[/cyan]")
+        try:
+            tailer.follow(add_bidders, threading.Event())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.db_manager.set_sync_values({key: tailer.checkpoint})
+        self.bidding_manager.end_bid()
+
+    def _handle_roster_import(self, args: List[str]) -> None:
+        """Import raid roster dumps, show attendance per main and write the details to a file."""
+        positional, options = self._parse_options(args)
+        path = " ".join(positional) or Prompt.ask("Enter raid roster file or directory")
+        output = options.get("out") or DEFAULT_OUTPUT_FILE
+
+        try:
+            result = RaidRosterImporter(self.db_manager).import_paths([path])
+        except FileNotFoundError as e:
+            self.console.print(f"[red]{e}[/red]")
+            return
+        if not result.files:
+            self.console.print(f"[red]No {ROSTER_GLOB} files found in '{path}'.[/red]")
+            return
+
+        table = Table(title=f"Raid Attendance ({len(result.files)} dumps)")
+        table.add_column("Main Character", style="magenta")
+        table.add_column("Characters Seen", style="green")
+        table.add_column("Dumps", justify="right", style="cyan")
+        table.add_column("Current Points", justify="right", style="red")
+        for attendance in result.attendance:
+            table.add_row(f"{attendance.main_name} ({attendance.rank_name})", ", ".join(attendance.characters),
+                          str(attendance.dumps), str(attendance.current_with_twink))
+        self.console.print(table)
+
+        if result.unknown:
+            self.console.print(f"[yellow]Not in the DKP roster: {', '.join(result.unknown)}[/yellow]")
+        result.write(output)
+        self.console.print(f"[cyan]Details written to {output}[/cyan]")
+
+    def _handle_analyze(self, args: List[str]) -> None:
+        """
+        Show the distribution of a points metric over the mains, per class and per rank.
+
+        ``analyze [--by current|earned|spent|adjustment] [--visible]``
+        """
+        # NumPy is only needed here, so it is imported on first use
+        from core.analytics import TOP_FRACTION, analyze_standings
+
+        _, options = self._parse_options(args)
+        metric = options.get("by") or "current"
+        try:
+            with self.db_manager.get_session() as session:
+                report = analyze_standings(session, metric, visible_only="visible" in options)
+        except ValueError as e:
+            self.console.print(f"[red]{e}[/red]")
+            return
+        if not report.overall.mains:
+            self.console.print("[yellow]No characters in the database.[/yellow]")
+            return
+
+        overall = report.overall
+        self.console.print(
+            f"[cyan]{overall.mains} mains hold {overall.total:,.0f} {metric} points "
+            f"(mean {overall.mean:,.1f}, median {overall.median:,.1f}). "
+            f"The top {TOP_FRACTION:.0%} ({report.top_count} mains) hold {report.top_share:.1%}.[/cyan]"
+        )
+        for title, groups in ((f"{metric.title()} Points by Class", report.classes),
+                              (f"{metric.title()} Points by Rank", report.ranks),
+                              ("Inactive Mains Holding Points", [report.inactive] if report.inactive else [])):
+            self.console.print(self._stats_table(title, groups))
+
+        if report.inactive_holders:
+            table = Table(title="Inactive Mains with the Most Points")
+            table.add_column("Name", style="cyan")
+            table.add_column("Class", style="green")
+            table.add_column("Rank", style="blue")
+            table.add_column(f"{metric.title()} Points", justify="right", style="red")
+            for holder in report.inactive_holders:
+                table.add_row(holder.name, holder.class_name, holder.rank_name or "", f"{holder.points:,.0f}")
+            self.console.print(table)
+
+    @staticmethod
+    def _stats_table(title: str, groups: list) -> Table:
+        """Render ``GroupStats`` rows as a table."""
+        table = Table(title=title)
+        table.add_column("Group", style="cyan")
+        table.add_column("Mains", justify="right", style="magenta")
+        table.add_column("Total", justify="right", style="red")
+        table.add_column("Share", justify="right", style="red")
+        for column in ("Mean", "P25", "Median", "P75", "P90", "Max"):
+            table.add_column(column, justify="right", style="yellow")
+        for stats in groups:
+            table.add_row(stats.name, str(stats.mains), f"{stats.total:,.0f}", f"{stats.share:.1%}",
+                          *(f"{value:,.1f}" for value in (stats.mean, stats.p25, stats.median, stats.p75,
+                                                          stats.p90, stats.maximum)))
+        return table
+
+    def _handle_export(self, args: List[str]) -> None:
+        """
+        Write the standings to a file.
+
+        ``export [path] [--format csv|ndjson|parquet] [--columns a,b,...] [--class name] [--rank name]
+        [--active] [--visible] [--all]``; ``--all`` writes every character instead of one row per main.
+        """
+        positional, options = self._parse_options(args)
+        output_format = options.get("format") or "csv"
+        path = " ".join(positional) or default_export_path(output_format, self.export_file)
+        columns = [column.strip() for column in options["columns"].split(",")] if options.get("columns") else None
+        filters = LeaderboardFilter(
+            active=True if "active" in options else None,
+            hidden=False if "visible" in options else None,
+            class_name=options.get("class") or None,
+            rank_name=options.get("rank") or None,
+        )
+        try:
+            count = export_standings(path, output_format, columns, filters, mains_only="all" not in options,
+                                     db_manager=self.db_manager)
+        except (ValueError, ImportError, OSError) as e:
+            self.console.print(f"[red]Export failed: {e}[/red]")
+            return
+        self.console.print(f"[green]Exported {count} rows to {path}.[/green]")
+
+    def _read_pasted_lines(self) -> str:
+        """Read lines until an empty one, e.g. a pasted /rs tell dump."""
+        self.console.print("[cyan]Paste names or chat lines, then an empty line to finish:[/cyan]")
+        lines = []
+        while line := self.console.input():
+            lines.append(line)
+        return "\n".join(lines)
 
     def _handle_help(self, args: List[str] = None) -> None:
         """
@@ -197,8 +758,24 @@ class CLI:
         # Define the commands and their details
         commands = [
             ("character <name> or c <name>", "Display information about a specific character."),
+            ("character <name> <name> ...", "Display several characters at once."),
             ("top <number> or t <number>", "Display the top N characters by points."),
-            ("bid or b", "Enter bidding mode."),
+            ("top <number> --by <metric>", "Rank by current, earned, spent or adjustment points."),
+            ("top <number> --class <name> --rank <name>", "Only show one class and/or rank; add --active or --visible to filter further."),
+            ("top <number> --per class|rank", "Show the top N of every class or rank."),
+            ("top <number> --pool <name or id>", "Rank by the points of one DKP pool; also works for character, bid and follow."),
+            ("top next or t n", "Show the next page of the last top list."),
+            ("roster [name] or l [name]", "Page through every main with its alts; n/p move, a number or name jumps, q quits."),
+            ("bid or b", "Enter bidding mode; several names or 'paste' add many bidders at once."),
+            ("spent <name> [--own] or s <name>", "List the items a character and its alts bought; --own skips the alts."),
+            ("price <item> or p <item>", "Show how often items starting with the name sold and for how much."),
+            ("history <name> [--own] or hi <name>", "Show a character's points after every refresh that changed them."),
+            ("movers [N] or m [N]", "Show the N mains who earned the most; --by <metric> --from/--to YYYY-MM-DD pick what and when."),
+            ("follow <log> or f <log>", "Start a bid and add everyone who bids in an EverQuest log; Ctrl+C ends it."),
+            ("import <dump or dir> [--out file] or i", "Resolve RaidRoster dumps to mains; writes CSV, or JSON for a .json file."),
+            ("analyze [--by <metric>] or a", "Show the points distribution per class and rank, the share of the top 10% and inactive mains holding points."),
+            ("export <file> or x <file>", "Write the standings to CSV (default processed_data.csv); --format ndjson|parquet, --columns a,b, top's filters, --all for alts too."),
+            ("refresh or r", "Fetch fresh data in the background; commands keep working meanwhile."),
             ("exit or e", "Exit the application.")
         ]
 
@@ -214,6 +791,16 @@ class CLI:
         # Print the table to the console
         self.console.print(table)
 
+    def _handle_refresh(self, args: List[str]) -> None:
+        """Start a background refresh of the feeds."""
+        if self.refresher is None:
+            self.console.print("[yellow]Offline: refreshing is disabled.[/yellow]")
+        elif self.refresher.busy:
+            self.console.print("[yellow]A refresh is already running.[/yellow]")
+        else:
+            self.refresher.trigger()
+            self.console.print("[cyan]Refreshing in the background; results appear before the next prompt.[/cyan]")
+
     def _handle_exit(self, args: List[str] = None) -> None:
         """
         Handle exit command.
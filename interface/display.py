@@ -1,17 +1,24 @@
 """
 Display management module for rendering data in the terminal.
 """
-
-import pandas as pd
+from typing import TYPE_CHECKING, Optional
+from rich.prompt import Prompt
 from rich.table import Table
 from rich.console import Console
 from utils.logger import get_logger
 from utils.character_utils import find_character
 from core.database import DatabaseManager
-from core.models import Character
+from core.read_model import RosterCursor, RosterPage
+
+# Only the annotations use pandas, which is slow to import (see tests/test_startup.py)
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = get_logger(__name__)
 
+# Mains shown per page of the full roster
+ROSTER_PAGE_SIZE = 25
+
 class DisplayManager:
     """Handles formatting and displaying data in the terminal."""
     
@@ -20,16 +27,56 @@ class DisplayManager:
         self.console = Console()
         self.db_manager = DatabaseManager()
 
-    def display_data(self) -> None:
-        session = self.db_manager.get_session()
-        characters = session.query(Character).all()
-        table = self._create_table("Aggregated DKP Points")
-        
-        for char in characters:
-            table.add_row(str(char.id), char.name, ', '.join(alt.name for alt in char.alts), str(char.current_with_twink))
-        
+    def display_data(self, start: Optional[str] = None, page_size: int = ROSTER_PAGE_SIZE) -> None:
+        """
+        Page through every main with its alts and points, in name order.
+
+        Only the visible page is queried and rendered. Between pages, Enter or
+        ``n`` shows the next page, ``p`` the previous one, any other text jumps
+        to the page starting with that main or alt's group, and ``q`` quits.
+
+        Args:
+            start: Name of a main or alt whose page is shown first.
+            page_size: Mains per page.
+        """
+        after, before = (self._find_cursor(start), None) if start else (None, None)
+        while True:
+            roster = self.display_page(page_size, after, before)
+            if roster.next_cursor is None and roster.previous_cursor is None:
+                return
+            command = Prompt.ask("[bold cyan]Enter/'n' next, 'p' previous, a name to jump, "
+                                 "'q' to quit[/bold cyan]", default="n", show_default=False).strip()
+            if command.lower() in ('q', 'quit', 'exit', 'e'):
+                return
+            elif command.lower() in ('n', 'next'):
+                if roster.next_cursor is not None:
+                    after, before = roster.next_cursor, None
+            elif command.lower() in ('p', 'prev', 'previous'):
+                if roster.previous_cursor is not None:
+                    after, before = None, roster.previous_cursor
+            else:
+                cursor = self._find_cursor(command)
+                if cursor is not None:
+                    after, before = cursor, None
+
+    def display_page(self, page_size: int = ROSTER_PAGE_SIZE, after: Optional[RosterCursor] = None,
+                     before: Optional[RosterCursor] = None) -> RosterPage:
+        """Query and print one roster page, as selected by ``DatabaseManager.get_roster_page``."""
+        roster = self.db_manager.get_roster_page(page_size, after, before)
+        span = f"{roster.entries[0].name} to {roster.entries[-1].name}, " if roster.entries else ""
+        table = self._create_table(f"Aggregated DKP Points - {span}{roster.total} mains")
+        for card in roster.entries:
+            table.add_row(str(card.main_id), card.name, ', '.join(alt.name for alt in card.alts),
+                          str(card.current_with_twink), str(card.earned_with_twink))
         self.console.print(table)
-        logger.info("Data display completed successfully")
+        return roster
+
+    def _find_cursor(self, name: str) -> Optional[RosterCursor]:
+        """Cursor of the page starting with ``name``'s alt group, or None (with a message) if there is none."""
+        cursor = self.db_manager.find_roster_cursor(name)
+        if cursor is None:
+            self.console.print(f"[bold red]Character '{name}' not found![/bold red]")
+        return cursor
 
     def _create_table(self, title: str) -> Table:
         """Create a formatted Rich table with standard columns."""
@@ -41,7 +88,7 @@ class DisplayManager:
         table.add_column("MMBz (L)", justify="right", style="yellow")
         return table
 
-    def _display_character(self, data: pd.DataFrame, character_name: str, table: Table) -> None:
+    def _display_character(self, data: 'pd.DataFrame', character_name: str, table: Table) -> None:
         """
         Display data for a specific character.
         
@@ -70,14 +117,14 @@ class DisplayManager:
             logger.error(f"Error displaying character data: {e}")
             self.console.print(f"[bold red]Error displaying character data: {e}[/bold red]")
 
-    def _display_top(self, data: pd.DataFrame, count: int, table: Table) -> None:
+    def _display_top(self, data: 'pd.DataFrame', count: int, table: Table) -> None:
         """Display top N characters by current DKP."""
         top_rows = data.nlargest(count, 'points_current')
         for _, row in top_rows.iterrows():
             self._add_row_to_table(table, row)
         logger.info(f"Displayed top {count} characters")
 
-    def _add_row_to_table(self, table: Table, row: pd.Series) -> None:
+    def _add_row_to_table(self, table: Table, row: 'pd.Series') -> None:
         """Add a row of data to the table."""
         table.add_row(
             str(row['id']),
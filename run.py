@@ -9,14 +9,24 @@ import argparse
 # Add the project root directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.main import main
+from app.commands import add_subcommands, run_command
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='EQDKP Parser Application')
     parser.add_argument('--debug', action='store_true', help='Enable debug output')
+    parser.add_argument('--offline', action='store_true', help='Start from the local database without fetching')
+    parser.add_argument('--no-banner', dest='banner', action='store_false', default=None,
+                        help='Skip the startup banner')
+    add_subcommands(parser)
     return parser.parse_args()
 
 if __name__ == "__main__":
     args = parse_args()
-    main(debug=args.debug) 
\ No newline at end of file
+    if args.command:
+        os.environ['DEBUG_MODE'] = 'true' if args.debug else 'false'
+        sys.exit(run_command(args))
+
+    # No subcommand: fetch and start the interactive CLI
+    from app.main import main
+    main(debug=args.debug, offline=args.offline, show_banner=args.banner) 
\ No newline at end of file
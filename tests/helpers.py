@@ -0,0 +1,64 @@
+"""
+Builders for the characters rows and points feeds the tests load.
+"""
+
+
+def make_row(character_id, name, current=0.0, main_id=None):
+    """Build a characters row dictionary as produced by the parser."""
+    return {
+        'id': character_id,
+        'name': name,
+        'class_id': 1,
+        'class_name': 'Enchanter',
+        'active': True,
+        'hidden': False,
+        'main_id': main_id if main_id is not None else character_id,
+        'main_name': name,
+        'current': current,
+        'current_with_twink': current,
+        'earned': current,
+        'earned_with_twink': current,
+        'spent': 0.0,
+        'spent_with_twink': 0.0,
+        'adjustment': 0.0,
+        'adjustment_with_twink': 0.0,
+    }
+
+
+def element(tag, *children, **fields):
+    """Build ``<tag>`` holding the given child elements and one ``<field>value</field>`` per keyword."""
+    body = ''.join(f"<{name}>{value}</{name}>" for name, value in fields.items()) + ''.join(children)
+    return f"<{tag}>{body}</{tag}>"
+
+
+def points(pool_id=1, **values):
+    """Build a ``<multidkp_points>`` block, e.g. ``points(1, points_current=10)``."""
+    return element('multidkp_points', multidkp_id=pool_id, **values)
+
+
+def player(player_id, name, main_id=None, *blocks, **fields):
+    """
+    Build a ``<player>``; its own main unless ``main_id`` is given.
+
+    Args:
+        blocks: ``points(...)`` blocks for its ``<points>``.
+        fields: Further child elements, e.g. ``class_name='Cleric'`` or ``items=item(...)``.
+    """
+    children = (element('points', *blocks),) if blocks else ()
+    return element('player', *children, id=player_id, name=name,
+                   main_id=main_id if main_id is not None else player_id, **fields)
+
+
+def item(name, value, date, pool=1):
+    """Build an ``<item>`` bought on ``date``, which doubles as its game id."""
+    return element('item', name=name, game_id=date, value=value, date=date, itempool_id=pool)
+
+
+def make_feed(timestamp, *players, pools='', itempools=''):
+    """Build a points feed at ``timestamp`` with the given players and pool definitions."""
+    sections = element('players', *players)
+    if pools:
+        sections += element('multidkp_pools', pools)
+    if itempools:
+        sections += element('itempools', itempools)
+    return element('response', element('info', timestamp=timestamp), sections).encode()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from core.analytics import analyze_standings, group_stats
+from core.database import DatabaseManager
+from tests.helpers import make_row
+
+
+def make_main(character_id, name, current, class_name, rank_name=None, active=True):
+    return {**make_row(character_id, name, current=current), 'class_name': class_name, 'rank_name': rank_name,
+            'active': active}
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        """Load mains of two classes, one of them inactive, into an in-memory database."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=False)
+        self.db_manager.bulk_upsert_characters([
+            make_main(1, 'Dainae', 100.0, 'Enchanter', 'Officer'),
+            make_main(2, 'Forpor', 20.0, 'Shaman', 'Member'),
+            make_main(3, 'Kitten', 50.0, 'Shaman', 'Member', active=False),
+            make_main(4, 'Bolrak', 30.0, 'Shaman', active=False),
+            make_row(5, 'Tinkle', current=100.0, main_id=1),
+        ])
+
+    def test_group_stats_match_numpy(self):
+        """Test the per-group percentiles equal np.percentile on each group."""
+        rng = np.random.default_rng(1)
+        keys = rng.choice(np.array(['a', 'b', 'c']), size=500)
+        values = rng.normal(100, 30, size=500)
+        for stats in group_stats(keys, values, float(values.sum())):
+            group = values[keys == stats.name]
+            self.assertEqual(stats.mains, len(group))
+            self.assertAlmostEqual(stats.total, group.sum())
+            np.testing.assert_allclose([stats.p25, stats.median, stats.p75, stats.p90, stats.maximum],
+                                       [*np.percentile(group, [25, 50, 75, 90]), group.max()])
+
+    def test_report(self):
+        """Test the overall, per class, top 10% and inactive aggregates over mains only."""
+        with self.db_manager.get_session() as session:
+            report = analyze_standings(session)
+        self.assertEqual((report.overall.mains, report.overall.total), (4, 200.0))
+        self.assertEqual((report.top_count, report.top_share), (1, 0.5))
+        self.assertEqual([(c.name, c.mains, c.share) for c in report.classes],
+                         [('Enchanter', 1, 0.5), ('Shaman', 3, 0.5)])
+        self.assertEqual([r.name for r in report.ranks], ['Officer', 'Member', 'No rank'])
+        self.assertEqual((report.inactive.mains, report.inactive.total), (2, 80.0))
+        self.assertEqual([h.name for h in report.inactive_holders], ['Kitten', 'Bolrak'])
+        self.assertEqual([r['group_by'] for r in report.records()].count('class'), 2)
+
+    def test_empty_database_and_unknown_metric(self):
+        """Test an empty roster gives an empty report and an unknown metric is rejected."""
+        with DatabaseManager('sqlite:///:memory:', use_read_model=False).get_session() as session:
+            report = analyze_standings(session)
+            self.assertEqual((report.overall.mains, report.classes, report.inactive), (0, [], None))
+            with self.assertRaises(ValueError):
+                analyze_standings(session, 'points')
@@ -0,0 +1,54 @@
+import io
+import unittest
+from rich.console import Console
+from core.bidding_manager import BiddingManager, parse_names
+from core.database import DatabaseManager
+from tests.helpers import make_row
+
+
+class TestParseNames(unittest.TestCase):
+    def test_plain_lists_and_chat_lines(self):
+        """Test names are taken from lists and from the speaker of chat lines, without duplicates."""
+        text = ("Dainae, Forpor  kitten\n"
+                "[Mon Oct 16 20:01:02 2026] Bolrak tells the raid, 'Dainae bids'\n"
+                "KITTEN says, 'hi'")
+        self.assertEqual(parse_names(text), ['Dainae', 'Forpor', 'kitten', 'Bolrak'])
+
+
+class TestBiddingManager(unittest.TestCase):
+    def setUp(self):
+        """Set up a bidding manager over an in-memory roster."""
+        self.manager = BiddingManager()
+        self.manager.db_manager = DatabaseManager('sqlite:///:memory:')
+        self.manager.db_manager.bulk_upsert_characters([
+            make_row(1, 'Dainae', current=40.0),
+            make_row(2, 'Forpor', current=40.0, main_id=1),
+            make_row(3, 'Kitten', current=75.0),
+            make_row(4, 'Bolrak', current=12.0),
+        ])
+        self.manager.console = Console(file=io.StringIO())
+        self.manager.start_bid()
+
+    def test_batch_add_orders_by_points(self):
+        """Test a batch add keeps participants sorted by points."""
+        added = self.manager.add_characters(['Bolrak', 'dainae', 'Kitten', 'Nobody'])
+        self.assertEqual(added, 3)
+        self.assertEqual([p.name for p in self.manager.current_bid], ['Kitten', 'Dainae', 'Bolrak'])
+
+    def test_alts_of_a_bidding_main_are_rejected(self):
+        """Test that a main can only bid once, whichever of its characters is entered."""
+        self.manager.add_character('Forpor')
+        self.assertEqual(self.manager.add_characters(['Dainae', 'Forpor']), 0)
+        self.assertEqual(len(self.manager.current_bid), 1)
+        self.assertEqual(self.manager.current_bid[0].main_id, 1)
+
+    def test_end_bid_announces_winner_and_resets(self):
+        """Test that ending the bid names the highest bidder and clears the session."""
+        self.manager.add_characters(['Bolrak', 'Kitten'])
+        self.manager.end_bid()
+        self.assertIn('Winner: Kitten', self.manager.console.file.getvalue())
+        self.assertEqual(self.manager.current_bid, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import json
+import unittest
+from argparse import Namespace
+from unittest.mock import patch
+from app.commands import alt_group, query_characters, run_command, top_characters, write_records
+from core.database import DatabaseManager
+from core.read_model import LeaderboardFilter
+from tests.helpers import make_row
+
+
+class TestBatchCommands(unittest.TestCase):
+    def setUp(self):
+        """Load a small roster into an in-memory database."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=False)
+        self.db_manager.bulk_upsert_characters([
+            make_row(1, 'Dainae', current=40.0),
+            make_row(2, 'Forpor', current=40.0, main_id=1),
+            make_row(3, 'Kitten', current=75.0),
+        ])
+
+    def test_query_returns_cards_in_input_order(self):
+        """Test query output follows the input order, skips unknown names and collapses repeats."""
+        records = query_characters(self.db_manager, ['kitten', 'Nobody', 'FORPOR', 'Kitten'])
+        self.assertEqual([record['name'] for record in records], ['Kitten', 'Forpor'])
+        self.assertEqual(records[1]['alts'], ['Dainae'])
+        self.assertEqual(records[1]['main_name'], 'Dainae')
+
+    def test_top_and_alts(self):
+        """Test top lists mains with positions and alts lists the whole group."""
+        records = top_characters(self.db_manager, 5, 'current', LeaderboardFilter())
+        self.assertEqual([(r['position'], r['name']) for r in records], [(1, 'Kitten'), (2, 'Dainae')])
+        self.assertEqual([r['name'] for r in alt_group(self.db_manager, 'forpor')], ['Dainae', 'Forpor'])
+        self.assertEqual(alt_group(self.db_manager, 'Nobody'), [])
+
+    def test_output_formats(self):
+        """Test JSON, NDJSON and CSV rendering of the same records."""
+        records = query_characters(self.db_manager, ['Dainae'])
+        out = io.StringIO()
+        write_records(records, 'json', out)
+        self.assertEqual(json.loads(out.getvalue())[0]['alts'], ['Forpor'])
+
+        out = io.StringIO()
+        write_records(records * 2, 'ndjson', out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        out = io.StringIO()
+        write_records(records, 'csv', out)
+        header, row = out.getvalue().splitlines()
+        self.assertTrue(header.startswith('id,name,'))
+        self.assertTrue(row.endswith(',Forpor'))
+
+    @patch('builtins.input')
+    @patch('app.config.load_dotenv')
+    @patch.dict('os.environ', {}, clear=True)
+    def test_refresh_without_api_key_fails_without_prompting(self, mock_load_dotenv, mock_input):
+        """Test a batch refresh exits with 1 instead of asking for the API key."""
+        with patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            self.assertEqual(run_command(Namespace(command='refresh', format='json')), 1)
+        mock_input.assert_not_called()
+        self.assertIn('API_KEY is not set', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import io
+import os
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 import requests
 from core.data_fetcher import DataFetcher
+from core.http_cache import ResponseCache
 
 class TestDataFetcher(unittest.TestCase):
     """Test suite for DataFetcher class."""
@@ -11,12 +15,13 @@ class TestDataFetcher(unittest.TestCase):
         self.fetcher = DataFetcher()
         self.api_token = "test_token"
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_character_data_success(self, mock_get):
         """Test successful character data fetching."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.text = "<xml>test data</xml>"
+        mock_response.content = b"<xml>test data</xml>"
+        mock_response.headers = {}
         mock_get.return_value = mock_response
 
         with patch('builtins.open', unittest.mock.mock_open()) as mock_file:
@@ -24,7 +29,7 @@ class TestDataFetcher(unittest.TestCase):
             self.assertIsNotNone(result)
             mock_file.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_character_data_api_error(self, mock_get):
         """Test handling of API error response for character data."""
         mock_response = Mock()
@@ -34,25 +39,26 @@ class TestDataFetcher(unittest.TestCase):
         result = self.fetcher.fetch_character_data(self.api_token)
         self.assertIsNone(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_character_data_network_error(self, mock_get):
         """Test handling of network error for character data."""
         mock_get.side_effect = requests.exceptions.RequestException("Network error")
         result = self.fetcher.fetch_character_data(self.api_token)
         self.assertIsNone(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_ranks_data_success(self, mock_get):
         """Test successful ranks data fetching."""
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.text = "<xml>test data</xml>"
+        mock_response.content = b"<xml>test data</xml>"
+        mock_response.headers = {}
         mock_get.return_value = mock_response
 
         result = self.fetcher.fetch_ranks_data(self.api_token)
         self.assertIsNotNone(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_ranks_data_api_error(self, mock_get):
         """Test handling of API error response for ranks data."""
         mock_response = Mock()
@@ -62,9 +68,106 @@ class TestDataFetcher(unittest.TestCase):
         result = self.fetcher.fetch_ranks_data(self.api_token)
         self.assertIsNone(result)
 
-    @patch('requests.get')
+    @patch('requests.Session.request')
     def test_fetch_ranks_data_network_error(self, mock_get):
         """Test handling of network error for ranks data."""
         mock_get.side_effect = requests.exceptions.RequestException("Network error")
         result = self.fetcher.fetch_ranks_data(self.api_token)
-        self.assertIsNone(result) 
\ No newline at end of file
+        self.assertIsNone(result)
+
+
+class TestDataFetcherCache(unittest.TestCase):
+    """Test suite for DataFetcher with an on-disk response cache."""
+
+    def setUp(self):
+        """Set up a fetcher backed by a temporary cache directory."""
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.cache_dir.name, ttl=300)
+        self.fetcher = DataFetcher(cache=self.cache)
+        self.api_token = "test_token"
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        self.cache_dir.cleanup()
+
+    def _response(self, status_code, content=b"", headers=None):
+        mock_response = Mock()
+        mock_response.status_code = status_code
+        mock_response.content = content
+        mock_response.headers = headers or {}
+        return mock_response
+
+    @patch('requests.Session.request')
+    def test_fresh_cache_skips_network(self, mock_get):
+        """Test that a fresh cached body is served without a request."""
+        mock_get.return_value = self._response(200, b"<ranks/>", {'ETag': '"v1"'})
+
+        self.assertEqual(self.fetcher.fetch_ranks_data(self.api_token), "<ranks/>")
+        self.assertEqual(self.fetcher.fetch_ranks_data(self.api_token), "<ranks/>")
+
+        mock_get.assert_called_once()
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    @patch('requests.Session.request')
+    def test_stale_cache_revalidates_with_etag(self, mock_get):
+        """Test that a stale entry is revalidated and reused on 304 Not Modified."""
+        self.cache.ttl = 0
+        mock_get.return_value = self._response(200, b"<ranks/>", {'ETag': '"v1"'})
+        self.fetcher.fetch_ranks_data(self.api_token)
+
+        mock_get.return_value = self._response(304)
+        result = self.fetcher.fetch_ranks_data(self.api_token)
+
+        self.assertEqual(result, "<ranks/>")
+        self.assertEqual(mock_get.call_args.kwargs['headers']['If-None-Match'], '"v1"')
+        self.assertEqual(self.cache.stats.revalidated, 1)
+
+    @patch('requests.Session.request')
+    def test_stream_ranks_data_fills_cache(self, mock_get):
+        """Test that a streamed body is cached once it has been consumed."""
+        mock_response = self._response(200, headers={'ETag': '"v2"'})
+        mock_response.raw = Mock(wraps=io.BytesIO(b"<response><characters/></response>"))
+        mock_get.return_value = mock_response
+
+        with self.fetcher.stream_ranks_data(self.api_token) as stream:
+            self.assertEqual(stream.read(10), b"<response>")
+
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args.kwargs['stream'])
+        entry = self.cache.get(self.fetcher._cache_key('character_ranks', self.api_token))
+        self.assertEqual(entry.body, b"<response><characters/></response>")
+        self.assertEqual(entry.etag, '"v2"')
+
+    @patch('requests.Session.request')
+    def test_closed_stream_is_not_drained(self, mock_get):
+        """Test that closing the stream stops the download and keeps the existing cache entry."""
+        key = self.fetcher._cache_key('character_ranks', self.api_token)
+        self.cache.store(key, b"<response/>", '"v1"')
+        mock_response = self._response(200, headers={'ETag': '"v2"'})
+        mock_response.raw = Mock(wraps=io.BytesIO(b"<response><characters/></response>"))
+        mock_get.return_value = mock_response
+
+        with patch.object(self.cache, 'is_fresh', return_value=False):
+            with self.fetcher.stream_ranks_data(self.api_token) as stream:
+                stream.read(10)
+                stream.close()
+
+        self.assertEqual(mock_response.raw.read.call_count, 1)
+        self.assertEqual(self.cache.get(key).body, b"<response/>")
+        self.assertFalse([name for name in os.listdir(self.cache_dir.name) if name.endswith('.tmp')])
+
+    @patch('requests.Session.request')
+    def test_failed_parse_removes_temp_file(self, mock_get):
+        """Test that a consumer error leaves no cache entry or temporary file behind."""
+        mock_response = self._response(200)
+        mock_response.raw = Mock(wraps=io.BytesIO(b"<response><characters/></response>"))
+        mock_get.return_value = mock_response
+
+        with self.assertRaises(ValueError):
+            with self.fetcher.stream_ranks_data(self.api_token) as stream:
+                stream.read(10)
+                raise ValueError("bad feed")
+
+        self.assertIsNone(self.cache.get(self.fetcher._cache_key('character_ranks', self.api_token)))
+        self.assertEqual(os.listdir(self.cache_dir.name), [])
@@ -1,8 +1,13 @@
+import io
+import os
 import unittest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from core.models import Base, Character
 from core.data_parser import DataParser
+from tests.helpers import make_feed, player, points
+
+SAMPLE_DATA = os.path.join(os.path.dirname(__file__), 'sample_data.xml')
 
 class TestDataParser(unittest.TestCase):
     def setUp(self):
@@ -71,5 +76,89 @@ class TestDataParser(unittest.TestCase):
         self.assertEqual(character.earned, 3315.0)
         self.assertEqual(character.spent, 3553.0)
 
+    def test_iter_players_streams_sample_feed(self):
+        """Test streaming every player out of the sample feed."""
+        rows = list(self.data_parser.iter_players(SAMPLE_DATA))
+        self.assertEqual(len(rows), 3616)
+
+        first = rows[0]
+        self.assertEqual(first['id'], 92)
+        self.assertEqual(first['name'], 'Aaaachoo')
+        self.assertFalse(first['active'])
+        self.assertEqual(first['main_id'], 3422)
+        self.assertEqual(first['main_name'], 'Forpor')
+        self.assertEqual(first['class_name'], 'Monk')
+        self.assertEqual(first['current'], 4.0)
+        self.assertEqual(first['current_with_twink'], 36.0)
+        self.assertEqual(first['spent_with_twink'], 338.0)
+        self.assertEqual(first['adjustment_with_twink'], 18.0)
+
+    def test_iter_players_defaults_missing_fields(self):
+        """Test that missing player fields fall back to defaults."""
+        xml_data = b"<response><players><player><id>7</id><name>Solo</name></player></players></response>"
+        rows = list(self.data_parser.iter_players(io.BytesIO(xml_data)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['class_name'], 'Unknown')
+        self.assertIsNone(rows[0]['main_id'])
+        self.assertEqual(rows[0]['current_with_twink'], 0.0)
+
+    def test_parse_character_rank_data(self):
+        """Test applying a rank feed, including a character missing from the database."""
+        xml_data = """<response><characters>
+                        <character>
+                            <character_id>56</character_id>
+                            <character_name>Dainae</character_name>
+                            <rank_id>3</rank_id>
+                            <rank_name>Officer</rank_name>
+                        </character>
+                        <character>
+                            <character_id>999</character_id>
+                            <character_name>Ghost</character_name>
+                            <rank_id>1</rank_id>
+                            <rank_name>Member</rank_name>
+                        </character>
+                      </characters></response>"""
+        with self.assertLogs('core.data_parser', level='WARNING') as logs:
+            self.data_parser.parse_character_rank_data(xml_data)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('Ghost (999)', logs.output[0])
+
+        self.session.expire_all()
+        character = self.session.get(Character, 56)
+        self.assertEqual(character.rank_id, 3)
+        self.assertEqual(character.rank_name, 'Officer')
+
+    def _feed(self, timestamp, players):
+        """Build a minimal points feed from (id, name, current) tuples."""
+        return make_feed(timestamp, *(player(pid, name, pid, points(points_current=current))
+                                      for pid, name, current in players)).decode()
+
+    def test_incremental_sync_skips_unchanged_feed(self):
+        """Test that a feed with an already synced timestamp is not ingested again."""
+        first = self.data_parser.parse_character_stream(SAMPLE_DATA, incremental=True)
+        self.assertFalse(first.skipped)
+        self.assertEqual(first.feed_timestamp, '1734443553')
+        self.assertEqual(first.inserted + first.updated, 3616)
+
+        second = self.data_parser.parse_character_stream(SAMPLE_DATA, incremental=True)
+        self.assertTrue(second.skipped)
+        self.assertEqual(second.inserted + second.updated + second.removed, 0)
+
+    def test_incremental_sync_writes_only_changed_rows(self):
+        """Test that only new or changed players are written and departed ones removed."""
+        self.data_parser.parse_character_data(
+            self._feed(1, [(56, 'Dainae', 297), (57, 'Bolt', 10), (58, 'Gone', 5)]), incremental=True
+        )
+        result = self.data_parser.parse_character_data(
+            self._feed(2, [(56, 'Dainae', 297), (57, 'Bolt', 25), (59, 'Fresh', 1)]), incremental=True
+        )
+
+        self.assertEqual((result.inserted, result.updated, result.unchanged, result.removed), (1, 1, 1, 1))
+        self.session.expire_all()
+        self.assertEqual(self.session.get(Character, 57).current, 25.0)
+        self.assertIsNone(self.session.get(Character, 58))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
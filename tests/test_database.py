@@ -0,0 +1,346 @@
+import copy
+import os
+import tempfile
+import threading
+import time
+import unittest
+from sqlalchemy import event, select, text
+from core.database import DatabaseManager, batched
+from core.models import AltGroup, Base, Character
+from core.read_model import LeaderboardFilter
+from tests.helpers import make_row
+
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        """Set up an in-memory database for each test."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:')
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        Base.metadata.drop_all(self.db_manager.engine)
+
+    def test_bulk_upsert_inserts_rows(self):
+        """Test inserting new characters in several batches."""
+        rows = [make_row(i, f"Char{i}", current=float(i)) for i in range(1, 26)]
+        written = self.db_manager.bulk_upsert_characters(rows, batch_size=10)
+
+        self.assertEqual(written, 25)
+        session = self.db_manager.get_session()
+        self.assertEqual(session.query(Character).count(), 25)
+        self.assertEqual(session.get(Character, 7).current, 7.0)
+        session.close()
+
+    def test_bulk_upsert_updates_existing_rows(self):
+        """Test that upserting an existing id updates it and keeps its rank."""
+        self.db_manager.bulk_upsert_characters([make_row(56, 'Dainae', current=297.0)])
+        session = self.db_manager.get_session()
+        character = session.get(Character, 56)
+        character.rank_id = 3
+        character.rank_name = 'Officer'
+        session.commit()
+        session.close()
+
+        self.db_manager.bulk_upsert_characters([make_row(56, 'Dainae', current=350.0)])
+
+        session = self.db_manager.get_session()
+        character = session.get(Character, 56)
+        self.assertEqual(session.query(Character).count(), 1)
+        self.assertEqual(character.current, 350.0)
+        self.assertEqual(character.rank_name, 'Officer')
+        session.close()
+
+    def test_bulk_upsert_leaves_rows_untouched(self):
+        """Test the caller's rows, including their child lists, are not modified by an upsert."""
+        row = make_row(1, 'Forpor', current=50.0)
+        row['items'] = [{'name': 'Cloak', 'name_lower': 'cloak', 'game_id': None, 'value': 10.0,
+                         'itempool_id': None, 'event_id': None, 'timestamp': None}]
+        row['adjustments'] = []
+        original = copy.deepcopy(row)
+
+        self.db_manager.bulk_upsert_characters([row])
+        self.assertEqual(row, original)
+        self.assertEqual(len(self.db_manager.get_purchases('Forpor')), 1)
+
+    def test_read_model_serves_lookups(self):
+        """Test case-insensitive lookups, alt groups and top-N from the read model."""
+        self.db_manager.bulk_upsert_characters([
+            make_row(1, 'Forpor', current=50.0),
+            make_row(2, 'Aaaachoo', current=50.0, main_id=1),
+            make_row(3, 'Dainae', current=80.0),
+        ])
+
+        self.assertEqual(self.db_manager.get_character_by_name('fORPOR').id, 1)
+        self.assertEqual([c.name for c in self.db_manager.get_all_characters('aaaachoo')], ['Aaaachoo', 'Forpor'])
+        self.assertEqual([c.name for c in self.db_manager.get_top_characters_by_points(5)], ['Dainae', 'Forpor'])
+
+    def test_read_model_is_rebuilt_after_writes(self):
+        """Test that an ingest makes the next read see the new data."""
+        self.db_manager.bulk_upsert_characters([make_row(1, 'Forpor', current=50.0)])
+        model = self.db_manager.read_model
+        self.assertIs(self.db_manager.read_model, model)
+
+        self.db_manager.bulk_upsert_characters([make_row(1, 'Forpor', current=75.0)])
+        self.assertIsNot(self.db_manager.read_model, model)
+        self.assertEqual(self.db_manager.get_character_by_name('Forpor').current, 75.0)
+
+    def test_read_model_is_complete_when_swapped_in(self):
+        """Test class filters need no lazy build and concurrent pool loads run once."""
+        self.db_manager.bulk_upsert_characters([make_row(1, 'Forpor', current=50.0)])
+        model = self.db_manager.read_model
+        rankings = dict(model._rankings)
+        self.assertEqual([r.name for r in model.leaderboard(filters=LeaderboardFilter(class_name='enchanter')).entries],
+                         ['Forpor'])
+        self.assertEqual(model._rankings, rankings)
+
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.05)
+            return object()
+
+        threads = [threading.Thread(target=model.pool_standings, args=(1, load)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(loads), 1)
+
+    def test_database_path_matches_read_model(self):
+        """Test that lookups without the read model query the database directly."""
+        self.db_manager.bulk_upsert_characters([make_row(1, 'Forpor', current=50.0)])
+        self.db_manager.use_read_model = False
+        self.assertEqual(self.db_manager.get_character_by_name('forpor').id, 1)
+        self.assertEqual(len(self.db_manager.get_top_characters_by_points(5)), 1)
+
+    def test_batched_rejects_invalid_size(self):
+        """Test that a batch size below one is rejected."""
+        with self.assertRaises(ValueError):
+            list(batched([{}], 0))
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        """Load the same roster into a read-model manager and a SQL-only manager."""
+        rows = []
+        for n in range(1, 31):
+            row = make_row(n, f"Char{n:02d}", current=float(n % 7), main_id=n if n % 5 else n - 1)
+            row['class_name'] = 'Cleric' if n % 2 else 'Warrior'
+            row['earned_with_twink'] = float(100 - n)
+            row['active'] = n % 3 != 0
+            rows.append(row)
+
+        self.managers = []
+        for use_read_model in (True, False):
+            db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=use_read_model)
+            db_manager.bulk_upsert_characters(rows)
+            self.managers.append(db_manager)
+
+    def names(self, entries):
+        return [entry.name for entry in entries]
+
+    def test_is_main_is_materialized(self):
+        """Test that is_main follows main_id on insert and update."""
+        db_manager = self.managers[1]
+        db_manager.bulk_upsert_characters([make_row(5, 'Char05', main_id=5)])
+        with db_manager.get_session() as session:
+            self.assertTrue(session.get(Character, 5).is_main)
+            self.assertFalse(session.get(Character, 10).is_main)
+
+    def test_metrics_filters_and_groups_match_across_backends(self):
+        """Test the read model and SQL leaderboards return identical results."""
+        results = []
+        for db_manager in self.managers:
+            results.append((
+                self.names(db_manager.get_leaderboard('current', 5).entries),
+                self.names(db_manager.get_leaderboard('earned', 3, LeaderboardFilter(class_name='cleric', active=True)).entries),
+                {group: self.names(entries) for group, entries in db_manager.get_leaderboard_groups('earned', 'class', 2).items()},
+            ))
+        self.assertEqual(results[0], results[1])
+
+        current, clerics, groups = results[0]
+        self.assertEqual(current[:2], ['Char06', 'Char13'])
+        self.assertEqual(clerics, ['Char01', 'Char07', 'Char11'])
+        self.assertEqual(groups, {'Cleric': ['Char01', 'Char03'], 'Warrior': ['Char02', 'Char04']})
+
+    def test_keyset_pagination_walks_every_main(self):
+        """Test that following cursors visits every main exactly once, in order."""
+        for db_manager in self.managers:
+            full = self.names(db_manager.get_leaderboard('current', 100).entries)
+            paged, cursor = [], None
+            while True:
+                page = db_manager.get_leaderboard('current', 4, after=cursor)
+                paged.extend(self.names(page.entries))
+                if page.next_cursor is None:
+                    break
+                cursor = page.next_cursor
+            self.assertEqual(paged, full)
+            self.assertEqual(len(full), 24)
+
+    def test_leaderboard_uses_index(self):
+        """Test that the SQL leaderboard is read in order off a metric index."""
+        query = DatabaseManager._leaderboard_query(Character.__table__.c.spent_with_twink, LeaderboardFilter())
+        with self.managers[1].engine.connect() as connection:
+            compiled = query.compile(connection, compile_kwargs={'literal_binds': True})
+            plan = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        details = ' '.join(row[-1] for row in plan)
+        self.assertIn('ix_characters_main_spent_with_twink', details)
+        self.assertNotIn('TEMP B-TREE', details)
+
+    def test_unknown_metric_is_rejected(self):
+        """Test that an unknown metric raises ValueError on both backends."""
+        for db_manager in self.managers:
+            with self.assertRaises(ValueError):
+                db_manager.get_leaderboard('dkp')
+
+
+class TestCharacterCards(unittest.TestCase):
+    def setUp(self):
+        """Load a main with two alts and a lone main into both backends."""
+        rows = [
+            make_row(1, 'Dainae', current=40.0),
+            make_row(2, 'Forpor', current=40.0, main_id=1),
+            make_row(3, 'Bolrak', current=40.0, main_id=1),
+            make_row(4, 'Kitten', current=12.0),
+        ]
+        self.managers = []
+        for use_read_model in (True, False):
+            db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=use_read_model)
+            db_manager.bulk_upsert_characters(rows)
+            self.managers.append(db_manager)
+
+    def test_cards_match_across_backends(self):
+        """Test the read model and the materialized groups produce the same cards."""
+        cards = [db_manager.get_character_cards(['FORPOR', 'kitten', 'Nobody']) for db_manager in self.managers]
+        self.assertEqual(cards[0], cards[1])
+
+        forpor = cards[1]['forpor']
+        self.assertEqual(forpor.main_name, 'Dainae')
+        self.assertEqual([alt.name for alt in forpor.alts], ['Bolrak', 'Dainae'])
+        self.assertEqual(forpor.current_with_twink, 40.0)
+        self.assertEqual(cards[1]['kitten'].alts, [])
+        self.assertNotIn('nobody', cards[1])
+
+    def test_cards_are_one_query(self):
+        """Test that a batch of cards costs a single SELECT in the SQL path."""
+        db_manager = self.managers[1]
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db_manager.engine, 'before_cursor_execute', listener)
+        try:
+            cards = db_manager.get_character_cards(['Dainae', 'Forpor', 'Bolrak', 'Kitten'])
+        finally:
+            event.remove(db_manager.engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(cards), 4)
+        self.assertEqual(len(statements), 1)
+
+    def test_groups_follow_writes(self):
+        """Test that rank updates, regrouping and deletes refresh the materialized groups."""
+        db_manager = self.managers[1]
+        db_manager.update_character_rank('Bolrak', 2, 'Officer')
+        db_manager.bulk_upsert_characters([make_row(3, 'Bolrak', current=12.0, main_id=4)])
+        db_manager.delete_characters([2])
+
+        cards = db_manager.get_character_cards(['Dainae', 'Kitten'])
+        self.assertEqual(cards['dainae'].alts, [])
+        self.assertEqual([(alt.name, alt.rank_name) for alt in cards['kitten'].alts], [('Bolrak', 'Officer')])
+        with db_manager.get_session() as session:
+            self.assertEqual(session.query(AltGroup).count(), 2)
+
+
+    def test_writes_only_rebuild_touched_groups(self):
+        """Test that a write refreshes the groups it touches and leaves the others alone."""
+        db_manager = self.managers[1]
+        with db_manager.session_scope() as session:
+            session.get(AltGroup, 4).member_count = 99  # marker: survives unless group 4 is rebuilt
+
+        db_manager.bulk_upsert_characters([make_row(2, 'Forpor', current=50.0, main_id=1)])
+        db_manager.bulk_update_ranks([{'id': 3, 'name': 'Bolrak', 'rank_id': 2, 'rank_name': 'Officer'}])
+        with db_manager.get_session() as session:
+            self.assertEqual(session.get(AltGroup, 4).member_count, 99)
+            self.assertIn('Officer', session.get(AltGroup, 1).members)
+
+        db_manager.bulk_upsert_characters([make_row(3, 'Bolrak', main_id=4)])
+        with db_manager.get_session() as session:
+            self.assertEqual(session.get(AltGroup, 4).member_count, 2)
+            self.assertEqual(session.get(AltGroup, 1).member_count, 2)
+
+
+class TestNameLookupScaling(unittest.TestCase):
+    ROWS = 100_000
+
+    def setUp(self):
+        """Fill an in-memory database with 100k characters."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=False)
+        with self.db_manager.engine.begin() as connection:
+            connection.execute(text(
+                "WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows) "
+                "INSERT INTO characters (id, name, name_lower, class_id, class_name, main_id, "
+                "current, earned, spent, current_with_twink, earned_with_twink, spent_with_twink, "
+                "adjustment, adjustment_with_twink) "
+                "SELECT n, 'Char' || n, lower('Char' || n), 1, 'Bard', n, n, n, 0, n, n, 0, 0, 0 FROM seq"
+            ), {'rows': self.ROWS})
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        Base.metadata.drop_all(self.db_manager.engine)
+
+    def test_name_lookup_uses_index(self):
+        """Test that name lookups are index seeks rather than table scans."""
+        query = select(Character).where(Character.name_lower == 'char5')
+        with self.db_manager.engine.connect() as connection:
+            plan = connection.execute(text(f"EXPLAIN QUERY PLAN {query.compile(compile_kwargs={'literal_binds': True})}")).all()
+        self.assertIn('USING INDEX ix_characters_name_lower', plan[0][-1])
+
+    def test_name_lookup_at_scale(self):
+        """Test case-insensitive lookups stay fast with 100k rows."""
+        started = time.perf_counter()
+        for n in range(1, self.ROWS, self.ROWS // 500):
+            character = self.db_manager.get_character_by_name(f"cHAR{n}")
+            self.assertEqual(character.id, n)
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+        self.assertEqual(len(self.db_manager.get_all_characters('CHAR42')), 1)
+        self.assertIsNone(self.db_manager.get_character_by_name('Nobody'))
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self):
+        """Point the managers at a temporary database file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_url = f"sqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}"
+
+    def tearDown(self):
+        """Dispose of the engine and remove the temporary directory."""
+        DatabaseManager(self.db_url).engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_managers_share_one_engine(self):
+        """Test that every manager for the same URL reuses one engine and session factory."""
+        first = DatabaseManager(self.db_url)
+        second = DatabaseManager(self.db_url)
+        self.assertIs(first.engine, second.engine)
+        self.assertIs(first.Session, second.Session)
+
+    def test_sqlite_connections_are_tuned(self):
+        """Test that WAL journaling and NORMAL synchronous mode are applied."""
+        with DatabaseManager(self.db_url).engine.connect() as connection:
+            self.assertEqual(connection.execute(text("PRAGMA journal_mode")).scalar(), 'wal')
+            self.assertEqual(connection.execute(text("PRAGMA synchronous")).scalar(), 1)
+
+    def test_session_scope_rolls_back_on_error(self):
+        """Test that a failing session scope leaves no partial writes behind."""
+        db_manager = DatabaseManager(self.db_url)
+        with self.assertRaises(RuntimeError):
+            with db_manager.session_scope() as session:
+                session.add(Character(id=1, name='Temp', class_id=1, class_name='Bard'))
+                session.flush()
+                raise RuntimeError("boom")
+
+        with db_manager.get_session() as session:
+            self.assertEqual(session.query(Character).count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import unittest
+from unittest.mock import patch
+from rich.console import Console
+from core.database import DatabaseManager
+from interface.display import DisplayManager
+from tests.helpers import make_row
+
+
+class TestRosterDisplay(unittest.TestCase):
+    def setUp(self):
+        """Load seven mains, one with two alts, and point a display at them."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=False)
+        self.db_manager.bulk_upsert_characters(
+            [make_row(i, name, current=float(i)) for i, name in
+             enumerate(['Dainae', 'Kitten', 'Bolrak', 'Alyx', 'Grimm', 'Elowen', 'Cyra'], start=1)]
+            + [make_row(8, 'Forpor', main_id=1), make_row(9, 'Zed', main_id=1)]
+        )
+        with patch('interface.display.DatabaseManager', return_value=self.db_manager):
+            self.display = DisplayManager()
+        self.output = io.StringIO()
+        self.display.console = Console(file=self.output, width=200)
+
+    def test_roster_pages(self):
+        """Test pages hold mains in name order with their alts and link to the pages on either side."""
+        first = self.db_manager.get_roster_page(3)
+        self.assertEqual(first.total, 7)
+        self.assertEqual([card.name for card in first.entries], ['Alyx', 'Bolrak', 'Cyra'])
+        self.assertIsNone(first.previous_cursor)
+        second = self.db_manager.get_roster_page(3, after=first.next_cursor)
+        dainae = second.entries[0]
+        self.assertEqual((dainae.name, [alt.name for alt in dainae.alts]), ('Dainae', ['Forpor', 'Zed']))
+        last = self.db_manager.get_roster_page(3, after=second.next_cursor)
+        self.assertEqual(([card.name for card in last.entries], last.next_cursor), (['Kitten'], None))
+        back = self.db_manager.get_roster_page(3, before=last.previous_cursor)
+        self.assertEqual([card.name for card in back.entries], [card.name for card in second.entries])
+
+    def test_find_roster_cursor(self):
+        """Test jumping starts a page at a main or at an alt's main, and paging back from it returns to the start."""
+        page = self.db_manager.get_roster_page(3, after=self.db_manager.find_roster_cursor('zed'))
+        self.assertEqual([card.name for card in page.entries], ['Dainae', 'Elowen', 'Grimm'])
+        back = self.db_manager.get_roster_page(3, before=page.previous_cursor)
+        self.assertEqual([card.name for card in back.entries], ['Alyx', 'Bolrak', 'Cyra'])
+        self.assertIsNone(self.db_manager.find_roster_cursor('Nobody'))
+
+    def test_roster_uses_index(self):
+        """Test a roster page is read through the index on the main name instead of sorting."""
+        with self.db_manager.engine.connect() as connection:
+            plan = ' '.join(row[-1] for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT main_id FROM alt_groups "
+                "WHERE main_name_lower > 'b' OR (main_name_lower = 'b' AND main_id > 2) "
+                "ORDER BY main_name_lower, main_id LIMIT 3"))
+        self.assertIn('ix_alt_groups_main_name_lower', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_display_navigation(self):
+        """Test next, previous and names move between pages until quit."""
+        with patch('interface.display.Prompt.ask', side_effect=['n', 'n', 'n', 'p', 'forpor', 'nobody', 'q']):
+            self.display.display_data(page_size=3)
+        pages = [line.split('Points - ')[1].split(',')[0] for line in self.output.getvalue().splitlines()
+                 if 'Points - ' in line]
+        self.assertEqual(pages, ['Alyx to Cyra', 'Dainae to Grimm', 'Kitten to Kitten', 'Kitten to Kitten',
+                                 'Dainae to Grimm', 'Dainae to Grimm', 'Dainae to Grimm'])
+        self.assertIn("Character 'nobody' not found!", self.output.getvalue())
+        self.assertIn('Forpor, Zed', self.output.getvalue())
@@ -0,0 +1,64 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from core.database import DatabaseManager
+from core.exporter import default_export_path, export_columns, export_standings
+from core.read_model import LeaderboardFilter
+from tests.helpers import make_row
+
+
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        """Load a small roster into an in-memory database and create an output directory."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:', use_read_model=False)
+        self.db_manager.bulk_upsert_characters([
+            make_row(1, 'Dainae', current=40.0),
+            make_row(2, 'Forpor', current=40.0, main_id=1),
+            make_row(3, 'Kitten', current=75.0),
+            make_row(4, 'Bolrak', current=10.0, main_id=1),
+            make_row(5, 'Zed', current=10.0, main_id=1),
+            make_row(6, 'Aaron', current=10.0, main_id=1),
+        ])
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def export(self, output_format='csv', **kwargs):
+        path = os.path.join(self.directory.name, f'standings.{output_format}')
+        count = export_standings(path, output_format, db_manager=self.db_manager, chunk_size=1, **kwargs)
+        return count, path
+
+    def test_csv_lists_mains_with_their_alts(self):
+        """Test the default export has one row per main, best first, with its alts."""
+        count, path = self.export()
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(count, 2)
+        self.assertEqual([(row['name'], row['alts']) for row in rows], [('Kitten', ''), ('Dainae', 'Aaron, Bolrak, Forpor, Zed')])
+
+    def test_columns_filters_and_all_characters(self):
+        """Test a column subset, a filter and exporting every character as NDJSON."""
+        count, path = self.export('ndjson', columns=['name', 'current'], mains_only=False,
+                                  filters=LeaderboardFilter(class_name='enchanter'))
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(count, 6)
+        self.assertEqual(rows[0], {'name': 'Kitten', 'current': 75.0})
+        self.assertEqual(self.export(filters=LeaderboardFilter(class_name='Cleric'))[0], 0)
+
+    def test_invalid_requests(self):
+        """Test unknown formats and columns are rejected before anything is written."""
+        with self.assertRaises(ValueError):
+            self.export('xlsx')
+        with self.assertRaises(ValueError):
+            self.export(columns=['name', 'password'])
+        for internal in ('fingerprint', 'name_lower', 'is_main'):
+            self.assertNotIn(internal, export_columns())
+            with self.assertRaises(ValueError):
+                self.export(columns=['name', internal])
+
+    def test_default_path(self):
+        """Test other formats reuse the CSV output file name with their own extension."""
+        self.assertEqual(default_export_path('csv'), 'processed_data.csv')
+        self.assertEqual(default_export_path('parquet', 'out/standings.csv'), 'out/standings.parquet')
@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import Mock, patch
+import requests
+from core.http_client import CircuitBreaker, CircuitOpenError, HTTPClient
+
+
+class TestHTTPClient(unittest.TestCase):
+    """Test suite for the shared HTTP client."""
+
+    def setUp(self):
+        """Set up a client with a low failure threshold."""
+        self.client = HTTPClient(timeout=2.0, retries=2, breaker=CircuitBreaker(failure_threshold=3))
+
+    def _response(self, status_code):
+        mock_response = Mock()
+        mock_response.status_code = status_code
+        return mock_response
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_retries_transient_failures(self, mock_request, mock_sleep):
+        """Test that connection errors and 503s are retried until a success."""
+        mock_request.side_effect = [
+            requests.exceptions.ConnectionError("reset"),
+            self._response(503),
+            self._response(200),
+        ]
+
+        response = self.client.get("https://example.test/api.php?atoken=secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(mock_request.call_args.kwargs['timeout'], 2.0)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_gives_up_after_retries(self, mock_request, mock_sleep):
+        """Test that the last error is raised once retries are exhausted."""
+        mock_request.side_effect = requests.exceptions.Timeout("stalled")
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.client.get("https://example.test/api.php")
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_post_is_not_retried_unless_asked(self, mock_request, mock_sleep):
+        """Test that a POST is sent once by default and retried only on opt-in."""
+        mock_request.side_effect = [self._response(503), self._response(503), self._response(200)]
+        self.assertEqual(self.client.post("https://example.test/api.php", json={}).status_code, 503)
+        self.assertEqual(mock_request.call_count, 1)
+
+        self.assertEqual(self.client.post("https://example.test/api.php", json={}, retry=True).status_code, 200)
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch('time.sleep')
+    @patch('requests.Session.request')
+    def test_circuit_opens_after_repeated_failures(self, mock_request, mock_sleep):
+        """Test that an open circuit fails fast without calling the server."""
+        mock_request.side_effect = requests.exceptions.ConnectionError("down")
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.client.get("https://example.test/api.php")
+
+        mock_request.reset_mock()
+        with self.assertRaises(CircuitOpenError):
+            self.client.get("https://example.test/api.php")
+        mock_request.assert_not_called()
+
+    @patch('time.monotonic')
+    def test_half_open_lets_one_trial_call_through(self, mock_monotonic):
+        """Test that after the timeout one trial call is allowed, closing or re-opening the circuit."""
+        mock_monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        mock_monotonic.return_value = 131.0
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow())
+
+        mock_monotonic.return_value = 162.0
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def test_redacts_api_token(self):
+        """Test that the API token is masked in logged URLs."""
+        redacted = HTTPClient._redact("https://example.test/api.php?function=points&atoken=secret&atype=api")
+        self.assertNotIn("secret", redacted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import unittest
+from sqlalchemy import func, select
+from core.data_parser import DataParser
+from core.database import DatabaseManager
+from core.models import Adjustment, DKPEvent, Item, ItemPool
+from tests.helpers import element, item, make_feed, player
+
+
+def make_item_feed(timestamp, dainae_items, forpor_items=""):
+    """Build a feed with items, adjustments, events and item pools."""
+    late = element('adjustment', reason='Late', value=-5, timestamp=1700000500)
+    events = (element('event', id=1, name='Dagarn', value='6.00')
+              + element('event', id=2, name='Trakanon ', value='6.00'))
+    return make_feed(
+        timestamp,
+        player(1, 'Dainae', 1, items=dainae_items, adjustments=late),
+        player(2, 'Forpor', 1, items=forpor_items, adjustments=''),
+        player(3, 'Kitten', 3, items=item("Cloak of Flames", 100, 1700000300)),
+        pools=element('multidkp_pool', id=1, name='DKP', events=events),
+        itempools=element('itempool', id=1, name='Default', desc='Auto generated'),
+    )
+
+
+class TestItems(unittest.TestCase):
+    def setUp(self):
+        """Ingest a feed with purchases into an in-memory database."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:')
+        self.parser = DataParser()
+        self.parser.db_manager = self.db_manager
+        self.parser.parse_character_stream(io.BytesIO(make_item_feed(
+            1, item("Cloak of Flames", 250, 1700000100) + item("Cloak of Flames", 150, 1700000200),
+            item("Mana Stone", 20, 1700000400),
+        )), incremental=True)
+
+    def count(self, model):
+        with self.db_manager.get_session() as session:
+            return session.scalar(select(func.count()).select_from(model))
+
+    def test_sections_are_stored(self):
+        """Test items, adjustments, events and item pools land in their own tables."""
+        self.assertEqual(self.count(Item), 4)
+        self.assertEqual(self.count(Adjustment), 1)
+        self.assertEqual(self.count(DKPEvent), 2)
+        self.assertEqual(self.count(ItemPool), 1)
+
+    def test_purchases_cover_the_alt_group(self):
+        """Test a character's purchases include its alts unless asked for its own only."""
+        purchases = self.db_manager.get_purchases('forpor')
+        self.assertEqual([(p['character'], p['item']) for p in purchases],
+                         [('Forpor', 'Mana Stone'), ('Dainae', 'Cloak of Flames'), ('Dainae', 'Cloak of Flames')])
+        self.assertEqual(purchases[0]['itempool'], 'Default')
+        self.assertEqual(len(self.db_manager.get_purchases('Forpor', include_alts=False)), 1)
+        self.assertEqual(self.db_manager.get_purchases('Nobody'), [])
+
+    def test_item_prices(self):
+        """Test price statistics are grouped per item and matched by name prefix."""
+        prices = self.db_manager.get_item_prices('cloak')
+        self.assertEqual(len(prices), 1)
+        self.assertEqual((prices[0]['item'], prices[0]['sold'], prices[0]['average'], prices[0]['minimum'],
+                          prices[0]['maximum'], prices[0]['last_sold']),
+                         ('Cloak of Flames', 3, 500 / 3, 100.0, 250.0, 1700000300))
+        self.assertEqual(self.db_manager.get_item_prices('Sword'), [])
+
+    def test_reingest_replaces_changed_characters_items(self):
+        """Test a later feed replaces the items of changed characters without duplicating the rest."""
+        self.parser.parse_character_stream(io.BytesIO(make_item_feed(
+            2, item("Cloak of Flames", 250, 1700000100), item("Mana Stone", 20, 1700000400),
+        )), incremental=True)
+        self.assertEqual(self.count(Item), 3)
+        self.assertEqual(self.count(Adjustment), 1)
+
+        self.db_manager.delete_characters([1])
+        self.assertEqual(self.count(Item), 2)
+        self.assertEqual(self.count(Adjustment), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
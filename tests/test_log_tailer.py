@@ -0,0 +1,108 @@
+import os
+import tempfile
+import threading
+import unittest
+from core.log_tailer import LogTailer
+
+STAMP = "[Mon Oct 16 20:01:02 2026]"
+
+
+class TestLogTailer(unittest.TestCase):
+    def setUp(self):
+        """Create an empty log file in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "eqlog_Dainae_test.txt")
+        open(self.path, 'w').close()
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def write(self, text, mode='a'):
+        with open(self.path, mode, newline='') as f:
+            f.write(text)
+
+    def test_matches_bid_lines_only(self):
+        """Test that tells and channel messages containing 'bid' are matched."""
+        self.write(f"{STAMP} Old tells the raid,  'bid'\n")
+        tailer = LogTailer(self.path)
+        self.write(
+            f"{STAMP} Dainae tells you, 'BID 50'\n"
+            f"{STAMP} Forpor tells the raid,  'bid'\n"
+            f"{STAMP} Kitten tells dkp:5, 'bid please'\r\n"
+            f"{STAMP} Bolrak tells the guild, 'forbidden'\n"
+            f"{STAMP} You tell Dainae, 'bid'\n"
+        )
+        self.assertEqual(tailer.poll(), [])  # first poll only records the end of the file
+        self.write(f"{STAMP} Zarathel tells the guild, 'bid'\n")
+        self.assertEqual(tailer.poll(), ['Zarathel'])
+
+        tailer = LogTailer(self.path, offset=0)
+        self.assertEqual(tailer.poll(), ['Old', 'Dainae', 'Forpor', 'Kitten', 'Zarathel'])
+
+    def test_partial_lines_wait_for_newline(self):
+        """Test that a line is only matched once it is complete."""
+        tailer = LogTailer(self.path, offset=0)
+        self.write(f"{STAMP} Dainae tells the raid,  'bi")
+        self.assertEqual(tailer.poll(), [])
+        self.write("d'\n")
+        self.assertEqual(tailer.poll(), ['Dainae'])
+        self.assertEqual(tailer.offset, os.path.getsize(self.path))
+
+    def test_truncation_and_rotation_restart_from_the_beginning(self):
+        """Test that a truncated or replaced log is read again from the start."""
+        tailer = LogTailer(self.path, offset=0)
+        self.write(f"{STAMP} Dainae tells the raid,  'bid'\n" * 3)
+        self.assertEqual(len(tailer.poll()), 3)
+
+        self.write(f"{STAMP} Forpor tells the raid,  'bid'\n", mode='w')
+        self.assertEqual(tailer.poll(), ['Forpor'])
+
+        rotated = f"{self.path}.new"
+        with open(rotated, 'w') as f:
+            f.write(f"{STAMP} Kitten tells the raid,  'bid'\n")
+        os.replace(rotated, self.path)
+        self.assertEqual(tailer.poll(), ['Kitten'])
+
+    def test_follow_delivers_batches_until_stopped(self):
+        """Test that follow hands every batch of names to the callback."""
+        tailer = LogTailer(self.path, offset=0)
+        names = ["Char" + chr(65 + n % 26) * (n // 26 + 1) for n in range(70)]
+        self.write("".join(f"{STAMP} {name} tells the raid,  'bid'\n" for name in names))
+        batches, stop = [], threading.Event()
+
+        def collect(names):
+            batches.append(names)
+            stop.set()
+
+        # Fail instead of hanging if nothing matches
+        timer = threading.Timer(5.0, stop.set)
+        timer.start()
+        try:
+            tailer.follow(collect, stop, interval=0.01)
+        finally:
+            timer.cancel()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0], names)
+        self.assertEqual(len(batches[0]), 70)
+
+    def test_resumes_from_checkpoint(self):
+        """Test that a checkpoint resumes after the last complete line, even across a restart."""
+        tailer = LogTailer(self.path, offset=0)
+        self.write(f"{STAMP} Dainae tells the raid,  'bid'\n{STAMP} Forpor tells")
+        self.assertEqual(tailer.poll(), ['Dainae'])
+        checkpoint = tailer.checkpoint
+
+        self.write(" the raid,  'bid'\n")
+        resumed = LogTailer.from_checkpoint(self.path, checkpoint)
+        self.assertEqual(resumed.poll(), ['Forpor'])
+        self.assertEqual(LogTailer.from_checkpoint(self.path, None).poll(), [])
+
+    def test_pattern_requires_name_group(self):
+        """Test that a custom pattern without a name group is rejected."""
+        with self.assertRaises(ValueError):
+            LogTailer(self.path, pattern=r"tells the raid")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from core.database import DatabaseManager
+from core.name_index import NameIndex
+from tests.helpers import make_row
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        """Build an index over a small roster."""
+        self.index = NameIndex(['Dainae', 'Dainora', 'Kitten', 'Kittenmitten', 'Zarathel'])
+
+    def test_prefix(self):
+        """Test prefix matches are case insensitive and alphabetical."""
+        self.assertEqual(self.index.prefix('kit'), ['Kitten', 'Kittenmitten'])
+        self.assertEqual(self.index.prefix('DAIN', limit=1), ['Dainae'])
+        self.assertEqual(self.index.prefix('q'), [])
+
+    def test_fuzzy_typo(self):
+        """Test a misspelled name finds the intended character first."""
+        matches = self.index.fuzzy('Dainea')
+        self.assertEqual(matches[0][0], 'Dainae')
+        self.assertNotIn('Zarathel', [name for name, _ in matches])
+
+    def test_suggest_prefers_prefix(self):
+        """Test prefix matches are listed before fuzzy ones."""
+        self.assertEqual(self.index.suggest('Kitt', limit=2), ['Kitten', 'Kittenmitten'])
+        self.assertEqual(self.index.suggest('Zaratel')[0], 'Zarathel')
+
+    def test_incremental_update(self):
+        """Test added and removed names are reflected without a rebuild."""
+        self.index.update(added=['Kitsune'], removed=['Kitten'])
+        self.assertEqual(self.index.prefix('kit'), ['Kitsune', 'Kittenmitten'])
+        self.assertNotIn('Kitten', self.index)
+        self.assertEqual(len(self.index), 5)
+        self.assertNotIn('Kitten', [name for name, _ in self.index.fuzzy('Kiten')])
+
+
+class TestNameSuggestions(unittest.TestCase):
+    def test_suggestions_follow_roster_changes(self):
+        """Test DatabaseManager suggestions track upserts and deletes."""
+        db_manager = DatabaseManager('sqlite:///:memory:')
+        db_manager.bulk_upsert_characters([make_row(1, 'Dainae'), make_row(2, 'Kitten')])
+        self.assertEqual(db_manager.suggest_names('Dainea')[0], 'Dainae')
+
+        db_manager.bulk_upsert_characters([make_row(3, 'Dainora')])
+        db_manager.delete_characters([1])
+        self.assertEqual(db_manager.complete_names('dai'), ['Dainora'])
+        self.assertNotIn('Dainae', db_manager.suggest_names('Dainea'))
+
+
+if __name__ == '__main__':
+    unittest.main()
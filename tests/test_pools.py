@@ -0,0 +1,83 @@
+import io
+import unittest
+from rich.console import Console
+from core.bidding_manager import BiddingManager
+from core.data_parser import DataParser, iter_elements, player_to_row
+from core.database import DatabaseManager
+from core.read_model import LeaderboardFilter
+from tests.helpers import element, make_feed, player, points
+
+POOL_PLAYERS = [
+    player(1, 'Dainae', 1, points(1, points_current_with_twink=40), points(2, points_current_with_twink=5),
+           class_name='Enchanter', active=1),
+    player(2, 'Forpor', 1, points(1, points_current_with_twink=40), points(2, points_current_with_twink=5),
+           class_name='Shaman', active=1),
+    player(3, 'Kitten', 3, points(1, points_current_with_twink=10), points(2, points_current_with_twink=90),
+           class_name='Cleric', active=1),
+    player(4, 'Bolrak', 4, points(2, points_current_with_twink=90), class_name='Cleric', active=0),
+]
+
+POOL_DEFINITIONS = (element('multidkp_pool', id=1, name='Raids', desc='Raid points')
+                    + element('multidkp_pool', id=2, name='Planar ', desc='Planar raid points'))
+
+POOL_FEED = make_feed(100, *POOL_PLAYERS, pools=POOL_DEFINITIONS)
+
+
+class TestPools(unittest.TestCase):
+    def setUp(self):
+        """Ingest a two-pool feed into an in-memory database."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:')
+        parser = DataParser()
+        parser.db_manager = self.db_manager
+        parser.parse_character_stream(io.BytesIO(POOL_FEED))
+
+    def test_player_to_row_reads_every_pool(self):
+        """Test every points block is kept and the first one fills the character's columns."""
+        player = next(iter_elements(io.BytesIO(POOL_FEED), {('players', 'player')}))
+        row = player_to_row(player)
+        self.assertEqual([points['pool_id'] for points in row['pools']], [1, 2])
+        self.assertEqual(row['pools'][1]['current_with_twink'], 5.0)
+        self.assertEqual(row['current_with_twink'], 40.0)
+
+    def test_pools_are_stored_and_resolved(self):
+        """Test pool definitions are stored and found by id or name."""
+        self.assertEqual([(pool.id, pool.name) for pool in self.db_manager.get_pools()], [(1, 'Raids'), (2, 'Planar')])
+        self.assertEqual(self.db_manager.find_pool('planar').id, 2)
+        self.assertEqual(self.db_manager.find_pool('1').name, 'Raids')
+        self.assertIsNone(self.db_manager.find_pool('Nope'))
+
+    def test_pool_leaderboard_ranks_mains_per_pool(self):
+        """Test each pool ranks its own points, breaks ties by name and applies filters."""
+        raids = self.db_manager.get_pool_standings(1)
+        self.assertEqual([entry.name for entry in raids.leaderboard('current', 10)], ['Dainae', 'Kitten'])
+
+        planar = self.db_manager.get_pool_standings(2)
+        self.assertEqual([entry.name for entry in planar.leaderboard('current', 10)], ['Bolrak', 'Kitten', 'Dainae'])
+        self.assertEqual([entry.name for entry in planar.leaderboard('current', 1, offset=1)], ['Kitten'])
+        active_clerics = LeaderboardFilter(active=True, class_name='cleric')
+        self.assertEqual([entry.name for entry in planar.leaderboard('current', 10, active_clerics)], ['Kitten'])
+        self.assertIsNone(raids.entry(4))
+
+    def test_reingest_replaces_pool_points(self):
+        """Test a later feed replaces a character's pools and removed players lose theirs."""
+        trimmed = make_feed(100, *POOL_PLAYERS[:3], pools=POOL_DEFINITIONS)
+        parser = DataParser()
+        parser.db_manager = self.db_manager
+        parser.parse_character_stream(io.BytesIO(trimmed.replace(b">90<", b">70<")))
+
+        planar = self.db_manager.get_pool_standings(2)
+        self.assertEqual([(entry.name, entry.current_with_twink) for entry in planar.leaderboard('current', 10)],
+                         [('Kitten', 70.0), ('Dainae', 5.0)])
+
+    def test_bid_uses_pool_points(self):
+        """Test a pool bid orders bidders by their points in that pool."""
+        manager = BiddingManager()
+        manager.db_manager = self.db_manager
+        manager.console = Console(file=io.StringIO())
+        manager.start_bid(self.db_manager.find_pool('Planar'))
+        manager.add_characters(['Forpor', 'Kitten'])
+        self.assertEqual([(p.name, p.points_current) for p in manager.current_bid], [('Kitten', 90.0), ('Forpor', 5.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
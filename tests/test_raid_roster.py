@@ -0,0 +1,71 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from core.database import DatabaseManager
+from core.raid_roster import RaidRosterImporter, find_roster_files, read_roster
+from tests.helpers import make_row
+
+
+def dump_line(group, name, level=60, class_name='Enchanter', role=''):
+    return f"{group}\t{name}\t{level}\t{class_name}\t{role}\t\tNo\n"
+
+
+class TestRaidRosterImport(unittest.TestCase):
+    def setUp(self):
+        """Write two raid dumps into a temporary directory and load a small roster."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.write('RaidRoster-20261014-210000.txt',
+                   dump_line(1, 'Dainae', role='Group Leader') + dump_line(1, 'Kitten') + dump_line(2, 'Stranger'))
+        self.write('RaidRoster-20261015-210000.txt', dump_line(1, 'Forpor') + dump_line(1, 'Kitten'))
+        self.write('notes.txt', dump_line(1, 'Ignored'))
+
+        self.db_manager = DatabaseManager('sqlite:///:memory:')
+        self.db_manager.bulk_upsert_characters([
+            make_row(1, 'Dainae', current=40.0),
+            make_row(2, 'Forpor', current=40.0, main_id=1),
+            make_row(3, 'Kitten', current=75.0),
+        ])
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmp_dir.cleanup()
+
+    def write(self, name, text):
+        with open(os.path.join(self.tmp_dir.name, name), 'w') as f:
+            f.write(text)
+
+    def test_reads_names_from_dumps(self):
+        """Test that only RaidRoster dumps are picked up and names come from the second column."""
+        files = find_roster_files(self.tmp_dir.name)
+        self.assertEqual([os.path.basename(f) for f in files],
+                         ['RaidRoster-20261014-210000.txt', 'RaidRoster-20261015-210000.txt'])
+        self.assertEqual(read_roster(files[0]), ['Dainae', 'Kitten', 'Stranger'])
+
+    def test_alts_count_towards_their_main(self):
+        """Test that attendance is per main, whichever character was in the raid."""
+        result = RaidRosterImporter(self.db_manager).import_paths([self.tmp_dir.name])
+        summary = [(a.main_name, a.dumps, a.characters) for a in result.attendance]
+        self.assertEqual(summary, [('Kitten', 2, ['Kitten']), ('Dainae', 2, ['Dainae', 'Forpor'])])
+        self.assertEqual(result.unknown, ['Stranger'])
+        self.assertEqual(len(result.entries), 5)
+
+    def test_writes_csv_and_json(self):
+        """Test that the import is written as CSV rows or as a JSON document."""
+        result = RaidRosterImporter(self.db_manager).import_paths([self.tmp_dir.name])
+        csv_path = os.path.join(self.tmp_dir.name, 'out.csv')
+        json_path = os.path.join(self.tmp_dir.name, 'out.json')
+        result.write(csv_path)
+        result.write(json_path)
+
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows[1]['name'], 'Kitten')
+        self.assertEqual(rows[3]['main_name'], 'Dainae')
+        with open(json_path) as f:
+            self.assertEqual(json.load(f)['unknown'], ['Stranger'])
+
+
+if __name__ == '__main__':
+    unittest.main()
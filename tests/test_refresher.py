@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from app.main import RefreshResult
+from app.refresher import BackgroundRefresher, describe_age
+from core.data_parser import SyncResult
+from core.database import DatabaseManager
+from tests.helpers import make_row
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+    def setUp(self):
+        """Load a small roster into a temporary database file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = DatabaseManager(f"sqlite:///{os.path.join(self.tmp_dir.name, 'refresh.db')}")
+        self.db_manager.bulk_upsert_characters([make_row(1, 'Dainae', current=40.0)])
+
+    def tearDown(self):
+        """Dispose of the engine and remove the temporary directory."""
+        self.db_manager.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_readers_keep_old_data_until_refresh_completes(self):
+        """Test writes inside a refresh are swapped in together when it ends."""
+        self.assertEqual(self.db_manager.get_character_by_name('Dainae').current, 40.0)
+
+        def refresh():
+            self.db_manager.bulk_upsert_characters([make_row(1, 'Dainae', current=90.0)])
+            # Mid-refresh, another thread still sees the previous snapshot
+            self.assertEqual(self.db_manager.get_character_by_name('Dainae').current, 40.0)
+            self.db_manager.bulk_upsert_characters([make_row(2, 'Forpor', current=10.0)])
+            return RefreshResult(points=SyncResult(inserted=1, updated=1), ranks=0)
+
+        refresher = BackgroundRefresher(refresh, self.db_manager)
+        refresher.refresh_once()
+
+        self.assertEqual(self.db_manager.get_character_by_name('Dainae').current, 90.0)
+        self.assertIsNotNone(self.db_manager.get_character_by_name('Forpor'))
+        self.assertIn("Data refreshed", refresher.drain_notices()[0])
+        self.assertEqual(refresher.drain_notices(), [])
+
+    def test_failed_refresh_is_reported_and_keeps_data(self):
+        """Test a failing or empty fetch leaves the data alone and queues a notice."""
+        def failing():
+            raise ConnectionError("site down")
+
+        refresher = BackgroundRefresher(failing, self.db_manager)
+        refresher.refresh_once()
+        refresher.refresh = lambda: RefreshResult()
+        refresher.refresh_once()
+
+        notices = refresher.drain_notices()
+        self.assertIn("site down", notices[0])
+        self.assertIn("could not be fetched", notices[1])
+        self.assertFalse(refresher.busy)
+        self.assertEqual(self.db_manager.get_character_by_name('Dainae').current, 40.0)
+
+    def test_describe_age(self):
+        """Test the data age is rounded down to the largest whole unit."""
+        now = datetime(2026, 10, 16, 20, 0, 0)
+        self.assertEqual(describe_age(None, now), "never synced")
+        self.assertEqual(describe_age("2026-10-16T19:59:30", now), "just now")
+        self.assertEqual(describe_age("2026-10-16T19:48:00", now), "12 minutes ago")
+        self.assertEqual(describe_age("2026-10-16T18:59:00", now), "1 hour ago")
+        self.assertEqual(describe_age("2026-10-14T20:00:00", now), "2 days ago")
+
+
+if __name__ == '__main__':
+    unittest.main()
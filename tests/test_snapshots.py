@@ -0,0 +1,69 @@
+import io
+import unittest
+from sqlalchemy import func, select
+from core.data_parser import DataParser
+from core.database import DatabaseManager, date_to_timestamp
+from core.models import Snapshot, SnapshotDelta
+from tests.helpers import make_feed, player, points
+
+
+def snapshot_player(player_id, name, main_id, current, earned, spent):
+    return player(player_id, name, main_id,
+                  points(1, points_current=current, points_earned=earned, points_spent=spent))
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        """Ingest three daily feeds into an in-memory database."""
+        self.db_manager = DatabaseManager('sqlite:///:memory:')
+        self.parser = DataParser()
+        self.parser.db_manager = self.db_manager
+        self.ingest(100, snapshot_player(1, 'Dainae', 1, 50, 50, 0), snapshot_player(2, 'Forpor', 1, 10, 10, 0),
+                    snapshot_player(3, 'Kitten', 3, 30, 30, 0))
+        self.ingest(200, snapshot_player(1, 'Dainae', 1, 20, 50, 30), snapshot_player(2, 'Forpor', 1, 10, 10, 0),
+                    snapshot_player(3, 'Kitten', 3, 60, 60, 0))
+        self.ingest(300, snapshot_player(1, 'Dainae', 1, 40, 70, 30), snapshot_player(2, 'Forpor', 1, 10, 10, 0))
+
+    def ingest(self, timestamp, *players):
+        self.parser.parse_character_stream(io.BytesIO(make_feed(timestamp, *players)), incremental=True)
+
+    def test_only_changes_are_stored(self):
+        """Test a snapshot stores a delta row per changed character only."""
+        with self.db_manager.get_session() as session:
+            changed = session.scalars(select(Snapshot.changed).order_by(Snapshot.feed_timestamp)).all()
+            rows = session.scalar(select(func.count()).select_from(SnapshotDelta))
+        # First feed: everyone; second: Dainae and Kitten; third: Dainae and the departed Kitten
+        self.assertEqual(changed, [3, 2, 2])
+        self.assertEqual(rows, 7)
+
+    def test_trajectory(self):
+        """Test the trajectory replays running totals per snapshot, for the alt group or one character."""
+        trajectory = self.db_manager.get_trajectory('forpor')
+        self.assertEqual([(t['feed_timestamp'], t['current'], t['spent'], t['change']) for t in trajectory],
+                         [(100, 60.0, 0.0, 60.0), (200, 30.0, 30.0, -30.0), (300, 50.0, 30.0, 20.0)])
+        self.assertEqual([t['current'] for t in self.db_manager.get_trajectory('Forpor', include_alts=False)], [10.0])
+        self.assertEqual(self.db_manager.get_trajectory('Nobody'), [])
+
+    def test_movers(self):
+        """Test movers sum the deltas of the snapshots in a date range per alt group of the current roster."""
+        gainers = self.db_manager.get_movers('earned', start=100)
+        self.assertEqual([(m['main_name'], m['change']) for m in gainers], [('Dainae', 20.0)])
+        gainers = self.db_manager.get_movers('earned', end=200)
+        self.assertEqual([(m['main_name'], m['change']) for m in gainers], [('Dainae', 60.0)])
+        spenders = self.db_manager.get_movers('spent', start=100, end=200)
+        self.assertEqual([(m['main_name'], m['change']) for m in spenders], [('Dainae', 30.0)])
+        with self.assertRaises(ValueError):
+            self.db_manager.get_movers('points')
+
+    def test_same_feed_is_not_recorded_twice(self):
+        """Test re-recording an unchanged feed adds no deltas."""
+        self.assertEqual(self.db_manager.record_snapshot(300), 0)
+        with self.db_manager.get_session() as session:
+            self.assertEqual(session.scalar(select(func.count()).select_from(Snapshot)), 3)
+
+    def test_date_to_timestamp(self):
+        """Test dates and unix times are accepted and anything else is rejected."""
+        self.assertEqual(date_to_timestamp('1700000000'), 1700000000)
+        self.assertIsInstance(date_to_timestamp('2026-10-01'), int)
+        with self.assertRaises(ValueError):
+            date_to_timestamp('2026-13-01')
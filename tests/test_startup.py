@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+from app.config import AppConfig
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(unittest.TestCase):
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        """Test importing the application does not load pandas, pyfiglet or requests."""
+        code = (
+            "import sys, app.main\n"
+            "print(','.join(m for m in ('pandas', 'pyfiglet', 'requests') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_offline_config_does_not_prompt_for_api_key(self):
+        """Test loading the configuration offline accepts a missing API key."""
+        with patch.dict(os.environ, {'API_KEY': ''}), \
+                patch('app.config.load_dotenv'), \
+                patch.object(AppConfig, 'prompt_for_missing_vars') as prompt:
+            config = AppConfig.load(require_api_key=False)
+        prompt.assert_not_called()
+        self.assertFalse(config.api_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
-from typing import Optional, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, Optional, Tuple
 
-def find_character(data: pd.DataFrame, character_name: str) -> Optional[Tuple[str, float]]:
+if TYPE_CHECKING:
+    import pandas as pd
+
+def find_character(data: 'pd.DataFrame', character_name: str) -> Optional[Tuple[str, float]]:
     """
     Find a character in the main characters or alts list of the data.
 